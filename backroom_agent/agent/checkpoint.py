@@ -0,0 +1,556 @@
+"""
+主图 (agent graph) 的 checkpointer：以 session_id 作为 thread_id 持久化图状态，
+多轮对话的 messages 在服务端累积，客户端无需重发；中断的流可以从最近的
+checkpoint 继续 (ChatRequest.resume)。
+
+- RedisCheckpointSaver：每个 checkpoint 连同 channel_values 一起以 msgpack
+  (JsonPlusSerializer) 存为一个 Redis 哈希；每个 (thread, ns) 只保留最近
+  CHECKPOINT_KEEP 个，所有键在最后一次写入 CHECKPOINT_TTL 秒后过期
+- CHECKPOINT_BACKEND=memory 使用 BoundedMemorySaver（进程内，保留策略与 Redis
+  相同，另外最多保留 CHECKPOINT_MAX_THREADS 个线程，最久未使用的先删除）；
+  Redis 不可用时同样退化为它；none 表示不使用 checkpointer
+- 没有 session_id 的请求使用一次性线程 (anon-*)，本轮结束后即删除
+- 回合未能写入会话存储时，realign_thread 把线程改写为会话存储中的状态与消息，
+  使 DM 的历史与服务端权威会话保持一致
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from langchain_core.messages import (AIMessage, BaseMessage, HumanMessage,
+                                     RemoveMessage, SystemMessage)
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (WRITES_IDX_MAP, BaseCheckpointSaver,
+                                       ChannelVersions, Checkpoint,
+                                       CheckpointMetadata, CheckpointTuple,
+                                       get_checkpoint_id,
+                                       get_checkpoint_metadata,
+                                       writes_sort_key)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from backroom_agent.constants import (CHECKPOINT_BACKEND, CHECKPOINT_KEEP,
+                                      CHECKPOINT_MAX_THREADS, CHECKPOINT_TTL,
+                                      REDIS_HOST, REDIS_PASSWORD, REDIS_PORT)
+from backroom_agent.utils.cache import memory_cache
+from backroom_agent.utils.logger import logger
+
+# Protocol models stored in the graph state (msgpack deserialization allowlist)
+_STATE_TYPES = [
+    ("backroom_agent.protocol", name)
+    for name in (
+        "GameState",
+        "Attributes",
+        "Vitals",
+        "Item",
+        "GameEvent",
+        "EventType",
+        "LogicEvent",
+        "EventOutcome",
+        "DiceRoll",
+    )
+]
+
+
+ANONYMOUS_THREAD_PREFIX = "anon-"
+
+
+def make_serde() -> JsonPlusSerializer:
+    return JsonPlusSerializer(allowed_msgpack_modules=_STATE_TYPES)
+
+
+def thread_config(session_id: Optional[str], **configurable: Any) -> RunnableConfig:
+    """
+    Graph config for a session: the session id is the checkpoint thread.
+    Requests without a session get a throwaway thread of their own.
+    """
+    thread_id = session_id or f"{ANONYMOUS_THREAD_PREFIX}{uuid.uuid4().hex}"
+    return {"configurable": {"thread_id": thread_id, **configurable}}
+
+
+async def discard_anonymous_thread(checkpointer: Any, config: RunnableConfig):
+    """Deletes the checkpoints of a throwaway (session-less) thread after its turn."""
+    thread_id = str(config["configurable"]["thread_id"])
+    if isinstance(checkpointer, BaseCheckpointSaver) and thread_id.startswith(
+        ANONYMOUS_THREAD_PREFIX
+    ):
+        try:
+            await checkpointer.adelete_thread(thread_id)
+        except Exception as e:
+            logger.warning(f"Could not delete checkpoint thread {thread_id}: {e}")
+
+
+# Session message sender -> graph message type
+_SENDER_MESSAGES = {
+    "player": HumanMessage,
+    "dm": AIMessage,
+    "init": AIMessage,
+    "system": SystemMessage,
+}
+
+
+async def realign_thread(
+    graph: Any, session_id: str, state: Any, messages: List[Dict[str, str]]
+):
+    """
+    Rewrites a session's checkpoint thread to the stored session (state and
+    message history), e.g. after a turn that ran but could not be saved.
+    Falls back to deleting the thread when the update is rejected.
+    """
+    checkpointer = graph.checkpointer
+    if not isinstance(checkpointer, BaseCheckpointSaver):
+        return
+
+    history: List[BaseMessage] = [
+        _SENDER_MESSAGES[m["sender"]](content=m["text"])
+        for m in messages
+        if m.get("sender") in _SENDER_MESSAGES
+    ]
+    values: Dict[str, Any] = {
+        "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *history]
+    }
+    if state is not None:
+        values["current_game_state"] = state
+
+    config = thread_config(session_id)
+    try:
+        await graph.aupdate_state(config, values)
+    except Exception as e:
+        logger.warning(f"Could not realign checkpoint thread {session_id}: {e}")
+        try:
+            await checkpointer.adelete_thread(session_id)
+        except Exception as e:
+            logger.warning(f"Could not delete checkpoint thread {session_id}: {e}")
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[int]):
+    """
+    Minimal Redis checkpoint saver. Keys (thread t, namespace n, checkpoint c):
+
+    - backroom:ckpt:{t}:{n}            sorted set of checkpoint ids (lexical order)
+    - backroom:ckpt:{t}:{n}:{c}        hash: checkpoint, metadata, parent
+    - backroom:ckpt:{t}:{n}:{c}:writes hash: "{task_id}:{idx}" -> pending write
+    - backroom:ckpt_ns:{t}             set of namespaces (for delete_thread)
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int = CHECKPOINT_TTL,
+        keep: int = CHECKPOINT_KEEP,
+    ):
+        super().__init__(serde=make_serde())
+        self.client = client
+        self.ttl = ttl
+        self.keep = max(1, keep)
+
+    # --- Keys & encoding ---
+
+    @staticmethod
+    def _index_key(thread_id: str, ns: str) -> str:
+        return f"backroom:ckpt:{thread_id}:{ns}"
+
+    @classmethod
+    def _checkpoint_key(cls, thread_id: str, ns: str, checkpoint_id: str) -> str:
+        return f"{cls._index_key(thread_id, ns)}:{checkpoint_id}"
+
+    @staticmethod
+    def _ns_key(thread_id: str) -> str:
+        return f"backroom:ckpt_ns:{thread_id}"
+
+    def _dump(self, value: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        return type_.encode() + b"\n" + data
+
+    def _load(self, raw: bytes) -> Any:
+        type_, _, data = raw.partition(b"\n")
+        return self.serde.loads_typed((type_.decode(), data))
+
+    @staticmethod
+    def _ids(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    # --- Reads ---
+
+    def _pending_writes(
+        self, thread_id: str, ns: str, checkpoint_id: str
+    ) -> List[Tuple[str, str, Any]]:
+        key = self._checkpoint_key(thread_id, ns, checkpoint_id) + ":writes"
+        writes = []
+        for field, raw in self.client.hgetall(key).items():  # type: ignore[union-attr]
+            task_id, _, idx = field.decode().rpartition(":")
+            header, _, value = raw.partition(b"\n\n")
+            channel, task_path = json.loads(header)
+            writes.append((task_path, task_id, int(idx), channel, value))
+        writes.sort(key=lambda w: writes_sort_key(w[0], w[1], w[2]))
+        return [(task_id, ch, self._load(v)) for _, task_id, _, ch, v in writes]
+
+    def _tuple(
+        self, thread_id: str, ns: str, checkpoint_id: str
+    ) -> Optional[CheckpointTuple]:
+        key = self._checkpoint_key(thread_id, ns, checkpoint_id)
+        data: Dict[bytes, bytes] = self.client.hgetall(key)  # type: ignore[assignment]
+        if not data:
+            return None
+        parent = data.get(b"parent", b"").decode()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self._load(data[b"checkpoint"]),
+            metadata=self._load(data[b"metadata"]),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": ns,
+                        "checkpoint_id": parent,
+                    }
+                }
+                if parent
+                else None
+            ),
+            pending_writes=self._pending_writes(thread_id, ns, checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, ns = self._ids(config)
+        checkpoint_id = get_checkpoint_id(config)
+        if not checkpoint_id:
+            latest = self.client.zrange(self._index_key(thread_id, ns), -1, -1)
+            if not latest:
+                return None
+            checkpoint_id = latest[0].decode()  # type: ignore[index]
+        return self._tuple(thread_id, ns, checkpoint_id)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config is None:
+            threads = [
+                key.decode().split(":", 2)[2]
+                for key in self.client.scan_iter(match="backroom:ckpt_ns:*")
+            ]
+            namespaces = None
+        else:
+            threads = [str(config["configurable"]["thread_id"])]
+            namespaces = config["configurable"].get("checkpoint_ns")
+        wanted_id = get_checkpoint_id(config) if config else None
+        before_id = get_checkpoint_id(before) if before else None
+
+        for thread_id in threads:
+            ns_list = (
+                [namespaces]
+                if namespaces is not None
+                else [
+                    ns.decode()
+                    for ns in self.client.smembers(self._ns_key(thread_id))  # type: ignore[union-attr]
+                ]
+            )
+            for ns in ns_list:
+                ids = self.client.zrange(self._index_key(thread_id, ns), 0, -1)
+                for raw_id in reversed(ids):  # type: ignore[arg-type]
+                    checkpoint_id = raw_id.decode()
+                    if wanted_id and checkpoint_id != wanted_id:
+                        continue
+                    if before_id and checkpoint_id >= before_id:
+                        continue
+                    tup = self._tuple(thread_id, ns, checkpoint_id)
+                    if tup is None:
+                        continue
+                    if filter and not all(
+                        tup.metadata.get(k) == v for k, v in filter.items()
+                    ):
+                        continue
+                    if limit is not None:
+                        if limit <= 0:
+                            return
+                        limit -= 1
+                    yield tup
+
+    # --- Writes ---
+
+    def _touch(self, pipe: Any, thread_id: str, ns: str, *keys: str):
+        for key in (self._index_key(thread_id, ns), self._ns_key(thread_id), *keys):
+            pipe.expire(key, self.ttl)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, ns = self._ids(config)
+        checkpoint_id = checkpoint["id"]
+        key = self._checkpoint_key(thread_id, ns, checkpoint_id)
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(
+            key,
+            mapping={
+                "checkpoint": self._dump(checkpoint),
+                "metadata": self._dump(get_checkpoint_metadata(config, metadata)),
+                "parent": config["configurable"].get("checkpoint_id") or "",
+            },
+        )
+        pipe.zadd(self._index_key(thread_id, ns), {checkpoint_id: 0})
+        pipe.sadd(self._ns_key(thread_id), ns)
+        self._touch(pipe, thread_id, ns, key)
+        pipe.execute()
+        self._prune(thread_id, ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": ns,
+                "checkpoint_id": checkpoint_id,
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, ns = self._ids(config)
+        key = (
+            self._checkpoint_key(thread_id, ns, config["configurable"]["checkpoint_id"])
+            + ":writes"
+        )
+        fields = {}
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            header = json.dumps([channel, task_path]).encode()
+            fields[f"{task_id}:{write_idx}"] = (
+                write_idx,
+                header + b"\n\n" + self._dump(value),
+            )
+
+        pipe = self.client.pipeline(transaction=False)
+        for field, (write_idx, raw) in fields.items():
+            # Special writes (negative idx) overwrite; regular ones are write-once
+            if write_idx < 0:
+                pipe.hset(key, field, raw)
+            else:
+                pipe.hsetnx(key, field, raw)
+        self._touch(pipe, thread_id, ns, key)
+        pipe.execute()
+
+    def _prune(self, thread_id: str, ns: str):
+        """Drops all but the newest `keep` checkpoints of the thread/namespace."""
+        index = self._index_key(thread_id, ns)
+        excess = self.client.zcard(index) - self.keep  # type: ignore[operator]
+        if excess <= 0:
+            return
+        old_ids = [i.decode() for i in self.client.zrange(index, 0, excess - 1)]  # type: ignore[union-attr]
+        pipe = self.client.pipeline(transaction=False)
+        for checkpoint_id in old_ids:
+            key = self._checkpoint_key(thread_id, ns, checkpoint_id)
+            pipe.delete(key, key + ":writes")
+        pipe.zrem(index, *old_ids)
+        pipe.execute()
+
+    def delete_thread(self, thread_id: str) -> None:
+        ns_key = self._ns_key(thread_id)
+        for raw_ns in self.client.smembers(ns_key):  # type: ignore[union-attr]
+            index = self._index_key(thread_id, raw_ns.decode())
+            ids = [i.decode() for i in self.client.zrange(index, 0, -1)]  # type: ignore[union-attr]
+            keys = [f"{index}:{i}" for i in ids] + [f"{index}:{i}:writes" for i in ids]
+            self.client.delete(index, *keys)
+        self.client.delete(ns_key)
+
+    # --- Async (the graph streams asynchronously; Redis calls run in a thread) ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for tup in tuples:
+            yield tup
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    InMemorySaver with the retention of RedisCheckpointSaver: the newest `keep`
+    checkpoints per thread/namespace, threads idle for `ttl` seconds dropped,
+    and at most `max_threads` threads (least recently used dropped first).
+    """
+
+    def __init__(
+        self,
+        ttl: int = CHECKPOINT_TTL,
+        keep: int = CHECKPOINT_KEEP,
+        max_threads: int = CHECKPOINT_MAX_THREADS,
+    ):
+        super().__init__(serde=make_serde())
+        self.ttl = ttl
+        self.keep = max(1, keep)
+        self.max_threads = max(1, max_threads)
+        # thread_id -> last write, least recently used first
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        # (thread, ns, checkpoint id) -> channel versions (to drop unused blobs)
+        self._versions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            tup = super().get_tuple(config)
+            if thread_id not in self._last_used:
+                # The base class creates empty entries for unknown threads
+                self.storage.pop(thread_id, None)
+            return tup
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            self._versions[(thread_id, ns, checkpoint["id"])] = dict(
+                checkpoint["channel_versions"]
+            )
+            self._prune(thread_id, ns)
+            self._touch(thread_id)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            super().delete_thread(thread_id)
+            self._last_used.pop(thread_id, None)
+            for key in [k for k in self._versions if k[0] == thread_id]:
+                del self._versions[key]
+
+    def _prune(self, thread_id: str, ns: str):
+        """Drops all but the newest `keep` checkpoints and their unused blobs."""
+        checkpoints = self.storage[thread_id][ns]
+        if len(checkpoints) <= self.keep:
+            return
+        dropped = set()
+        for checkpoint_id in sorted(checkpoints)[: -self.keep]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, ns, checkpoint_id), None)
+            versions = self._versions.pop((thread_id, ns, checkpoint_id), {})
+            dropped.update(versions.items())
+        referenced = {
+            item
+            for checkpoint_id in checkpoints
+            for item in self._versions.get((thread_id, ns, checkpoint_id), {}).items()
+        }
+        for channel, version in dropped - referenced:
+            self.blobs.pop((thread_id, ns, channel, version), None)
+
+    def _touch(self, thread_id: str):
+        """Marks the thread used and drops idle / least recently used threads."""
+        now = time.time()
+        self._last_used[thread_id] = now
+        self._last_used.move_to_end(thread_id)
+        while len(self._last_used) > 1:
+            oldest, used_at = next(iter(self._last_used.items()))
+            if len(self._last_used) <= self.max_threads and now - used_at <= self.ttl:
+                break
+            self.delete_thread(oldest)
+
+
+def get_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Checkpointer selected by CHECKPOINT_BACKEND ("redis", "memory" or "none")."""
+    backend = CHECKPOINT_BACKEND.lower()
+    if backend == "none":
+        return None
+    if backend == "redis" and not memory_cache.available:
+        # The shared cache already found Redis down; skip the connect retries
+        logger.warning(
+            "Redis unavailable for graph checkpoints; using in-memory checkpoints."
+        )
+    elif backend == "redis":
+        # Own connection: checkpoints are binary (the cache client decodes str)
+        client = redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            password=REDIS_PASSWORD,
+            socket_connect_timeout=1,
+        )
+        try:
+            client.ping()
+            logger.info(
+                f"Graph checkpoints stored in Redis at {REDIS_HOST}:{REDIS_PORT}"
+            )
+            return RedisCheckpointSaver(client)
+        except redis.RedisError:
+            logger.warning(
+                "Redis unavailable for graph checkpoints; using in-memory checkpoints."
+            )
+    elif backend != "memory":
+        raise ValueError(
+            f"Invalid CHECKPOINT_BACKEND '{CHECKPOINT_BACKEND}'. Supported: 'redis', 'memory', 'none'"
+        )
+    return BoundedMemorySaver()
@@ -1,8 +1,11 @@
-from typing import cast
+from typing import Optional, cast
 
 from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
+from backroom_agent.agent.checkpoint import (discard_anonymous_thread,
+                                             get_checkpointer, thread_config)
 from backroom_agent.agent.nodes import (  # Node Constants; Node Functions; Routing Functions
     NODE_DICE_NODE, NODE_EVENT_NODE, NODE_INIT_NODE, NODE_RESOLVE_NODE,
     NODE_ROUTER_NODE, NODE_SUMMARY_NODE, dice_node, event_node, init_node,
@@ -11,8 +14,11 @@ from backroom_agent.agent.nodes import (  # Node Constants; Node Functions; Rout
 from backroom_agent.agent.state import State
 
 
-def build_graph():
-    """Constructs the StateGraph for the agent."""
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """
+    Constructs the StateGraph for the agent. With a checkpointer, state is
+    kept per thread (thread_id = session_id) across turns.
+    """
     workflow = StateGraph(State)
 
     # Add Router Node (Entry Point)
@@ -80,11 +86,11 @@ def build_graph():
     workflow.add_edge(NODE_SUMMARY_NODE, END)
     # workflow.add_edge(NODE_SUGGESTION_NODE, END) # REMOVED
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
-# Validated graph instance
-graph = build_graph()
+# Validated graph instance (checkpointer selected by CHECKPOINT_BACKEND)
+graph = build_graph(get_checkpointer())
 
 
 async def run_once(user_text: str) -> AIMessage:
@@ -94,7 +100,11 @@ async def run_once(user_text: str) -> AIMessage:
     input_state = cast(
         State, {"messages": [HumanMessage(content=user_text)], "event_type": "message"}
     )
-    result = await graph.ainvoke(input_state)
+    config = thread_config(None)
+    try:
+        result = await graph.ainvoke(input_state, config=config)
+    finally:
+        await discard_anonymous_thread(graph.checkpointer, config)
     last = result["messages"][-1]
     if not isinstance(last, AIMessage):
         raise TypeError(f"Expected AIMessage, got {type(last)}")
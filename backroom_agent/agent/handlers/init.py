@@ -1,17 +1,21 @@
 import asyncio
-from typing import AsyncGenerator, cast
+from typing import AsyncGenerator, Optional, cast
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 
+from backroom_agent.agent.checkpoint import (discard_anonymous_thread,
+                                             thread_config)
 from backroom_agent.agent.graph import graph
 from backroom_agent.agent.state import State
 from backroom_agent.protocol import (ChatRequest, GameState, StreamChunkInit,
                                      StreamChunkMessage, StreamChunkState,
                                      StreamChunkSuggestions, StreamChunkType)
+from backroom_agent.utils.session import Session
 
 
 async def handle_init(
-    request: ChatRequest, current_state: GameState
+    request: ChatRequest, current_state: GameState, session: Optional[Session] = None
 ) -> AsyncGenerator[str, None]:
     input_state = cast(
         State,
@@ -20,42 +24,58 @@ async def handle_init(
             "user_input": request.player_input,
             "session_id": request.session_id,
             "current_game_state": current_state,
-            "messages": [],
+            # A new game: drop the history and leftovers checkpointed for the session
+            "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES)],
+            "level_context": None,
+            "logic_event": None,
+            "logic_outcome": None,
+            "dice_roll": None,
+            "suggestions": None,
+            "settlement_delta": None,
         },
     )
 
-    async for chunk in graph.astream(input_state, stream_mode="updates"):
-        for _, updates in chunk.items():
-            if not updates:
-                continue
-
-            # 1. Messages -> INIT Type
-            if "messages" in updates:
-                msgs = updates["messages"]
-                if not isinstance(msgs, list):
-                    msgs = [msgs]
-
-                for msg in msgs:
-                    if isinstance(msg, AIMessage) and msg.content:
-                        # Use StreamChunkInit for initialization messages
-                        yield StreamChunkInit(
-                            type=StreamChunkType.INIT,
-                            text=str(msg.content),
-                        ).model_dump_json() + "\n"
-
-            # 2. Game State
-            if "current_game_state" in updates:
-                new_state = updates["current_game_state"]
-                # Only yield if it's actually a GameState object (just safety)
-                if isinstance(new_state, GameState):
-                    yield StreamChunkState(
-                        type=StreamChunkType.STATE, state=new_state
-                    ).model_dump_json() + "\n"
-
-            # 3. Suggestions
-            if "suggestions" in updates:
-                suggs = updates["suggestions"]
-                if isinstance(suggs, list):
-                    yield StreamChunkSuggestions(
-                        type=StreamChunkType.SUGGESTIONS, options=suggs
-                    ).model_dump_json() + "\n"
+    config = thread_config(request.session_id)
+    try:
+        async for chunk in graph.astream(input_state, config, stream_mode="updates"):
+            for _, updates in chunk.items():
+                if not updates:
+                    continue
+
+                # 1. Messages -> INIT Type
+                if "messages" in updates:
+                    msgs = updates["messages"]
+                    if not isinstance(msgs, list):
+                        msgs = [msgs]
+
+                    for msg in msgs:
+                        if isinstance(msg, AIMessage) and msg.content:
+                            if session:
+                                session.append_message("init", str(msg.content))
+                            # Use StreamChunkInit for initialization messages
+                            yield StreamChunkInit(
+                                type=StreamChunkType.INIT,
+                                text=str(msg.content),
+                            ).to_line()
+
+                # 2. Game State
+                if "current_game_state" in updates:
+                    new_state = updates["current_game_state"]
+                    # Only yield if it's actually a GameState object (just safety)
+                    if isinstance(new_state, GameState):
+                        if session:
+                            session.state = new_state
+                        yield StreamChunkState(
+                            type=StreamChunkType.STATE, state=new_state
+                        ).to_line()
+
+                # 3. Suggestions
+                if "suggestions" in updates:
+                    suggs = updates["suggestions"]
+                    if isinstance(suggs, list):
+                        yield StreamChunkSuggestions(
+                            type=StreamChunkType.SUGGESTIONS, options=suggs
+                        ).to_line()
+    finally:
+        # Session-less turns leave no checkpoints behind
+        await discard_anonymous_thread(graph.checkpointer, config)
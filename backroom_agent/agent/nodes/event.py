@@ -1,16 +1,18 @@
 import json
 import os
-from typing import Optional, Tuple, cast
+from typing import Any, List, Optional, Tuple, cast
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
+from backroom_agent.agent.nodes.resolve_utils import serialize_messages
 from backroom_agent.agent.state import State
+from backroom_agent.constants import EVENT_HISTORY_MESSAGES
 from backroom_agent.protocol import GameState, LogicEvent
 from backroom_agent.utils.common import (dict_from_pydantic,
                                          extract_json_from_text, get_llm,
                                          load_prompt)
-from backroom_agent.utils.level import find_level_data
+from backroom_agent.utils.level import get_level_context_json
 from backroom_agent.utils.logger import logger
 from backroom_agent.utils.node_annotation import annotate_node
 
@@ -89,20 +91,29 @@ def parse_dm_response(
 
 
 def _prepare_level_context(level_id: str) -> str:
-    """Retrieves and dumps level data JSON."""
-    level_data_json, _ = find_level_data(level_id)
-    if not level_data_json:
+    """Retrieves and dumps level data JSON (serialized once per level, cached)."""
+    level_context = get_level_context_json(level_id)
+    if level_context is None:
         logger.warning(f"Level data for {level_id} not found.")
         level_data_json = {"level_id": level_id, "error": "Level data not found"}
-    return json.dumps(level_data_json, ensure_ascii=False, indent=2)
+        return json.dumps(level_data_json, ensure_ascii=False, indent=2)
+    return level_context
 
 
-def _prepare_player_input(state_dict: dict, current_message: str) -> str:
-    """Constructs the player input JSON string matching local GameState + Input."""
-    input_data = {
+def _prepare_player_input(
+    state_dict: dict, current_message: str, history: Optional[List[Any]] = None
+) -> str:
+    """
+    Constructs the player input JSON string matching local GameState + Input.
+    `history` holds the preceding conversation messages (kept across turns by
+    the checkpointer), oldest first.
+    """
+    input_data: dict = {
         "state": state_dict,
         "input": current_message,
     }
+    if history:
+        input_data["history"] = serialize_messages(history)
     return json.dumps(input_data, ensure_ascii=False, indent=2)
 
 
@@ -163,8 +174,9 @@ def event_node(state: State, config: RunnableConfig) -> dict:
     # Message 1: Static Environment Data
     level_context_str = _prepare_level_context(level_id)
 
-    # Message 2: Dynamic Player State & Input
-    player_input_str = _prepare_player_input(state_dict, current_message)
+    # Message 2: Dynamic Player State & Input (+ recent conversation history)
+    history = messages[:-1][-EVENT_HISTORY_MESSAGES:] if EVENT_HISTORY_MESSAGES else []
+    player_input_str = _prepare_player_input(state_dict, current_message, history)
 
     # Message 3: Loop Context
     loop_context_str = _prepare_loop_context(loop_count)
@@ -1,11 +1,18 @@
 import hashlib
 import json
 import os
+import random
+from typing import Any, Tuple
 
 from langchain_core.messages import AIMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
+from backroom_agent.agent.prefetch import prefetch_adjacent_levels
 from backroom_agent.agent.state import State
+from backroom_agent.constants import (INIT_CONTEXT_TOKEN_BUDGET,
+                                      INIT_INTRO_CACHE_TTL,
+                                      INIT_INTRO_VARIANTS)
+from backroom_agent.tools.wiki.compress import fit_to_budget, html_to_text
 from backroom_agent.utils.cache import memory_cache
 from backroom_agent.utils.common import (extract_json_from_text, get_llm,
                                          load_prompt, truncate_text)
@@ -24,12 +31,19 @@ def _load_init_prompt() -> str:
         return "Describe the level {level} based on: {level_context}. Return JSON."
 
 
-def _generate_llm_intro(level: str, level_context: str, prompt_template: str) -> dict:
-    """Generates the intro JSON using LLM. Used as cache miss callback."""
+def _generate_llm_intro(
+    level: str, level_context: str, prompt_template: str
+) -> Tuple[dict, bool]:
+    """
+    Generates the intro JSON using LLM. Used as cache miss callback.
+    Returns (intro, is_valid); is_valid is False for the fallback intro built
+    from unparseable output, which must not be cached.
+    """
     logger.info(f"Cache Miss for Init Node: {level}. Generating with LLM.")
 
-    # Truncate context to avoid token limits
-    prompt = prompt_template.format(level=level, level_context=level_context[:15000])
+    # Compress the level page and keep whole sections within the token budget
+    context = fit_to_budget(html_to_text(level_context), INIT_CONTEXT_TOKEN_BUDGET)
+    prompt = prompt_template.format(level=level, level_context=context)
 
     llm = get_llm()
     response = llm.invoke([SystemMessage(content=prompt)])
@@ -38,7 +52,7 @@ def _generate_llm_intro(level: str, level_context: str, prompt_template: str) ->
     try:
         parsed = extract_json_from_text(content)
         if isinstance(parsed, dict) and "message" in parsed:
-            return parsed
+            return parsed, True
     except json.JSONDecodeError:
         logger.warning("Init Node LLM output invalid JSON. Fallback.")
 
@@ -46,7 +60,81 @@ def _generate_llm_intro(level: str, level_context: str, prompt_template: str) ->
     return {
         "message": f"You have entered {level}. {truncate_text(content, 100)}",
         "suggestions": ["Look around"],
-    }
+    }, False
+
+
+INTRO_CACHE_PREFIX = "init_node_json_v1"
+
+
+def _intro_cache_key(
+    level: str, level_context: str, prompt_template: str, variant: int = 0
+) -> str:
+    # Cache Key: Level ID + Context snippet + Prompt Hash (+ variant number)
+    # The prompt hash ensures cache invalidation when the prompt file changes
+    prompt_hash = hashlib.md5(prompt_template.encode("utf-8")).hexdigest()
+    key = f"{level}:{level_context[:1000]}:{prompt_hash}"
+    return key if variant == 0 else f"{key}:v{variant}"
+
+
+def get_level_intro(level: str, level_context: str) -> Tuple[Any, bool]:
+    """
+    Returns (intro JSON, was_cache_hit) for a level. One of the cached
+    variants (see warm_level_intro) is picked at random; with none cached the
+    intro is generated with the LLM and stored as variant 0 (fallback intros
+    for unparseable output are returned but not cached).
+    Shared by init_node and the level prefetcher.
+    """
+    prompt_template = _load_init_prompt()
+    keys = [
+        _intro_cache_key(level, level_context, prompt_template, variant)
+        for variant in range(max(1, INIT_INTRO_VARIANTS))
+    ]
+    cached = [
+        value
+        for value in memory_cache.get_many(INTRO_CACHE_PREFIX, keys)
+        if isinstance(value, dict)
+    ]
+    if cached:
+        return random.choice(cached), True
+
+    result_data, is_valid = _generate_llm_intro(level, level_context, prompt_template)
+    if is_valid:
+        memory_cache.set(
+            INTRO_CACHE_PREFIX, keys[0], result_data, ttl=INIT_INTRO_CACHE_TTL
+        )
+    return result_data, False
+
+
+def warm_level_intro(
+    level: str,
+    level_context: str,
+    variants: int = INIT_INTRO_VARIANTS,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """
+    Generates the missing intro variants of a level (all of them with force)
+    and stores them with INIT_INTRO_CACHE_TTL. Returns (generated, failed);
+    failed variants (unparseable LLM output) are not stored.
+    """
+    prompt_template = _load_init_prompt()
+    keys = [
+        _intro_cache_key(level, level_context, prompt_template, variant)
+        for variant in range(max(1, variants))
+    ]
+    cached = memory_cache.get_many(INTRO_CACHE_PREFIX, keys)
+
+    generated = {}
+    failed = 0
+    for key, value in zip(keys, cached):
+        if force or not isinstance(value, dict):
+            intro, is_valid = _generate_llm_intro(level, level_context, prompt_template)
+            if is_valid:
+                generated[key] = intro
+            else:
+                failed += 1
+    if generated:
+        memory_cache.set_many(INTRO_CACHE_PREFIX, generated, ttl=INIT_INTRO_CACHE_TTL)
+    return len(generated), failed
 
 
 @annotate_node("llm")
@@ -60,30 +148,14 @@ def init_node(state: State, config: RunnableConfig) -> dict:
     # Use HTML from State (Pre-fetched by Router)
     level_context = state.get("level_context") or ""
 
-    # Load prompt and calculate hash to include in cache key
-    # This ensures cache invalidation when prompt file changes
-    prompt_template = _load_init_prompt()
-    prompt_hash = hashlib.md5(prompt_template.encode("utf-8")).hexdigest()
-
-    # Cache Key: Level ID + Context snippet + Prompt Hash
-    cache_key_content = f"{level}:{level_context[:1000]}:{prompt_hash}"
-
-    was_cache_hit = True
-
-    def _on_cache_miss():
-        nonlocal was_cache_hit
-        was_cache_hit = False
-        return _generate_llm_intro(level, level_context, prompt_template)
-
-    result_data = memory_cache.get(
-        "init_node_json_v1",
-        cache_key_content,
-        on_miss=_on_cache_miss,
-    )
+    result_data, was_cache_hit = get_level_intro(level, level_context)
 
     if was_cache_hit:
         logger.info(f"Cache Hit for Init Node: {level}")
 
+    # Warm the levels the player is likely to move to next
+    prefetch_adjacent_levels(level)
+
     if not isinstance(result_data, dict):
         result_data = {}
 
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.messages import AIMessage, SystemMessage
 
+from backroom_agent.agent.prefetch import prefetch_adjacent_levels
 from backroom_agent.utils.common import dict_from_pydantic, load_prompt
 from backroom_agent.utils.logger import logger
 
@@ -103,6 +104,8 @@ def apply_state_updates(
         delta.level_transition = new_level
         has_changes = True
         logger.info(f"Level Transition detected: {old_level} -> {new_level}")
+        # Warm the new level (entered next turn) and its exits in the background
+        prefetch_adjacent_levels(new_level, include_self=True)
 
     # Handle Inventory Updates
     from backroom_agent.protocol import Item
@@ -1,22 +1,34 @@
-from typing import Any, Dict, Literal
+from typing import Any, Dict, List, Literal
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage
 from langgraph.graph import END
 
 from backroom_agent.agent.state import State
-from backroom_agent.constants import NodeConstants
+from backroom_agent.constants import CHECKPOINT_MAX_MESSAGES, NodeConstants
 from backroom_agent.protocol import EventType
 from backroom_agent.utils.level import find_level_data
 from backroom_agent.utils.logger import logger
 from backroom_agent.utils.node_annotation import annotate_node
 
 
+def trim_history(messages: List[BaseMessage]) -> List[RemoveMessage]:
+    """
+    Removals that keep the checkpointed conversation at CHECKPOINT_MAX_MESSAGES
+    (this turn's input included), oldest messages first.
+    """
+    excess = len(messages) - CHECKPOINT_MAX_MESSAGES
+    if CHECKPOINT_MAX_MESSAGES <= 0 or excess <= 0:
+        return []
+    return [RemoveMessage(id=m.id) for m in messages[:excess] if m.id]
+
+
 @annotate_node("normal")
 def router_node(state: State) -> Dict[str, Any]:
     """
     Router Node:
     1. Pre-fetch level context (HTML) and inject into State.
-    2. Does NOT determine the next step directly (Routing logic is separate).
+    2. Trim the message history carried over from earlier turns (checkpointer).
+    3. Does NOT determine the next step directly (Routing logic is separate).
     """
     logger.info("▶ NODE: Router Node")
 
@@ -25,6 +37,7 @@ def router_node(state: State) -> Dict[str, Any]:
 
     # Check if context is already loaded to avoid redundant reads
     updates: Dict[str, Any] = {"turn_loop_count": 0}
+    removals = trim_history(state.get("messages") or [])
 
     if not state.get("level_context"):
         logger.info(f"Router pre-fetching context for {level_id}")
@@ -48,6 +61,10 @@ def router_node(state: State) -> Dict[str, Any]:
                 HumanMessage(content=f"我丢弃了物品: {item_name} (数量: {qty})")
             ]
 
+    if removals:
+        logger.info(f"Router: Trimming {len(removals)} old messages from history")
+        updates["messages"] = removals + updates.get("messages", [])
+
     return updates
 
 
@@ -0,0 +1,133 @@
+"""
+相邻层级预取：玩家进入一个层级后，按当前层级 JSON 的 transitions.exits[].next
+在后台预热可能的下一层级，使层级切换时 router_node / init_node 无需冷启动。
+
+预热内容：
+- 层级索引与解析后的层级数据 (find_level_data)
+- event_node 使用的序列化层级上下文 (get_level_context_json)
+- init_node 的开场描述缓存 (LLM 生成，仅在 Redis 可用且 LEVEL_PREFETCH_INTRO 开启时)
+
+预取在进程级线程池中执行，同一层级不会并发或短时间内重复预热；任何失败只记录日志。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from backroom_agent.constants import (LEVEL_PREFETCH_ENABLED,
+                                      LEVEL_PREFETCH_INTRO,
+                                      LEVEL_PREFETCH_MAX_EXITS,
+                                      LEVEL_PREFETCH_WORKERS)
+from backroom_agent.utils.cache import memory_cache
+from backroom_agent.utils.level import (find_level_data,
+                                        get_level_context_json, level_exists)
+from backroom_agent.utils.logger import logger
+
+# Seconds before the same level is warmed again
+PREFETCH_COOLDOWN = 600
+_RECENT_MAX = 256
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, LEVEL_PREFETCH_WORKERS), thread_name_prefix="level-prefetch"
+)
+_lock = threading.Lock()
+_inflight: set = set()
+_recent: "OrderedDict[str, float]" = OrderedDict()
+
+
+def adjacent_levels(level_id: str, limit: int = LEVEL_PREFETCH_MAX_EXITS) -> List[str]:
+    """
+    Distinct exit targets (transitions.exits[].next) of a level, in page order.
+    Targets that are not a known level_id ("random", "Level 4, Level 5", ...)
+    are skipped and do not count against the limit.
+    """
+    level_data, _ = find_level_data(level_id)
+    transitions = (level_data or {}).get("transitions") or {}
+    exits = transitions.get("exits") if isinstance(transitions, dict) else None
+
+    targets: List[str] = []
+    for exit_ in exits or []:
+        target = exit_.get("next") if isinstance(exit_, dict) else None
+        if not isinstance(target, str) or not target.strip():
+            continue
+        target = target.strip()
+        if target == level_id or target in targets or not level_exists(target):
+            continue
+        targets.append(target)
+        if len(targets) >= limit:
+            break
+    return targets
+
+
+def warm_level(level_id: str) -> bool:
+    """Loads a level into the in-memory caches and warms its intro. False if unknown."""
+    _, html_content = find_level_data(level_id)
+    if get_level_context_json(level_id) is None:
+        return False
+
+    if LEVEL_PREFETCH_INTRO and memory_cache.available:
+        # Imported here: init_node itself triggers prefetches
+        from backroom_agent.agent.nodes.init import get_level_intro
+
+        _, was_cache_hit = get_level_intro(level_id, html_content or "")
+        if not was_cache_hit:
+            logger.info(f"[prefetch] Intro generated for {level_id}")
+    return True
+
+
+def _run(level_id: str):
+    start = time.perf_counter()
+    try:
+        if warm_level(level_id):
+            logger.debug(
+                f"[prefetch] Warmed {level_id} in {time.perf_counter() - start:.2f}s"
+            )
+    except Exception as e:
+        logger.warning(f"[prefetch] Failed to warm {level_id}: {e}")
+    finally:
+        with _lock:
+            _inflight.discard(level_id)
+
+
+def _claim(level_id: str, now: float) -> bool:
+    """Marks the level as being warmed unless it is in flight or warmed recently."""
+    with _lock:
+        warmed_at = _recent.get(level_id)
+        if level_id in _inflight or (
+            warmed_at is not None and now - warmed_at < PREFETCH_COOLDOWN
+        ):
+            return False
+        _inflight.add(level_id)
+        _recent[level_id] = now
+        _recent.move_to_end(level_id)
+        while len(_recent) > _RECENT_MAX:
+            _recent.popitem(last=False)
+        return True
+
+
+def prefetch_adjacent_levels(level_id: str, include_self: bool = False) -> List[str]:
+    """
+    Schedules background warm-up of the level's likely next levels (and of the
+    level itself with include_self, e.g. right after a transition). Never
+    blocks on I/O or the LLM; returns the levels actually scheduled.
+    """
+    if not LEVEL_PREFETCH_ENABLED or not level_id:
+        return []
+
+    try:
+        targets = adjacent_levels(level_id)
+    except Exception as e:
+        logger.warning(f"[prefetch] Could not read exits of {level_id}: {e}")
+        targets = []
+    if include_self:
+        targets.insert(0, level_id)
+
+    now = time.time()
+    scheduled = [t for t in targets if _claim(t, now)]
+    for target in scheduled:
+        _executor.submit(_run, target)
+    if scheduled:
+        logger.info(f"[prefetch] {level_id} -> warming {scheduled}")
+    return scheduled
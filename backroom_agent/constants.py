@@ -27,6 +27,103 @@ REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 
+# Session Store Configuration
+# Seconds of inactivity before a stored session (state + messages) expires
+SESSION_TTL = int(os.getenv("SESSION_TTL", 7 * 86400))
+# Sessions kept as parsed objects in the in-process cache
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", 1024))
+# Messages kept per session (oldest dropped first)
+SESSION_MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", 200))
+
+# Graph Checkpoint Configuration (thread_id = session_id)
+# Checkpointer backend: "redis", "memory" (in-process) or "none"
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "redis")
+# Seconds after the last write before a thread's checkpoints expire
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", 86400))
+# Checkpoints kept per thread (older ones are pruned; resume needs only the latest)
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", 20))
+# Threads kept by the in-process (memory) checkpointer, least recently used dropped first
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", 1024))
+# Conversation messages kept in the checkpointed graph state
+CHECKPOINT_MAX_MESSAGES = int(os.getenv("CHECKPOINT_MAX_MESSAGES", 40))
+# Prior messages passed to the event prompt as "history"
+EVENT_HISTORY_MESSAGES = int(os.getenv("EVENT_HISTORY_MESSAGES", 6))
+
+# Session Memory Configuration (utils.memory.MemoryManager)
+# Sessions kept in process (least recently used evicted first)
+MEMORY_MAX_SESSIONS = int(os.getenv("MEMORY_MAX_SESSIONS", 512))
+# Approximate bytes of memory items kept in process across all sessions
+MEMORY_BUDGET_BYTES = int(os.getenv("MEMORY_BUDGET_BYTES", 64 * 1024 * 1024))
+# Seconds of inactivity before a session is evicted from the process
+MEMORY_SESSION_TTL = int(os.getenv("MEMORY_SESSION_TTL", 3600))
+# Memory items kept per session (ring buffer, oldest dropped first)
+MEMORY_MAX_ITEMS = int(os.getenv("MEMORY_MAX_ITEMS", 200))
+# Redis TTL of persisted session memories (rehydrated after eviction)
+MEMORY_PERSIST_TTL = int(os.getenv("MEMORY_PERSIST_TTL", 7 * 86400))
+
+# Embedding Configuration (local models)
+# Inference backend: "torch", "torch-int8" (dynamic quantization) or "onnx"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Optional ONNX file inside the model repo, e.g. "onnx/model_qint8_avx512_vnni.onnx"
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "")
+# Dynamic batching of concurrent embed_query calls
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", 32))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", 2))
+# Query/document embedding cache (in-process LRU, optional Redis persistence)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 4096))
+EMBEDDING_CACHE_REDIS = os.getenv("EMBEDDING_CACHE_REDIS", "false").lower() == "true"
+EMBEDDING_CACHE_REDIS_TTL = int(os.getenv("EMBEDDING_CACHE_REDIS_TTL", 7 * 86400))
+
+# Wiki Ingestion Configuration
+# Minimum seconds between two requests to the same wiki host
+WIKI_MIN_REQUEST_INTERVAL = float(os.getenv("WIKI_MIN_REQUEST_INTERVAL", 1.0))
+# Concurrent connections per wiki host (shared keep-alive pool)
+WIKI_HOST_CONCURRENCY = int(os.getenv("WIKI_HOST_CONCURRENCY", 2))
+# Seconds before the same page is also requested from the next mirror (hedged fetch)
+WIKI_HEDGE_DELAY = float(os.getenv("WIKI_HEDGE_DELAY", 1.5))
+# Level name -> URL resolution cache: TTL of found URLs / of cached search misses
+URL_CACHE_TTL = int(os.getenv("URL_CACHE_TTL", 30 * 86400))
+URL_CACHE_NEGATIVE_TTL = int(os.getenv("URL_CACHE_NEGATIVE_TTL", 86400))
+# Levels processed concurrently by the batch ingestion command
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", 4))
+# Concurrent LLM calls across all levels during ingestion
+INGEST_LLM_CONCURRENCY = int(os.getenv("INGEST_LLM_CONCURRENCY", 3))
+# Level graph: "fanout" (3 LLM calls) or "combined" (1 structured-output call)
+LEVEL_EXTRACTION_MODE = os.getenv("LEVEL_EXTRACTION_MODE", "fanout")
+# Events kept in the level graph state (ring buffer; everything goes to the logger)
+LEVEL_LOG_MAX_EVENTS = int(os.getenv("LEVEL_LOG_MAX_EVENTS", 200))
+
+# LLM Context Budget Configuration
+# tiktoken encoding used to count tokens (empty: character-based estimate)
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+# Max page tokens per level extraction call; longer pages are chunked by heading
+LEVEL_EXTRACT_TOKEN_BUDGET = int(os.getenv("LEVEL_EXTRACT_TOKEN_BUDGET", 12000))
+# Concurrent LLM calls over the chunks of one long page (per extraction node)
+LEVEL_CHUNK_CONCURRENCY = int(os.getenv("LEVEL_CHUNK_CONCURRENCY", 4))
+# Max level context tokens for the init (level intro) prompt
+INIT_CONTEXT_TOKEN_BUDGET = int(os.getenv("INIT_CONTEXT_TOKEN_BUDGET", 6000))
+# Redis TTL of generated level intros (keyed by prompt hash, so prompt edits invalidate)
+INIT_INTRO_CACHE_TTL = int(os.getenv("INIT_INTRO_CACHE_TTL", 90 * 86400))
+# Intro variants per level; init_node picks a cached one at random
+INIT_INTRO_VARIANTS = int(os.getenv("INIT_INTRO_VARIANTS", 1))
+
+# Level Prefetch Configuration
+# Warm level data / intro cache for a level's exits in the background
+LEVEL_PREFETCH_ENABLED = os.getenv("LEVEL_PREFETCH_ENABLED", "true").lower() == "true"
+# Exits (transitions.exits[].next) prefetched per level
+LEVEL_PREFETCH_MAX_EXITS = int(os.getenv("LEVEL_PREFETCH_MAX_EXITS", 3))
+# Also pre-generate the init intro (LLM call) of adjacent levels; needs Redis
+LEVEL_PREFETCH_INTRO = os.getenv("LEVEL_PREFETCH_INTRO", "true").lower() == "true"
+# Background prefetch threads (process-wide)
+LEVEL_PREFETCH_WORKERS = int(os.getenv("LEVEL_PREFETCH_WORKERS", 2))
+
+# Stream Pacing Configuration (client-side display hints, the server never sleeps)
+# Minimum display time of a dice roll animation / of a logic event before the next chunk
+STREAM_DICE_MIN_DISPLAY_MS = int(os.getenv("STREAM_DICE_MIN_DISPLAY_MS", 2000))
+STREAM_LOGIC_EVENT_MIN_DISPLAY_MS = int(
+    os.getenv("STREAM_LOGIC_EVENT_MIN_DISPLAY_MS", 5000)
+)
+
 # LangSmith Configuration
 LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
 LANGCHAIN_ENDPOINT = os.getenv("LANGCHAIN_ENDPOINT", "https://api.smith.langchain.com")
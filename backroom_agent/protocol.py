@@ -1,3 +1,4 @@
+import time
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional
 
@@ -54,7 +55,15 @@ class ChatRequest(BaseModel):
     event: GameEvent
     player_input: str
     session_id: Optional[str] = None
+    # Version of the server-side session the client last saw. When set, the
+    # stored state is used and current_state can be omitted; a stale version
+    # is rejected with 409. Without it current_state (re)seeds the session.
+    state_version: Optional[int] = None
     current_state: Optional[GameState] = None
+    # Continue the session's interrupted turn from its last graph checkpoint
+    # (e.g. after a dropped stream); runs the input as a new turn if none is
+    # pending.
+    resume: bool = False
 
 
 class BackendMessage(BaseModel):
@@ -77,6 +86,28 @@ class StreamChunkType(str, Enum):
     LOGIC_EVENT = "logic_event"
     INIT = "init"
     SETTLEMENT = "settlement"
+    SESSION = "session"
+
+
+class PacedChunk(BaseModel):
+    """
+    Base of all stream chunks: client-side pacing hints.
+
+    The server emits chunks as soon as the graph produces them; the frontend
+    queues them and uses these hints to schedule display (animations, reading
+    time) instead of the server sleeping between chunks.
+    """
+
+    # Server emit time (ms since epoch), stamped by to_line()
+    ts: Optional[int] = None
+    # Minimum time the client shows this chunk before applying the next one
+    min_display_ms: Optional[int] = None
+
+    def to_line(self) -> str:
+        """Serializes the chunk as one NDJSON line, stamping ts."""
+        if self.ts is None:
+            self.ts = int(time.time() * 1000)
+        return self.model_dump_json() + "\n"
 
 
 class EventOutcome(BaseModel):
@@ -98,42 +129,53 @@ class SettlementDelta(BaseModel):
     level_transition: Optional[str] = None
 
 
-class StreamChunkSettlement(BaseModel):
+class StreamChunkSettlement(PacedChunk):
     type: Literal[StreamChunkType.SETTLEMENT]
     delta: SettlementDelta
 
 
-class StreamChunkMessage(BaseModel):
+class StreamChunkMessage(PacedChunk):
     type: Literal[StreamChunkType.MESSAGE]
     text: str
     sender: Literal["dm", "system"]
 
 
-class StreamChunkInit(BaseModel):
+class StreamChunkInit(PacedChunk):
     type: Literal[StreamChunkType.INIT]
     text: str
 
 
-class StreamChunkDice(BaseModel):
+class StreamChunkDice(PacedChunk):
     type: Literal[StreamChunkType.DICE_ROLL]
     dice: DiceRoll
 
 
-class StreamChunkState(BaseModel):
+class StreamChunkState(PacedChunk):
     type: Literal[StreamChunkType.STATE]
     state: GameState
 
 
-class StreamChunkSuggestions(BaseModel):
+class StreamChunkSuggestions(PacedChunk):
     type: Literal[StreamChunkType.SUGGESTIONS]
     options: List[str]
 
 
-class StreamChunkLogicEvent(BaseModel):
+class StreamChunkLogicEvent(PacedChunk):
     type: Literal[StreamChunkType.LOGIC_EVENT]
     event: LogicEvent
 
 
+class StreamChunkSession(PacedChunk):
+    """
+    Sent last: the session version to pass as state_version next time.
+    resync=True: the turn was not saved; reload GET /api/session/{session_id}.
+    """
+
+    type: Literal[StreamChunkType.SESSION]
+    version: int
+    resync: bool = False
+
+
 class ChatResponse(BaseModel):
     messages: List[BackendMessage]
     new_state: GameState
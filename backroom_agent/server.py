@@ -1,16 +1,21 @@
-import asyncio
 from typing import AsyncGenerator
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
+from backroom_agent.agent.checkpoint import realign_thread
+from backroom_agent.agent.graph import graph
 from backroom_agent.agent.handlers import handle_init, handle_message
 from backroom_agent.protocol import (Attributes, ChatRequest, EventType,
-                                     GameState, Vitals)
+                                     GameState, StreamChunkMessage,
+                                     StreamChunkSession, StreamChunkType,
+                                     Vitals)
 from backroom_agent.utils.common import truncate_text
 from backroom_agent.utils.logger import logger
+from backroom_agent.utils.session import (Session, SessionConflictError,
+                                          SessionSaveError, session_store)
 
 app = FastAPI(title="Backroom Agent API")
 
@@ -36,32 +41,78 @@ def get_initial_state() -> GameState:
     )
 
 
-async def mock_agent_generator(request: ChatRequest) -> AsyncGenerator[str, None]:
+def resolve_turn_state(request: ChatRequest, session: Session) -> GameState:
     """
-    Generator that simulates the agent's thinking and response process.
-    Yields NDJSON strings.
+    State the turn starts from. INIT starts a new game (the client's state or
+    the default one); otherwise the stored state is authoritative when the
+    client sends state_version, and a client-sent current_state (re)seeds it.
     """
-    current_state = request.current_state or get_initial_state()
+    if request.event.type == EventType.INIT:
+        return request.current_state or get_initial_state()
+    if request.state_version is None and request.current_state:
+        return request.current_state
+    return session.state or request.current_state or get_initial_state()
 
-    # 1. Simulate processing delay
-    await asyncio.sleep(0.5)
 
-    stream_generator = (
-        handle_init(request, current_state)
-        if request.event.type == EventType.INIT
-        else handle_message(request, current_state)
-    )
+async def agent_turn_generator(
+    request: ChatRequest, session: Session
+) -> AsyncGenerator[str, None]:
+    """
+    Generator that runs the agent and yields NDJSON strings as soon as the
+    graph produces them. Display pacing is left to the client (see
+    PacedChunk.min_display_ms). The turn is saved to the session store at
+    the end (only for requests with a session_id).
+
+    A turn that cannot be saved (another request saved first, or Redis failed)
+    has already been streamed and checkpointed: the checkpoint thread is
+    realigned to the stored session and the client is told to resync.
+    """
+    current_state = resolve_turn_state(request, session)
+    session.state = current_state
+
+    if request.event.type == EventType.INIT:
+        # A new game starts a new message history
+        session.messages = []
+        stream_generator = handle_init(request, current_state, session)
+    else:
+        if request.player_input:
+            session.append_message("player", request.player_input)
+        stream_generator = handle_message(request, current_state, session)
 
     async for chunk in stream_generator:
         logger.info(f"Frontend Out: {truncate_text(chunk.strip(), 150)}")
         yield chunk
 
+    if not request.session_id:
+        # Session-less requests are not stored across turns
+        return
+
+    try:
+        version = session_store.save(session)
+    except (SessionConflictError, SessionSaveError) as e:
+        logger.warning(f"[{session.session_id}] Turn not saved: {e}")
+        stored = session_store.load(session.session_id)
+        await realign_thread(graph, stored.session_id, stored.state, stored.messages)
+        text = (
+            "会话已在其他地方更新，本回合的结果未保存，正在同步。"
+            if isinstance(e, SessionConflictError)
+            else "本回合的结果未能保存，正在同步。"
+        )
+        yield StreamChunkMessage(
+            type=StreamChunkType.MESSAGE, text=text, sender="system"
+        ).to_line()
+        yield StreamChunkSession(
+            type=StreamChunkType.SESSION, version=stored.version, resync=True
+        ).to_line()
+        return
+    yield StreamChunkSession(type=StreamChunkType.SESSION, version=version).to_line()
+
 
 # --- Routes ---
 
 
 @app.post("/api/chat")
-async def chat_endpoint(request: ChatRequest) -> StreamingResponse:
+async def chat_endpoint(request: ChatRequest) -> Response:
     """
     Streaming endpoint for chat interactions.
     """
@@ -70,8 +121,36 @@ async def chat_endpoint(request: ChatRequest) -> StreamingResponse:
         f"[{session_id}] Event: {request.event.type} | Input: {request.player_input}"
     )
 
+    # Requests without a session id are not stored across turns
+    session = session_store.load(session_id) if request.session_id else None
+    if session is None:
+        session = Session(session_id)
+    elif request.state_version is not None and (
+        request.state_version != session.version or session.state is None
+    ):
+        # Client is behind (or the session expired): it resends current_state
+        return JSONResponse(
+            status_code=409,
+            content={"detail": "stale state_version", "version": session.version},
+        )
+
     return StreamingResponse(
-        mock_agent_generator(request), media_type="application/x-ndjson"
+        agent_turn_generator(request, session), media_type="application/x-ndjson"
+    )
+
+
+@app.get("/api/session/{session_id}")
+def get_session(session_id: str) -> Response:
+    """Stored state, messages and version of a session (for client resync)."""
+    session = session_store.load(session_id)
+    if session.version == 0:
+        return JSONResponse(status_code=404, content={"detail": "unknown session"})
+    return JSONResponse(
+        content={
+            "version": session.version,
+            "state": session.state.model_dump() if session.state else None,
+            "messages": session.messages,
+        }
     )
 
 
@@ -4,14 +4,15 @@ from .graph import level_agent
 from .nodes import (check_completion_node, fetch_content_node,
                     filter_entities_node, filter_items_node,
                     update_level_json_node)
-from .nodes_llm import (extract_entities_node, extract_items_node,
-                        generate_json_node)
+from .nodes_llm import (extract_combined_node, extract_entities_node,
+                        extract_items_node, generate_json_node)
 
 LEVEL_NODES = {
     "fetch_content": fetch_content_node,
     "generate_json": generate_json_node,
     "extract_items": extract_items_node,
     "extract_entities": extract_entities_node,
+    "extract_combined": extract_combined_node,
     "filter_items": filter_items_node,
     "filter_entities": filter_entities_node,
     "check_completion": check_completion_node,
@@ -0,0 +1,223 @@
+"""
+链接图爬虫：从种子层级出发，沿层级 JSON 中的 links 与 transitions.exits[].next
+广度优先地发现相连的层级，并按入度优先送入批量导入流水线 (ingest_levels)。
+
+- 以路径 slug 作为图节点，不同镜像上的同一页面只算一次
+- 只跟随层级页面 (level-*)，实体、组织等页面不会被当作层级导入
+- 已有 data/level/{slug}.json 的层级直接从本地展开，不重复导入 (force 除外)
+- 抓取走共享的 wiki 抓取器，遵守按域名限速与镜像并发上限
+"""
+
+import heapq
+import json
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from backroom_agent.constants import INGEST_CONCURRENCY
+from backroom_agent.tools.wiki.url_cache import read_page_links
+from backroom_agent.utils.common import get_project_root
+from backroom_agent.utils.logger import logger
+
+from .ingest import STATUS_DONE, ingest_levels
+from .nodes.fetch import WIKI_MIRRORS
+
+LEVEL_SLUG_RE = re.compile(r"^level-[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+
+def _allowed_domains() -> List[str]:
+    return [urlparse(m).netloc for m in WIKI_MIRRORS]
+
+
+def level_slug(ref: str, allowed_domains: Iterable[str]) -> Optional[str]:
+    """
+    Canonical level key for a link or level name: "Level 4.2", "/level-4-2"
+    and "http://<mirror>/level-4-2" all give "level-4-2". None for other
+    pages and for links off the wiki.
+    """
+    ref = (ref or "").strip()
+    parsed = urlparse(ref)
+    if parsed.scheme or ref.startswith("/"):
+        if parsed.netloc and parsed.netloc not in allowed_domains:
+            return None
+        ref = parsed.path.strip("/")
+        if "/" in ref or ":" in ref:
+            return None
+    slug = re.sub(r"[^a-z0-9]+", "-", ref.lower()).strip("-")
+    return slug if LEVEL_SLUG_RE.match(slug) else None
+
+
+def level_neighbours(
+    level_dir: str, level: str, allowed_domains: Iterable[str]
+) -> List[str]:
+    """Levels linked from a fetched level (page links and transition exits)."""
+    refs = [link.get("url", "") for link in read_page_links(level_dir, level)]
+    json_path = os.path.join(level_dir, f"{level}.json")
+    if os.path.exists(json_path):
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                exits = (json.load(f).get("transitions") or {}).get("exits") or []
+            refs.extend(e.get("next", "") for e in exits if isinstance(e, dict))
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    neighbours = []
+    for ref in refs:
+        slug = level_slug(ref, allowed_domains)
+        if slug and slug != level and slug not in neighbours:
+            neighbours.append(slug)
+    return neighbours
+
+
+class LevelCrawler:
+    """
+    Breadth-first discovery over the level link graph with an in-degree
+    priority queue: levels linked from more known levels come first, then
+    shallower ones. In-degrees grow as pages are expanded, so queue entries
+    are re-pushed and stale ones skipped.
+    """
+
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        level_dir: str,
+        allowed_domains: Optional[List[str]] = None,
+        max_depth: Optional[int] = None,
+    ):
+        self.level_dir = level_dir
+        self.allowed_domains = allowed_domains or _allowed_domains()
+        self.max_depth = max_depth
+        self.in_degree: Counter = Counter()
+        self.depth: Dict[str, int] = {}
+        self.done: Set[str] = set()
+        self._expanded: Set[str] = set()
+        self._heap: List[Tuple[int, int, str]] = []
+        for seed in seeds:
+            slug = level_slug(seed, self.allowed_domains) or seed
+            if slug not in self.depth:
+                self.depth[slug] = 0
+                self._push(slug)
+
+    def _push(self, slug: str):
+        heapq.heappush(self._heap, (-self.in_degree[slug], self.depth[slug], slug))
+
+    def is_local(self, level: str) -> bool:
+        return os.path.exists(os.path.join(self.level_dir, f"{level}.json"))
+
+    def expand(self, level: str) -> List[str]:
+        """Adds the level's outgoing edges; returns newly discovered levels."""
+        if level in self._expanded:
+            return []
+        self._expanded.add(level)
+        next_depth = self.depth.get(level, 0) + 1
+        discovered = []
+        for neighbour in level_neighbours(self.level_dir, level, self.allowed_domains):
+            self.in_degree[neighbour] += 1
+            if neighbour not in self.depth:
+                if self.max_depth is not None and next_depth > self.max_depth:
+                    continue
+                self.depth[neighbour] = next_depth
+                discovered.append(neighbour)
+            if neighbour not in self.done:
+                self._push(neighbour)
+        return discovered
+
+    def next_batch(self, size: int) -> List[str]:
+        """Pops up to size pending levels, highest in-degree first."""
+        batch: List[str] = []
+        while self._heap and len(batch) < size:
+            neg_degree, _, slug = heapq.heappop(self._heap)
+            if (
+                slug in self.done
+                or slug in batch
+                or -neg_degree != self.in_degree[slug]
+            ):
+                continue
+            batch.append(slug)
+        return batch
+
+    def mark_done(self, level: str):
+        self.done.add(level)
+
+    def frontier(self) -> List[Tuple[str, int]]:
+        """Discovered but unprocessed levels with their in-degree, best first."""
+        pending = [s for s in self.depth if s not in self.done]
+        pending.sort(key=lambda s: (-self.in_degree[s], self.depth[s], s))
+        return [(s, self.in_degree[s]) for s in pending]
+
+
+async def crawl_levels(
+    seeds: List[str],
+    max_levels: int = 50,
+    max_depth: Optional[int] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    concurrency: int = INGEST_CONCURRENCY,
+    update_vectors: bool = True,
+    **ingest_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    从种子层级爬取链接图，并把新发现的层级分批交给 ingest_levels。
+
+    Args:
+        seeds: 起始层级名称或 URL
+        max_levels: 最多导入 (抓取) 的新层级数；本地已有的层级不计入
+        max_depth: 距种子的最大跳数，None 表示不限
+        force: 为 True 时本地已有的层级也重新导入
+        dry_run: 只在本地数据上遍历并报告待导入的层级，不抓取
+        concurrency: 每批层级数 (亦即 ingest_levels 的层级并发)
+        update_vectors: 结束时是否 (一次性) 更新向量索引
+        ingest_kwargs: 透传给 ingest_levels (llm_concurrency、mode、backend 等)
+
+    Returns:
+        {"ingested": [...], "failed": [...], "frontier": [(slug, in_degree), ...]}
+    """
+    level_dir = os.path.join(get_project_root(), "data/level")
+    crawler = LevelCrawler(seeds, level_dir, max_depth=max_depth)
+    ingested: List[str] = []
+    failed: List[str] = []
+    would_ingest: List[str] = []
+
+    while True:
+        room = max_levels - len(ingested) - len(failed) - len(would_ingest)
+        # A batch never holds more levels than the remaining budget
+        batch = crawler.next_batch(min(max(1, concurrency), room))
+        if not batch:
+            break
+        to_fetch = [level for level in batch if force or not crawler.is_local(level)]
+
+        if to_fetch and dry_run:
+            would_ingest.extend(to_fetch)
+        elif to_fetch:
+            logger.info(f"[crawl] Ingesting {', '.join(to_fetch)}")
+            progress = await ingest_levels(
+                to_fetch,
+                force=force,
+                concurrency=concurrency,
+                update_vectors=False,
+                **ingest_kwargs,
+            )
+            for level in to_fetch:
+                entry = progress["targets"].get(level, {})
+                if entry.get("status") == STATUS_DONE:
+                    ingested.append(level)
+                else:
+                    failed.append(level)
+
+        for level in batch:
+            crawler.mark_done(level)
+            discovered = crawler.expand(level)
+            if discovered:
+                logger.info(f"[crawl] {level} -> {len(discovered)} new: {discovered}")
+
+    if update_vectors and ingested and not dry_run:
+        # 索引进度文件中已完成但尚未入库的层级
+        await ingest_levels([], update_vectors=True, **ingest_kwargs)
+
+    return {
+        "ingested": would_ingest if dry_run else ingested,
+        "failed": failed,
+        "frontier": crawler.frontier(),
+    }
@@ -0,0 +1,118 @@
+"""
+层级流水线的结构化事件日志。
+
+以前每个节点读取 state["logs"]、追加后整体返回，经 operator.add 合并后条目成倍重复，
+批量导入时 state（以及 checkpoint）随之二次增长。现在每个节点创建自己的 NodeLog，
+只返回本节点产生的事件：reducer 把它们并入有界的环形缓冲（保留最近
+LEVEL_LOG_MAX_EVENTS 条），计数器累加；每条事件同时写入 logger。
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from backroom_agent.constants import LEVEL_LOG_MAX_EVENTS
+from backroom_agent.utils.logger import logger
+
+LevelEvent = Dict[str, Any]
+
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+def append_events(
+    left: Optional[List[LevelEvent]], right: Optional[List[LevelEvent]]
+) -> List[LevelEvent]:
+    """State reducer: appends new events, keeping only the most recent ones."""
+    merged = (left or []) + (right or [])
+    return merged[-LEVEL_LOG_MAX_EVENTS:]
+
+
+def add_counters(
+    left: Optional[Dict[str, int]], right: Optional[Dict[str, int]]
+) -> Dict[str, int]:
+    """State reducer: sums counters key by key."""
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _infer_level(message: str) -> str:
+    # Messages from helpers that only know list.append keep their old prefixes
+    if message.startswith("Error"):
+        return "ERROR"
+    if message.startswith("Warning") or "failed" in message.lower():
+        return "WARNING"
+    return "INFO"
+
+
+class NodeLog:
+    """
+    Per-node event buffer. Supports append/extend so helpers written against a
+    List[str] keep working; return updates() from the node.
+    """
+
+    def __init__(self, node: str, level_name: Optional[str] = None):
+        self.node = node
+        self.level_name = level_name
+        self.events: Deque[LevelEvent] = deque(maxlen=LEVEL_LOG_MAX_EVENTS)
+        self.counters: Dict[str, int] = {}
+
+    def log(self, level: str, message: str):
+        prefix = f"[level:{self.level_name or '?'}] {self.node}: "
+        logger.log(_LEVELS[level], prefix + message)
+        if level != "DEBUG":
+            self.events.append(
+                {
+                    "time": round(time.time(), 3),
+                    "level": level,
+                    "node": self.node,
+                    "message": message,
+                }
+            )
+
+    def debug(self, message: str):
+        """Logger only; not kept in state (per-item details)."""
+        self.log("DEBUG", message)
+
+    def info(self, message: str):
+        self.log("INFO", message)
+
+    def warning(self, message: str):
+        self.log("WARNING", message)
+
+    def error(self, message: str):
+        self.log("ERROR", message)
+
+    def append(self, message: str):
+        self.log(_infer_level(message), message)
+
+    def extend(self, messages: Iterable[str]):
+        for message in messages:
+            self.append(message)
+
+    def count(self, key: str, n: int = 1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def updates(self) -> Dict[str, Any]:
+        """State update with only this node's events and counters."""
+        return {"logs": list(self.events), "log_counters": dict(self.counters)}
+
+
+def format_event(event: LevelEvent) -> str:
+    return f"{event['level']:<7} {event['node']}: {event['message']}"
+
+
+def last_error(events: Optional[List[LevelEvent]]) -> Optional[str]:
+    """Message of the most recent ERROR (or WARNING) event, for failure reports."""
+    for wanted in ("ERROR", "WARNING"):
+        for event in reversed(events or []):
+            if event.get("level") == wanted:
+                return event["message"]
+    return None
@@ -1,12 +1,21 @@
+from typing import Any, Callable, Optional
+
 from langgraph.graph import END, START, StateGraph
 
+from backroom_agent.constants import LEVEL_EXTRACTION_MODE
+
 from .nodes import (check_completion_node, fetch_content_node,
                     filter_entities_node, filter_items_node,
                     update_level_json_node)
-from .nodes_llm import (extract_entities_node, extract_items_node,
-                        generate_json_node)
+from .nodes_llm import (extract_combined_node, extract_entities_node,
+                        extract_items_node, generate_json_node)
 from .state import LevelAgentState
 
+# generate_json -> extract_items | extract_entities (three LLM calls)
+MODE_FANOUT = "fanout"
+# extract_combined (one structured-output call)
+MODE_COMBINED = "combined"
+
 
 def completion_check(state: LevelAgentState):
     """
@@ -17,42 +26,87 @@ def completion_check(state: LevelAgentState):
     return END
 
 
-# Define the Graph
-workflow = StateGraph(LevelAgentState)
+def route_after_fetch(state: LevelAgentState):
+    """
+    Skips JSON generation and extraction for pages that did not change.
+    """
+    if state.get("content_unchanged"):
+        return END
+    return "generate_json"
+
+
+def build_level_graph(
+    node_wrapper: Optional[Callable[[Callable[..., Any]], Any]] = None,
+    mode: Optional[str] = None,
+):
+    """
+    Builds and compiles the level subagent graph.
+
+    Args:
+        node_wrapper: Optional hook applied to every node callable before it is
+            added (e.g. batch ingestion wraps LLM nodes with a concurrency limit).
+        mode: "fanout" (generate_json, then extract_items / extract_entities in
+            parallel) or "combined" (a single extract_combined call).
+            Defaults to LEVEL_EXTRACTION_MODE.
+    """
+    mode = mode or LEVEL_EXTRACTION_MODE
+    if mode not in (MODE_FANOUT, MODE_COMBINED):
+        raise ValueError(f"Unknown level extraction mode: {mode}")
+
+    def wrap(fn):
+        return node_wrapper(fn) if node_wrapper else fn
+
+    workflow = StateGraph(LevelAgentState)
+
+    workflow.add_node("fetch_content", wrap(fetch_content_node))
+    if mode == MODE_COMBINED:
+        workflow.add_node("extract_combined", wrap(extract_combined_node))
+    else:
+        workflow.add_node("generate_json", wrap(generate_json_node))
+        workflow.add_node("extract_items", wrap(extract_items_node))
+        workflow.add_node("extract_entities", wrap(extract_entities_node))
+    workflow.add_node("filter_items", wrap(filter_items_node))
+    workflow.add_node("filter_entities", wrap(filter_entities_node))
+    workflow.add_node("check_completion", wrap(check_completion_node))
+    workflow.add_node("update_level_json", wrap(update_level_json_node))
+
+    first_llm_node = "extract_combined" if mode == MODE_COMBINED else "generate_json"
+    workflow.add_edge(START, "fetch_content")
+    workflow.add_conditional_edges(
+        "fetch_content",
+        route_after_fetch,
+        {"generate_json": first_llm_node, END: END},
+    )
 
-workflow.add_node("fetch_content", fetch_content_node)
-workflow.add_node("generate_json", generate_json_node)
-workflow.add_node("extract_items", extract_items_node)
-workflow.add_node("extract_entities", extract_entities_node)
-workflow.add_node("filter_items", filter_items_node)
-workflow.add_node("filter_entities", filter_entities_node)
-workflow.add_node("check_completion", check_completion_node)
-workflow.add_node("update_level_json", update_level_json_node)
+    if mode == MODE_COMBINED:
+        # One call produces both candidate lists
+        workflow.add_edge("extract_combined", "filter_items")
+        workflow.add_edge("extract_combined", "filter_entities")
+    else:
+        # Fork here
+        workflow.add_edge("generate_json", "extract_items")
+        workflow.add_edge("generate_json", "extract_entities")
 
-workflow.add_edge(START, "fetch_content")
-workflow.add_edge("fetch_content", "generate_json")
+        # Branch 1
+        workflow.add_edge("extract_items", "filter_items")
 
-# Fork here
-workflow.add_edge("generate_json", "extract_items")
-workflow.add_edge("generate_json", "extract_entities")
+        # Branch 2
+        workflow.add_edge("extract_entities", "filter_entities")
 
-# Branch 1
-workflow.add_edge("extract_items", "filter_items")
-workflow.add_edge("filter_items", "check_completion")
+    workflow.add_edge("filter_items", "check_completion")
+    workflow.add_edge("filter_entities", "check_completion")
 
-# Branch 2
-workflow.add_edge("extract_entities", "filter_entities")
-workflow.add_edge("filter_entities", "check_completion")
+    # Completion Check
+    workflow.add_conditional_edges(
+        "check_completion",
+        completion_check,
+        {"update_level_json": "update_level_json", END: END},
+    )
 
-# Completion Check
-workflow.add_conditional_edges(
-    "check_completion",
-    completion_check,
-    {"update_level_json": "update_level_json", END: END},
-)
+    workflow.add_edge("update_level_json", END)
 
-workflow.add_edge("update_level_json", END)
+    return workflow.compile()
 
 
 # Compile
-level_agent = workflow.compile()
+level_agent = build_level_graph()
@@ -0,0 +1,229 @@
+"""
+批量导入：在同一进程内并发驱动 level_agent 处理多个层级。
+
+- 层级级别的并发上限 (concurrency)
+- 所有层级共享的 LLM 调用并发上限 (llm_concurrency)
+- wiki 请求按域名限速 (见 backroom_agent.utils.rate_limit)
+- 进度写入 JSON 文件，中断后可续跑
+- 全部完成后只更新一次向量索引
+"""
+
+import asyncio
+import functools
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, cast
+
+from backroom_agent.constants import INGEST_CONCURRENCY, INGEST_LLM_CONCURRENCY
+from backroom_agent.tools.wiki.mirror_health import mirror_health
+from backroom_agent.utils.common import get_project_root
+from backroom_agent.utils.logger import logger
+from backroom_agent.utils.node_annotation import is_llm_node
+from backroom_agent.utils.vector_store import update_vector_db
+
+from .events import last_error
+from .graph import build_level_graph
+from .nodes_llm import limit_llm_calls
+from .state import LevelAgentState
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def default_progress_path() -> str:
+    return os.path.join(get_project_root(), "tmp", "ingest_progress.json")
+
+
+def _load_progress(path: str) -> Dict[str, Any]:
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable progress file {path}: {e}")
+    return {"targets": {}}
+
+
+def _save_progress(path: str, progress: Dict[str, Any]):
+    """原子写入进度文件，避免中断时留下半个 JSON。"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(progress, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _limit_llm_nodes(semaphore: asyncio.Semaphore) -> Callable[[Callable], Any]:
+    """Node wrapper: LLM nodes run in a worker thread while holding the semaphore."""
+
+    def wrapper(fn):
+        if not is_llm_node(fn):
+            return fn
+
+        @functools.wraps(fn)
+        async def limited(state: LevelAgentState):
+            async with semaphore:
+                return await asyncio.to_thread(fn, state)
+
+        return limited
+
+    return wrapper
+
+
+def _initial_state(target: str, force: bool) -> LevelAgentState:
+    state: Dict[str, Any] = {"force_update": force, "logs": []}
+    if target.startswith("http"):
+        state["url"] = target
+        state["level_name"] = None
+    else:
+        state["url"] = None
+        state["level_name"] = target
+    return cast(LevelAgentState, state)
+
+
+def _update_indices(item_paths: List[str], entity_paths: List[str], backend: str):
+    vector_store_dir = os.path.join(get_project_root(), "data/vector_store")
+    os.makedirs(vector_store_dir, exist_ok=True)
+
+    if item_paths:
+        update_vector_db(
+            item_paths,
+            db_path=os.path.join(vector_store_dir, "item_vector_store.pkl"),
+            backend=backend,
+        )
+    if entity_paths:
+        update_vector_db(
+            entity_paths,
+            db_path=os.path.join(vector_store_dir, "entity_vector_store.pkl"),
+            backend=backend,
+        )
+
+
+async def ingest_levels(
+    targets: List[str],
+    force: bool = False,
+    concurrency: int = INGEST_CONCURRENCY,
+    llm_concurrency: int = INGEST_LLM_CONCURRENCY,
+    progress_path: Optional[str] = None,
+    resume: bool = True,
+    update_vectors: bool = True,
+    backend: str = "pickle",
+    mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    并发处理多个层级 (名称或 URL)。
+
+    Args:
+        targets: 层级名称 (如 "level-1") 或 wiki URL 列表
+        force: 传给 level_agent 的 force_update
+        concurrency: 同时处理的层级数
+        llm_concurrency: 所有层级共享的 LLM 并发上限
+        progress_path: 进度文件路径，默认 tmp/ingest_progress.json
+        resume: 为 True 时跳过进度文件中已完成的目标 (force 时不跳过)
+        update_vectors: 结束时是否 (一次性) 更新向量索引
+        backend: 向量库后端 ("pickle" 或 "chroma")
+        mode: 抽取模式 ("fanout" 或 "combined")，默认 LEVEL_EXTRACTION_MODE
+
+    Returns:
+        进度字典 {"targets": {target: {...}}}
+    """
+    progress_path = progress_path or default_progress_path()
+    progress = _load_progress(progress_path) if resume else {"targets": {}}
+    entries: Dict[str, Dict[str, Any]] = progress.setdefault("targets", {})
+
+    if force:
+        # A forced refetch re-runs every target, whatever earlier runs recorded
+        pending = list(targets)
+    else:
+        pending = [
+            t for t in targets if entries.get(t, {}).get("status") != STATUS_DONE
+        ]
+    skipped = len(targets) - len(pending)
+    if skipped:
+        logger.info(f"Resuming: skipping {skipped} already completed target(s)")
+
+    level_semaphore = asyncio.Semaphore(max(1, concurrency))
+    llm_semaphore = asyncio.Semaphore(max(1, llm_concurrency))
+    graph = build_level_graph(_limit_llm_nodes(llm_semaphore), mode=mode)
+
+    async def run_one(target: str):
+        async with level_semaphore:
+            started = time.monotonic()
+            logger.info(f"[ingest] Processing {target}...")
+            entry: Dict[str, Any] = {"status": STATUS_FAILED}
+            try:
+                result = await graph.ainvoke(_initial_state(target, force))
+                ok = bool(result.get("html_content")) and bool(
+                    result.get("level_json_generated")
+                    or result.get("content_unchanged")
+                )
+                entry = {
+                    "status": STATUS_DONE if ok else STATUS_FAILED,
+                    "level_name": result.get("level_name"),
+                    "items": len(result.get("final_items", [])),
+                    "entities": len(result.get("final_entities", [])),
+                    "unchanged": bool(result.get("content_unchanged")),
+                    "saved_item_paths": result.get("saved_item_paths", []),
+                    "saved_entity_paths": result.get("saved_entity_paths", []),
+                    "indexed": False,
+                }
+                if not ok:
+                    entry["error"] = (
+                        last_error(result.get("logs")) or "Unknown failure"
+                    )
+            except Exception as e:
+                entry = {"status": STATUS_FAILED, "error": str(e)}
+
+            entry["elapsed_s"] = round(time.monotonic() - started, 2)
+            entries[target] = entry
+            # 单线程事件循环中顺序写入，无需加锁
+            _save_progress(progress_path, progress)
+            logger.info(
+                f"[ingest] {target}: {entry['status']} in {entry['elapsed_s']}s"
+                + (f" ({entry['error']})" if entry.get("error") else "")
+            )
+
+    started = time.monotonic()
+    # Node slots alone would let each node fan out LEVEL_CHUNK_CONCURRENCY
+    # chunk calls; the call cap keeps the total at llm_concurrency
+    with limit_llm_calls(llm_concurrency):
+        await asyncio.gather(*(run_one(t) for t in pending))
+    for host, stats in mirror_health.snapshot().items():
+        logger.info(
+            f"[ingest] Mirror {host}: latency {stats['latency']:.2f}s, "
+            f"error rate {stats['error_rate']:.0%} ({int(stats['samples'])} requests)"
+        )
+
+    if update_vectors:
+        # 包含之前中断时已完成但尚未入库的层级
+        to_index = [
+            e
+            for e in entries.values()
+            if e.get("status") == STATUS_DONE and not e.get("indexed")
+        ]
+        item_paths = [p for e in to_index for p in e.get("saved_item_paths", [])]
+        entity_paths = [p for e in to_index for p in e.get("saved_entity_paths", [])]
+        if item_paths or entity_paths:
+            logger.info(
+                f"[ingest] Updating vector indices: {len(item_paths)} items, "
+                f"{len(entity_paths)} entities"
+            )
+            await asyncio.to_thread(_update_indices, item_paths, entity_paths, backend)
+        for e in to_index:
+            e["indexed"] = True
+        _save_progress(progress_path, progress)
+
+    done = sum(1 for t in targets if entries.get(t, {}).get("status") == STATUS_DONE)
+    logger.info(
+        f"[ingest] Finished {len(pending)} target(s) in "
+        f"{time.monotonic() - started:.1f}s: {done}/{len(targets)} done"
+    )
+    return progress
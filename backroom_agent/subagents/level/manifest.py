@@ -0,0 +1,144 @@
+"""
+层级产物清单 (manifest)。
+
+每个层级一个 JSON 文件 (data/level/.manifest/{level}.json)，记录各节点产物
+生成时所用输入的哈希：发送给 LLM 的页面文本 (由清洗后 HTML 压缩而来) 的哈希
+与 prompt 文件的哈希。
+输入哈希一致时节点直接复用上次结果 (即使 force_update)，
+使全量刷新在内容未变时接近空操作。
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from backroom_agent.tools.wiki.fetch_cache import content_hash
+from backroom_agent.utils.common import get_project_root
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+# 并行分支 (extract_items / extract_entities) 会同时写同一个清单
+_manifest_lock = threading.Lock()
+
+
+def manifest_path(level_name: str) -> str:
+    return os.path.join(
+        get_project_root(), "data/level", ".manifest", f"{level_name}.json"
+    )
+
+
+# LLM nodes whose system prompt is composed from several prompt files
+NODE_PROMPT_FILES: Dict[str, List[str]] = {
+    "extract_combined": [
+        "generate_json.prompt",
+        "extract_items.prompt",
+        "extract_entities.prompt",
+        "extract_combined.prompt",
+    ],
+}
+
+
+def prompt_hash(prompt_file: Union[str, List[str]]) -> str:
+    """
+    Hash of a prompt file under prompts/ (e.g. "generate_json.prompt"),
+    or of several files for composed prompts.
+    """
+    if not isinstance(prompt_file, str):
+        return content_hash("".join(prompt_hash(f) for f in prompt_file))
+    with open(os.path.join(PROMPTS_DIR, prompt_file), "r", encoding="utf-8") as f:
+        return content_hash(f.read())
+
+
+def node_prompt_files(node: str) -> List[str]:
+    return NODE_PROMPT_FILES.get(node, [f"{node}.prompt"])
+
+
+def node_inputs(llm_input: str, prompt_file: Union[str, List[str]]) -> Dict[str, str]:
+    """
+    Input fingerprint of an LLM node: hash of the page text actually sent
+    (compressed from the cleaned HTML) + prompt hash.
+    """
+    return {
+        "input_hash": content_hash(llm_input),
+        "prompt_hash": prompt_hash(prompt_file),
+    }
+
+
+def load_manifest(level_name: str) -> Dict[str, Any]:
+    path = manifest_path(level_name)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(level_name: str, manifest: Dict[str, Any]):
+    path = manifest_path(level_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_artifact(
+    level_name: Optional[str], node: str, inputs: Dict[str, str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the manifest entry of `node` if it was produced from exactly
+    these inputs, else None.
+    """
+    if not level_name:
+        return None
+    entry = load_manifest(level_name).get(node)
+    if not isinstance(entry, dict) or entry.get("inputs") != inputs:
+        return None
+    return entry
+
+
+def record_artifact(
+    level_name: Optional[str],
+    node: str,
+    inputs: Dict[str, str],
+    output: Any = None,
+):
+    """Records that `node` produced its artifact (and optional output) from inputs."""
+    if not level_name:
+        return
+    with _manifest_lock:
+        manifest = load_manifest(level_name)
+        entry: Dict[str, Any] = {"inputs": inputs, "updated_at": int(time.time())}
+        if output is not None:
+            entry["output"] = output
+        manifest[node] = entry
+        _write_manifest(level_name, manifest)
+
+
+def has_stale_prompts(level_name: Optional[str]) -> bool:
+    """True if any recorded artifact was produced with a prompt that has since changed."""
+    if not level_name:
+        return False
+    for node, entry in load_manifest(level_name).items():
+        if not isinstance(entry, dict):
+            continue
+        recorded = entry.get("inputs", {}).get("prompt_hash")
+        files = node_prompt_files(node)
+        try:
+            current = prompt_hash(files[0] if len(files) == 1 else files)
+        except OSError:
+            continue
+        if recorded and recorded != current:
+            return True
+    return False
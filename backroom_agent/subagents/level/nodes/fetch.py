@@ -1,17 +1,22 @@
+import json
 import os
 import re
 from typing import Any, Dict, List, Optional, Tuple, cast
 from urllib.parse import urlparse
 
 from backroom_agent.tools.wiki.parse import \
-    clean_html_content  # Import cleaning logic
-from backroom_agent.tools.wiki_tools import (fetch_wiki_content,
+    clean_page_content  # Import cleaning logic
+from backroom_agent.tools.wiki.reclean import write_text_if_changed
+from backroom_agent.tools.wiki.url_cache import get_url_cache
+from backroom_agent.tools.wiki_tools import (fetch_wiki_page,
                                              get_level_name_from_url)
 from backroom_agent.utils.common import get_project_root
 from backroom_agent.utils.logger import logger
 from backroom_agent.utils.node_annotation import annotate_node
-from backroom_agent.utils.search import search_backrooms_wiki
+from backroom_agent.utils.search import SearchError, search_backrooms_wiki
 
+from ..events import NodeLog
+from ..manifest import has_stale_prompts
 from ..state import LevelAgentState
 
 # --- Domain Priority Configuration ---
@@ -27,7 +32,7 @@ def _get_allowed_domains() -> List[str]:
 
 
 def _try_load_raw_and_clean(
-    level_name: Optional[str], url: Optional[str], logs: List[str]
+    level_name: Optional[str], url: Optional[str], logs: NodeLog
 ) -> Tuple[Optional[str], Optional[str], List[Dict[str, str]]]:
     """
     Fallback method: Try to load from data/raw/ and apply NEW cleaning logic.
@@ -56,20 +61,12 @@ def _try_load_raw_and_clean(
                     raw_content = f.read()
 
                 # Apply Cleaning
-                cleaned_content, extracted_links = clean_html_content(raw_content)
-                cleaned_content = "\n".join(
-                    [
-                        line.strip()
-                        for line in cleaned_content.splitlines()
-                        if line.strip()
-                    ]
-                )
+                cleaned_content, extracted_links = clean_page_content(raw_content)
 
                 # Optional: Update the data/level/ file too?
                 # Yes, if we are 'forcing' update from raw, we should update the cleaned cache.
                 clean_path = os.path.join(root, "data/level", f"{cand}.html")
-                with open(clean_path, "w", encoding="utf-8") as f:
-                    f.write(cleaned_content)
+                write_text_if_changed(clean_path, cleaned_content)
 
                 return cleaned_content, cand, extracted_links
             except Exception as e:
@@ -78,6 +75,19 @@ def _try_load_raw_and_clean(
     return None, None, []
 
 
+def _level_artifacts_complete(level_name: Optional[str]) -> bool:
+    """True if data/level/{level}.json already holds items, entities and links."""
+    if not level_name:
+        return False
+    json_path = os.path.join(get_project_root(), "data/level", f"{level_name}.json")
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+    return all(key in data for key in ("findable_items", "entities", "links"))
+
+
 def _get_mirror_url(path_segment: str, mirror_base: str) -> str:
     """Combines a mirror base URL with a path segment."""
     return f"{mirror_base.rstrip('/')}/{path_segment.lstrip('/')}"
@@ -131,7 +141,7 @@ def _generate_alternatives(url: str) -> List[str]:
 
 
 def _normalize_input(
-    url: Optional[str], level_name: Optional[str], logs: List[str]
+    url: Optional[str], level_name: Optional[str], logs: NodeLog
 ) -> Tuple[Optional[str], Optional[str]]:
     """
     Step 1: Normalize input.
@@ -157,7 +167,7 @@ def _normalize_input(
 
 
 def _try_load_local(
-    level_name: Optional[str], url: Optional[str], logs: List[str]
+    level_name: Optional[str], url: Optional[str], logs: NodeLog
 ) -> Tuple[Optional[str], Optional[str]]:
     """
     Step 2: Try to find a local HTML file for the level.
@@ -192,12 +202,14 @@ def _try_load_local(
     return None, None
 
 
-def _resolve_missing_url(level_name: str, logs: List[str]) -> str:
+def _resolve_missing_url(level_name: str, logs: NodeLog) -> str:
     """
     Step 3: If no URL is present, attempt to find one.
     Strategy:
     1. Heuristic construction (standard levels).
-    2. Search.
+    2. URL cache (earlier searches and links of fetched pages, incl. misses).
+    3. Search (result cached; failed searches are not, so an outage does not
+       leave negative entries behind).
 
     Returns a single 'primary' URL candidate.
     """
@@ -213,9 +225,26 @@ def _resolve_missing_url(level_name: str, logs: List[str]) -> str:
         logs.append(f"Constructed URL (Heuristic): {url}")
         return url
 
-    # Search
-    logs.append(f"Searching for: {level_name}")
-    found = search_backrooms_wiki(level_name)
+    # Cached resolution (earlier search, or learned from fetched pages' links)
+    cache = get_url_cache()
+    cached = cache.lookup(normalized_name)
+    if cached is not None:
+        found = cached["url"]
+        if found:
+            logs.append(f"Resolved from URL cache ({cached['source']}): {found}")
+        else:
+            logs.append(f"Cached search miss for: {level_name}")
+    else:
+        # Search
+        logs.append(f"Searching for: {level_name}")
+        try:
+            found = search_backrooms_wiki(level_name, raise_errors=True)
+        except SearchError as e:
+            logs.warning(f"Search failed for {level_name} (not cached): {e}")
+            found = None
+        else:
+            cache.store(normalized_name, found, source="search")
+
     if found:
         # If search result is on a known mirror, rewrite to preferred mirror IF path is compatible?
         # Safe strategy: If successful search, trust it as the primary.
@@ -251,13 +280,12 @@ def fetch_content_node(state: LevelAgentState):
     """
     url = state.get("url")
     level_name: Optional[str] = state.get("level_name")
-    logs = state.get("logs", [])
+    logs = NodeLog("fetch_content", level_name or url)
     force_update = state.get("force_update", False)
 
     state_updates: Dict[str, Any] = {
         "items_extracted": False,
         "entities_extracted": False,
-        "logs": logs,
     }
 
     # 1. Normalize Input
@@ -275,13 +303,13 @@ def fetch_content_node(state: LevelAgentState):
             # but usually good to keep what we have.
             if url:
                 state_updates["url"] = url
-            return state_updates
+            return {**state_updates, **logs.updates()}
 
     # 3. Resolve URL (if missing)
     if not url:
         if not level_name:
-            logs.append("Error: No URL and no Level Name provided.")
-            return {"logs": logs}
+            logs.error("No URL and no Level Name provided.")
+            return logs.updates()
 
         url = _resolve_missing_url(level_name, logs)
         state_updates["url"] = url
@@ -300,41 +328,70 @@ def fetch_content_node(state: LevelAgentState):
         is_known = any(d in url for d in _get_allowed_domains())
 
         if is_known:
-            candidates = _generate_alternatives(url)
+            candidates = _generate_alternatives(url) or [url]
         else:
             candidates = [url]
 
         success = False
         last_error = None
 
-        for cand in candidates:
-            try:
-                logs.append(f"Attempting fetch from: {cand}")
-                content, extracted_name, extracted_links = fetch_wiki_content(
-                    cand, save_files=True
+        try:
+            # Mirrors are raced (hedged fetch), ordered by their health scores
+            if len(candidates) > 1:
+                logs.append(f"Racing mirrors: {', '.join(candidates)}")
+            else:
+                logs.append(f"Attempting fetch from: {url}")
+            page = fetch_wiki_page(
+                candidates[0], save_files=True, alternatives=candidates[1:]
+            )
+            if not page.content:
+                raise ValueError("Empty or missing page on every mirror")
+            cand = page.url or candidates[0]
+            logs.append(f"Fetched from: {cand}")
+            content, extracted_name = page.content, page.level_name
+
+            state_updates["html_content"] = content
+            state_updates["extracted_links"] = page.links
+            state_updates["url"] = cand  # Update state with the working URL
+
+            # Links of every fetched page feed the name -> URL cache
+            learned = get_url_cache().learn_links(
+                page.links, cand, _get_allowed_domains()
+            )
+            if learned:
+                logs.count("urls_learned", learned)
+
+            if not state_updates.get("level_name") and extracted_name is not None:
+                state_updates["level_name"] = cast(str, extracted_name)
+            elif (
+                level_name
+                and not state.get("level_name")
+                and extracted_name is not None
+            ):
+                state_updates["level_name"] = cast(str, extracted_name)
+
+            # Unchanged page whose artifacts already exist (and were not
+            # produced with an outdated prompt): skip LLM work
+            resolved_name = state_updates.get("level_name") or level_name
+            if (
+                page.unchanged
+                and _level_artifacts_complete(resolved_name)
+                and not has_stale_prompts(resolved_name)
+            ):
+                logs.append(
+                    "Page unchanged since last fetch and level data is complete. "
+                    "Skipping JSON generation and extraction."
                 )
+                state_updates["content_unchanged"] = True
 
-                state_updates["html_content"] = content
-                state_updates["extracted_links"] = extracted_links
-                state_updates["url"] = cand  # Update state with the working URL
-
-                if not state_updates.get("level_name") and extracted_name is not None:
-                    state_updates["level_name"] = cast(str, extracted_name)
-                elif (
-                    level_name
-                    and not state.get("level_name")
-                    and extracted_name is not None
-                ):
-                    state_updates["level_name"] = cast(str, extracted_name)
-
-                success = True
-                break  # Stop on success
-            except Exception as e:
-                logs.append(f"Failed to fetch {cand}: {e}")
-                last_error = e
+            success = True
+        except Exception as e:
+            logs.warning(f"Failed to fetch {url}: {e}")
+            logs.count("fetch_failures")
+            last_error = e
 
         if not success:
-            logs.append(f"All fetch attempts failed. Last error: {last_error}")
+            logs.error(f"All fetch attempts failed. Last error: {last_error}")
 
             # 5. Fallback to RAW cache if fetch failed
             if force_update:
@@ -352,9 +409,9 @@ def fetch_content_node(state: LevelAgentState):
                         state_updates["level_name"] = found_name
                     logs.append("Successfully recovered from RAW cache.")
                 else:
-                    logs.append("Fallback to RAW cache failed.")
+                    logs.error("Fallback to RAW cache failed.")
 
     else:
-        logs.append("Error: Could not resolve a URL to fetch.")
+        logs.error("Could not resolve a URL to fetch.")
 
-    return state_updates
+    return {**state_updates, **logs.updates()}
@@ -1,37 +1,79 @@
-from typing import Callable, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
+from backroom_agent.tools.wiki.matcher import (AhoCorasick, html_to_match_text,
+                                               normalize_for_match)
 from backroom_agent.utils.node_annotation import annotate_node
 
+from ..events import NodeLog
 from ..state import LevelAgentState
 
 
+def _candidate_names(candidate: dict) -> List[str]:
+    """The candidate's name plus any aliases the extraction returned."""
+    names = [candidate.get("name")]
+    aliases = candidate.get("aliases")
+    if isinstance(aliases, list):
+        names.extend(aliases)
+    return [n for n in names if isinstance(n, str) and n.strip()]
+
+
 def _filter_candidates(
     candidates: List[dict],
     html_content: str,
-    logs: List[str],
+    logs: NodeLog,
     category_label: str,
-) -> List[dict]:
+) -> Tuple[List[dict], List[List[List[int]]]]:
     """
     Abstracted logic for filtering lists of candidates.
-    1. Hallucination Check (name presence).
+    1. Hallucination Check (name or alias presence).
+
+    All names are matched in one Aho-Corasick pass over the tag-stripped,
+    normalised page text, so names split by inline tags or line breaks still
+    count and the cost stays linear in page size.
+
+    Returns the accepted candidates (unchanged) and, in the same order, their
+    match spans: [start, end] offsets into html_to_match_text(html_content).
+    The spans stay in the agent state only; the candidates are what gets
+    persisted and shown to the LLM.
     """
     final_list = []
-    logs.append(f"Filtering {category_label}...")
-    total = len(candidates)
+    final_spans: List[List[List[int]]] = []
+    rejected = []
+
+    patterns: Dict[int, List[str]] = {
+        i: [normalize_for_match(n) for n in _candidate_names(item)]
+        for i, item in enumerate(candidates)
+        if isinstance(item, dict)
+    }
+    matcher = AhoCorasick(p for names in patterns.values() for p in names)
+    found = matcher.find_all(html_to_match_text(html_content or ""))
 
     for i, item in enumerate(candidates):
-        name = item.get("name")
-        logs.append(f"Processing {category_label} {i+1}/{total}: {name}")
+        name = item.get("name") if isinstance(item, dict) else None
 
         # 1. Hallucination Check
-        if not isinstance(name, str) or name not in html_content:
-            logs.append(f"Filtered (Hallucination): '{name}' not found in source text.")
+        spans = [span for p in patterns.get(i, []) for span in found.get(p, [])]
+        if not spans:
+            rejected.append(str(name))
+            logs.debug(f"Filtered (Hallucination): '{name}' not found in source text.")
             continue
 
+        spans = sorted(set(spans))
         final_list.append(item)
-        logs.append(f"Accepted: {name}")
-
-    return final_list
+        final_spans.append([list(span) for span in spans])
+        first = spans[0]
+        logs.debug(
+            f"Accepted: {name} ({len(spans)} match(es), first at {first[0]}-{first[1]})"
+        )
+
+    logs.count(f"{category_label}_accepted", len(final_list))
+    logs.count(f"{category_label}_rejected", len(rejected))
+    summary = f"Filtered {category_label}: {len(final_list)}/{len(candidates)} accepted"
+    if rejected:
+        shown = ", ".join(rejected[:10]) + (" ..." if len(rejected) > 10 else "")
+        summary += f"; not found in source text: {shown}"
+    logs.info(summary)
+    return final_list, final_spans
 
 
 @annotate_node("normal")
@@ -40,18 +82,23 @@ def filter_items_node(state: LevelAgentState):
     Filters extracted items based on:
     1. Hallucination check.
     """
-    logs = state.get("logs", [])
+    logs = NodeLog("filter_items", state.get("level_name"))
     raw_items = state.get("extracted_items_raw", [])
     html_content = state.get("html_content", "")
 
-    final_items = _filter_candidates(
+    final_items, spans = _filter_candidates(
         candidates=raw_items,
         html_content=html_content,
         logs=logs,
         category_label="items",
     )
 
-    return {"final_items": final_items, "logs": logs, "items_extracted": True}
+    return {
+        "final_items": final_items,
+        "final_item_spans": spans,
+        "items_extracted": True,
+        **logs.updates(),
+    }
 
 
 @annotate_node("normal")
@@ -60,15 +107,20 @@ def filter_entities_node(state: LevelAgentState):
     Filters extracted entities based on:
     1. Hallucination check.
     """
-    logs = state.get("logs", [])
+    logs = NodeLog("filter_entities", state.get("level_name"))
     raw_entities = state.get("extracted_entities_raw", [])
     html_content = state.get("html_content", "")
 
-    final_entities = _filter_candidates(
+    final_entities, spans = _filter_candidates(
         candidates=raw_entities,
         html_content=html_content,
         logs=logs,
         category_label="entities",
     )
 
-    return {"final_entities": final_entities, "logs": logs, "entities_extracted": True}
+    return {
+        "final_entities": final_entities,
+        "final_entity_spans": spans,
+        "entities_extracted": True,
+        **logs.updates(),
+    }
@@ -4,6 +4,7 @@ import os
 from backroom_agent.utils.common import get_project_root
 from backroom_agent.utils.node_annotation import annotate_node
 
+from ..events import NodeLog
 from ..state import LevelAgentState
 
 
@@ -25,17 +26,17 @@ def update_level_json_node(state: LevelAgentState):
     final_items = state.get("final_items", [])
     final_entities = state.get("final_entities", [])
     extracted_links = state.get("extracted_links", [])
-    logs = state.get("logs", [])
+    logs = NodeLog("update_level_json", level_name)
 
     if not level_name:
-        return {"logs": logs}
+        return logs.updates()
 
     root = get_project_root()
     json_path = os.path.join(root, "data/level", f"{level_name}.json")
 
     if not os.path.exists(json_path):
-        logs.append(f"Warning: JSON file {json_path} not found. Cannot update items.")
-        return {"logs": logs}
+        logs.warning(f"JSON file {json_path} not found. Cannot update items.")
+        return logs.updates()
 
     try:
         with open(json_path, "r", encoding="utf-8") as f:
@@ -101,7 +102,14 @@ def update_level_json_node(state: LevelAgentState):
         # Vector store updates are now handled in post-processing/batch operations.
         # No logging needed here as we are doing nothing.
 
+        # Saved paths are returned so batch ingestion can update the indices once.
+        return {
+            "saved_item_paths": saved_item_paths,
+            "saved_entity_paths": saved_entity_paths,
+            **logs.updates(),
+        }
+
     except Exception as e:
-        logs.append(f"Error updating JSON/Files: {str(e)}")
+        logs.error(f"Error updating JSON/Files: {str(e)}")
 
-    return {"logs": logs}
+    return logs.updates()
@@ -1,13 +1,212 @@
+import contextlib
+import contextvars
 import json
 import os
-
-from langchain_core.messages import HumanMessage, SystemMessage
-
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backroom_agent.constants import (LEVEL_CHUNK_CONCURRENCY,
+                                      LEVEL_EXTRACT_TOKEN_BUDGET)
+from backroom_agent.tools.wiki.compress import (chunk_text, count_tokens,
+                                                fit_to_budget, html_to_text)
 from backroom_agent.utils.common import get_llm, get_project_root, load_prompt
 from backroom_agent.utils.node_annotation import annotate_node
 
+from .events import NodeLog
+from .manifest import (get_artifact, node_inputs, node_prompt_files,
+                       record_artifact)
+from .schemas import COMBINED_SECTIONS, validate_combined
 from .state import LevelAgentState
 
+# Follow-up requests for missing/invalid sections of a combined extraction
+COMBINED_MAX_RETRIES = 2
+
+
+# Cap on concurrent LLM calls shared by every node and chunk of a run (set
+# by batch ingestion; unlimited otherwise). Chunk threads inherit it through
+# contextvars.copy_context.
+_llm_call_limit: contextvars.ContextVar[Optional[threading.Semaphore]] = (
+    contextvars.ContextVar("level_llm_call_limit", default=None)
+)
+
+
+@contextlib.contextmanager
+def limit_llm_calls(limit: int) -> Iterator[None]:
+    """Caps the LLM calls made inside the block (and tasks started from it)."""
+    token = _llm_call_limit.set(threading.BoundedSemaphore(max(1, limit)))
+    try:
+        yield
+    finally:
+        _llm_call_limit.reset(token)
+
+
+@contextlib.contextmanager
+def _llm_slot() -> Iterator[None]:
+    semaphore = _llm_call_limit.get()
+    if semaphore is None:
+        yield
+        return
+    with semaphore:
+        yield
+
+
+def _strip_code_block(content: str) -> str:
+    """Returns the body of a ```json (or ```) block if present."""
+    if "```json" in content:
+        return content.split("```json")[1].split("```")[0].strip()
+    if "```" in content:
+        return content.split("```")[1].strip()
+    return content
+
+
+def _invoke_llm(messages) -> str:
+    with _llm_slot():
+        response = get_llm().invoke(messages)
+    content = response.content
+    if not isinstance(content, str):
+        content = str(content)
+    return _strip_code_block(content)
+
+
+def _extract_chunk(
+    system_prompt: str,
+    chunk: str,
+    instruction: str,
+    parse: Callable[[Any, List[str]], List[Dict]],
+) -> Tuple[List[Dict], List[str], Optional[Exception]]:
+    """Map step: one LLM call on one chunk. Logs are returned, not shared across threads."""
+    logs: List[str] = []
+    messages = [
+        SystemMessage(content=system_prompt.format(context=chunk)),
+        HumanMessage(content=instruction),
+    ]
+    try:
+        return parse(json.loads(_invoke_llm(messages)), logs), logs, None
+    except Exception as e:
+        return [], logs, e
+
+
+def _extract_from_chunks(
+    chunks: List[str],
+    prompt_file: str,
+    instruction: str,
+    parse: Callable[[Any, List[str]], List[Dict]],
+    logs: NodeLog,
+) -> Tuple[List[Dict], bool]:
+    """
+    Runs an extraction prompt on each page chunk (concurrently, up to
+    LEVEL_CHUNK_CONCURRENCY calls, within the run's limit_llm_calls cap) and
+    concatenates the results in page order.
+    Returns (results, all_chunks_succeeded).
+    """
+    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", prompt_file)
+    system_prompt = load_prompt(prompt_path)
+
+    def run(chunk: str):
+        return _extract_chunk(system_prompt, chunk, instruction, parse)
+
+    if len(chunks) > 1 and LEVEL_CHUNK_CONCURRENCY > 1:
+        workers = min(LEVEL_CHUNK_CONCURRENCY, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # copy_context keeps LangChain callbacks / tracing attached to each call
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, chunk)
+                for chunk in chunks
+            ]
+            outcomes = [future.result() for future in futures]
+    else:
+        outcomes = [run(chunk) for chunk in chunks]
+
+    results: List[Dict] = []
+    ok = True
+    for i, (chunk_results, chunk_logs, error) in enumerate(outcomes, 1):
+        logs.extend(chunk_logs)
+        if error is not None:
+            ok = False
+            suffix = f" (chunk {i}/{len(chunks)})" if len(chunks) > 1 else ""
+            logs.append(f"Error extracting from {prompt_file}{suffix}: {error}")
+        results.extend(chunk_results)
+    return results, ok
+
+
+def _normalize_name(name: str) -> str:
+    """Dedupe key: NFKC, case-folded, without whitespace and punctuation."""
+    return re.sub(r"[\W_]+", "", unicodedata.normalize("NFKC", name).casefold())
+
+
+def _merge_candidates(
+    candidates: List[Dict], logs: NodeLog, category_label: str
+) -> List[Dict]:
+    """
+    Reduce step: merges candidates whose names normalise to the same key
+    (the same item seen in several chunks). The first occurrence wins; empty
+    fields are filled from later duplicates, and the longer description is kept.
+    """
+    merged: Dict[str, Dict] = {}
+    unnamed: List[Dict] = []
+    for candidate in candidates:
+        name = candidate.get("name") if isinstance(candidate, dict) else None
+        key = _normalize_name(name) if isinstance(name, str) else ""
+        if not key:
+            # Left for the filter nodes to reject
+            unnamed.append(candidate)
+            continue
+        if key not in merged:
+            merged[key] = dict(candidate)
+            continue
+        kept = merged[key]
+        for field, value in candidate.items():
+            if value in (None, "", [], {}):
+                continue
+            if kept.get(field) in (None, "", [], {}):
+                kept[field] = value
+            elif field == "description" and len(str(value)) > len(str(kept[field])):
+                kept[field] = value
+
+    duplicates = len(candidates) - len(merged) - len(unnamed)
+    if duplicates:
+        logs.count(f"{category_label}_merged", duplicates)
+        logs.info(f"Merged {duplicates} duplicate {category_label} by name.")
+    return list(merged.values()) + unnamed
+
+
+def _parse_items(parsed_json: Any, logs: List[str]) -> List[Dict]:
+    # Handle new format {"findable_items": [...]} or old list format
+    if isinstance(parsed_json, dict) and "findable_items" in parsed_json:
+        return parsed_json["findable_items"]
+    if isinstance(parsed_json, list):
+        return parsed_json
+    logs.append(
+        f"Warning: Unexpected JSON format. Got keys: {parsed_json.keys() if isinstance(parsed_json, dict) else 'Not a dict'}"
+    )
+    return []
+
+
+def _parse_entities(parsed_json: Any, logs: List[str]) -> List[Dict]:
+    if isinstance(parsed_json, dict) and "entities" in parsed_json:
+        return parsed_json["entities"]
+    logs.append(
+        f"Warning: Unexpected JSON format for entities. Got keys: {parsed_json.keys() if isinstance(parsed_json, dict) else 'Not a dict'}"
+    )
+    return []
+
+
+def _page_chunks(html_content: str, logs: NodeLog) -> List[str]:
+    """Compresses the cleaned HTML and splits it by heading if over budget."""
+    page_text = html_to_text(html_content)
+    chunks = chunk_text(page_text, LEVEL_EXTRACT_TOKEN_BUDGET)
+    if len(chunks) > 1:
+        logs.append(
+            f"Page has {count_tokens(page_text)} tokens (budget {LEVEL_EXTRACT_TOKEN_BUDGET}): "
+            f"extracting from {len(chunks)} chunks."
+        )
+    return chunks
+
 
 @annotate_node("llm")
 def generate_json_node(state: LevelAgentState):
@@ -16,23 +215,39 @@ def generate_json_node(state: LevelAgentState):
     """
     html_content = state.get("html_content")
     level_name = state.get("level_name")
-    logs = state.get("logs", [])
+    logs = NodeLog("generate_json", level_name)
 
     if not html_content:
-        return {"logs": logs + ["Skipping JSON generation: No HTML content."]}
+        logs.warning("Skipping JSON generation: No HTML content.")
+        return logs.updates()
 
     # Check if JSON already exists
     root = get_project_root()
     json_path = os.path.join(root, "data/level", f"{level_name}.json")
 
-    if os.path.exists(json_path) and not state.get("force_update"):
-        logs.append(f"JSON already exists at {json_path}. Skipping generation.")
-        return {"level_json_generated": True, "logs": logs}
+    # The level JSON needs a single context: keep the leading sections that fit
+    page_text = html_to_text(html_content)
+    context = fit_to_budget(page_text, LEVEL_EXTRACT_TOKEN_BUDGET)
+    inputs = node_inputs(context, "generate_json.prompt")
+    if os.path.exists(json_path):
+        if not state.get("force_update"):
+            logs.append(f"JSON already exists at {json_path}. Skipping generation.")
+            return {"level_json_generated": True, **logs.updates()}
+        if get_artifact(level_name, "generate_json", inputs):
+            logs.append(
+                f"JSON at {json_path} is up to date (same page text and prompt). Skipping generation."
+            )
+            return {"level_json_generated": True, **logs.updates()}
 
-    logs.append("Generating Level JSON from HTML...")
+    if context != page_text:
+        logs.append(
+            f"Page exceeds {LEVEL_EXTRACT_TOKEN_BUDGET} tokens: generating JSON from its leading sections."
+        )
+    logs.append(
+        f"Generating Level JSON from page text ({count_tokens(context)} tokens)..."
+    )
     try:
         # LLM Generation logic
-        llm = get_llm()
         prompt_path = os.path.join(
             os.path.dirname(__file__), "prompts", "generate_json.prompt"
         )
@@ -41,31 +256,23 @@ def generate_json_node(state: LevelAgentState):
         messages = [
             SystemMessage(content=system_prompt_text),
             HumanMessage(
-                content=f"Here is the cleaned HTML content of the level:\n\n{html_content}"
+                content=f"Here is the content of the level page (converted to Markdown):\n\n{context}"
             ),
         ]
 
-        response = llm.invoke(messages)
-        content = response.content
-        if not isinstance(content, str):
-            content = str(content)
-
-        # Clean up markdown code blocks
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].strip()
+        content = _invoke_llm(messages)
 
         # Save the generated JSON
         os.makedirs(os.path.dirname(json_path), exist_ok=True)
         with open(json_path, "w", encoding="utf-8") as f:
             f.write(content)
 
+        record_artifact(level_name, "generate_json", inputs)
         logs.append(f"Successfully generated and saved {json_path}")
-        return {"level_json_generated": True, "logs": logs}
+        return {"level_json_generated": True, **logs.updates()}
     except Exception as e:
         logs.append(f"Error generating JSON: {str(e)}")
-        return {"level_json_generated": False, "logs": logs}
+        return {"level_json_generated": False, **logs.updates()}
 
 
 @annotate_node("llm")
@@ -74,56 +281,35 @@ def extract_items_node(state: LevelAgentState):
     Extracts potential items from the HTML content using LLM.
     """
     html_content = state.get("html_content")
-    logs = state.get("logs", [])
+    level_name = state.get("level_name")
+    logs = NodeLog("extract_items", level_name)
 
     if not html_content:
-        return {"extracted_items_raw": [], "logs": logs}
-
-    logs.append("Extracting items from HTML...")
-
-    llm = get_llm()
-    prompt_path = os.path.join(
-        os.path.dirname(__file__), "prompts", "extract_items.prompt"
+        return {"extracted_items_raw": [], **logs.updates()}
+
+    chunks = _page_chunks(html_content, logs)
+    inputs = node_inputs("\n\n".join(chunks), "extract_items.prompt")
+    cached = get_artifact(level_name, "extract_items", inputs)
+    if cached is not None:
+        items = cached.get("output", [])
+        logs.append(f"Reusing {len(items)} raw items (same page text and prompt).")
+        return {"extracted_items_raw": items, **logs.updates()}
+
+    logs.append("Extracting items from page text...")
+    items, ok = _extract_from_chunks(
+        chunks,
+        "extract_items.prompt",
+        "Extract the items now in JSON format.",
+        _parse_items,
+        logs,
     )
-    system_prompt = load_prompt(prompt_path)
-
-    # We might want to truncate HTML if it's too long, but usually wiki pages are okay for recent models
-    messages = [
-        SystemMessage(content=system_prompt.format(context=html_content)),
-        HumanMessage(content="Extract the items now in JSON format."),
-    ]
-
-    try:
-        response = llm.invoke(messages)
-        content = response.content
-        if not isinstance(content, str):
-            content = str(content)
-
-        # Parse JSON from Markdown block
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].strip()
-
-        parsed_json = json.loads(content)
-
-        # Handle new format {"findable_items": [...]} or old list format
-        if isinstance(parsed_json, dict) and "findable_items" in parsed_json:
-            items = parsed_json["findable_items"]
-        elif isinstance(parsed_json, list):
-            items = parsed_json
-        else:
-            items = []
-            logs.append(
-                f"Warning: Unexpected JSON format. Got keys: {parsed_json.keys() if isinstance(parsed_json, dict) else 'Not a dict'}"
-            )
+    items = _merge_candidates(items, logs, "items")
 
-        logs.append(f"Extracted {len(items)} raw items.")
-        return {"extracted_items_raw": items, "logs": logs}
-
-    except Exception as e:
-        logs.append(f"Error extracting items: {e}")
-        return {"extracted_items_raw": [], "logs": logs}
+    # Partial results are used but not recorded, so the next run retries
+    if ok:
+        record_artifact(level_name, "extract_items", inputs, output=items)
+    logs.append(f"Extracted {len(items)} raw items.")
+    return {"extracted_items_raw": items, **logs.updates()}
 
 
 @annotate_node("llm")
@@ -132,49 +318,207 @@ def extract_entities_node(state: LevelAgentState):
     Extracts potential entities from the HTML content using LLM.
     """
     html_content = state.get("html_content")
-    logs = state.get("logs", [])
+    level_name = state.get("level_name")
+    logs = NodeLog("extract_entities", level_name)
 
     if not html_content:
-        return {"extracted_entities_raw": [], "logs": logs}
+        return {"extracted_entities_raw": [], **logs.updates()}
+
+    chunks = _page_chunks(html_content, logs)
+    inputs = node_inputs("\n\n".join(chunks), "extract_entities.prompt")
+    cached = get_artifact(level_name, "extract_entities", inputs)
+    if cached is not None:
+        entities = cached.get("output", [])
+        logs.append(
+            f"Reusing {len(entities)} raw entities (same page text and prompt)."
+        )
+        return {"extracted_entities_raw": entities, **logs.updates()}
+
+    logs.append("Extracting entities from page text...")
+    entities, ok = _extract_from_chunks(
+        chunks,
+        "extract_entities.prompt",
+        "Extract the entities now in JSON format.",
+        _parse_entities,
+        logs,
+    )
+    entities = _merge_candidates(entities, logs, "entities")
+
+    if ok:
+        record_artifact(level_name, "extract_entities", inputs, output=entities)
+    logs.append(f"Extracted {len(entities)} raw entities.")
+    return {"extracted_entities_raw": entities, **logs.updates()}
 
-    logs.append("Extracting entities from HTML...")
 
-    llm = get_llm()
-    prompt_path = os.path.join(
-        os.path.dirname(__file__), "prompts", "extract_entities.prompt"
+def _combined_system_prompt() -> str:
+    """
+    The three task prompts (level JSON, items, entities) followed by the
+    combined output contract of prompts/extract_combined.prompt.
+    """
+    prompts_dir = os.path.join(os.path.dirname(__file__), "prompts")
+
+    def task(prompt_file: str) -> str:
+        # Extraction prompts end with "上下文：{context}"; the page goes in the human message
+        template = load_prompt(os.path.join(prompts_dir, prompt_file))
+        return template.format(context="").rstrip().removesuffix("上下文：").rstrip()
+
+    return "\n\n".join(
+        [
+            "# 第一部分：层级游戏背景 JSON",
+            load_prompt(os.path.join(prompts_dir, "generate_json.prompt")),
+            "# 第二部分：可搜刮物品",
+            task("extract_items.prompt"),
+            "# 第三部分：实体",
+            task("extract_entities.prompt"),
+            load_prompt(os.path.join(prompts_dir, "extract_combined.prompt")),
+        ]
     )
-    system_prompt = load_prompt(prompt_path)
 
-    messages = [
-        SystemMessage(content=system_prompt.format(context=html_content)),
-        HumanMessage(content="Extract the entities now in JSON format."),
+
+def _invoke_combined(
+    context: str, logs: NodeLog
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    One structured-output call for all three sections. Sections that are
+    missing or fail validation are requested again (up to COMBINED_MAX_RETRIES),
+    keeping the valid ones. Returns (sections, remaining_problems).
+    """
+    messages: List[Any] = [
+        SystemMessage(content=_combined_system_prompt()),
+        HumanMessage(
+            content=f"Here is the content of the level page (converted to Markdown):\n\n{context}"
+        ),
     ]
+    sections: Dict[str, Any] = {}
+    problems: Dict[str, str] = {s: "missing" for s in COMBINED_SECTIONS}
 
-    try:
-        response = llm.invoke(messages)
-        content = response.content
-        if not isinstance(content, str):
-            content = str(content)
+    for attempt in range(COMBINED_MAX_RETRIES + 1):
+        if attempt:
+            logs.append(
+                f"Combined extraction incomplete {problems}; retry {attempt}/{COMBINED_MAX_RETRIES}..."
+            )
+        try:
+            with _llm_slot():
+                response = get_llm().invoke(messages)
+        except Exception as e:
+            logs.append(f"Error in combined extraction: {e}")
+            continue
+        raw = (
+            response.content
+            if isinstance(response.content, str)
+            else str(response.content)
+        )
+        try:
+            payload = json.loads(_strip_code_block(raw))
+        except json.JSONDecodeError as e:
+            payload = None
+            logs.append(f"Combined extraction returned invalid JSON: {e}")
+
+        new_sections, new_problems = validate_combined(payload, logs)
+        for key in problems:
+            if key in new_sections:
+                sections[key] = new_sections[key]
+        problems = {k: v for k, v in new_problems.items() if k not in sections}
+        if not problems:
+            break
+
+        listed = ", ".join(f"{k} ({v})" for k, v in problems.items())
+        messages = messages + [
+            AIMessage(content=raw),
+            HumanMessage(
+                content=f"以下部分缺失或不合法：{listed}。请只输出包含这些 key 的 JSON 对象，格式与之前相同。"
+            ),
+        ]
 
-        # Parse JSON from Markdown block
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].strip()
+    return sections, problems
 
-        parsed_json = json.loads(content)
 
-        if isinstance(parsed_json, dict) and "entities" in parsed_json:
-            entities = parsed_json["entities"]
-        else:
-            entities = []
-            logs.append(
-                f"Warning: Unexpected JSON format for entities. Got keys: {parsed_json.keys() if isinstance(parsed_json, dict) else 'Not a dict'}"
-            )
+@annotate_node("llm")
+def extract_combined_node(state: LevelAgentState):
+    """
+    Single-pass alternative to generate_json + extract_items + extract_entities:
+    one structured-output call returns the level JSON, items and entities.
+    """
+    html_content = state.get("html_content")
+    level_name = state.get("level_name")
+    logs = NodeLog("extract_combined", level_name)
 
-        logs.append(f"Extracted {len(entities)} raw entities.")
-        return {"extracted_entities_raw": entities, "logs": logs}
+    if not html_content:
+        logs.warning("Skipping combined extraction: No HTML content.")
+        return {
+            "level_json_generated": False,
+            "extracted_items_raw": [],
+            "extracted_entities_raw": [],
+            **logs.updates(),
+        }
 
-    except Exception as e:
-        logs.append(f"Error extracting entities: {e}")
-        return {"extracted_entities_raw": [], "logs": logs}
+    root = get_project_root()
+    json_path = os.path.join(root, "data/level", f"{level_name}.json")
+
+    chunks = _page_chunks(html_content, logs)
+    inputs = node_inputs("\n\n".join(chunks), node_prompt_files("extract_combined"))
+    cached = get_artifact(level_name, "extract_combined", inputs)
+    if cached is not None and os.path.exists(json_path):
+        output = cached.get("output", {})
+        logs.append("Reusing combined extraction (same page text and prompts).")
+        return {
+            "level_json_generated": True,
+            "extracted_items_raw": output.get("findable_items", []),
+            "extracted_entities_raw": output.get("entities", []),
+            **logs.updates(),
+        }
+
+    logs.append(f"Running combined extraction ({count_tokens(chunks[0])} tokens)...")
+    sections, problems = _invoke_combined(chunks[0], logs)
+
+    if "level" in sections:
+        if os.path.exists(json_path) and not state.get("force_update"):
+            logs.append(f"JSON already exists at {json_path}. Keeping it.")
+        else:
+            os.makedirs(os.path.dirname(json_path), exist_ok=True)
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(sections["level"], f, ensure_ascii=False, indent=2)
+            logs.append(f"Successfully generated and saved {json_path}")
+
+    items = sections.get("findable_items", [])
+    entities = sections.get("entities", [])
+    ok = not problems
+    if problems:
+        logs.warning(f"Combined extraction still incomplete after retries: {problems}")
+
+    # Chunks beyond the first only contribute items and entities
+    if len(chunks) > 1:
+        more_items, items_ok = _extract_from_chunks(
+            chunks[1:],
+            "extract_items.prompt",
+            "Extract the items now in JSON format.",
+            _parse_items,
+            logs,
+        )
+        more_entities, entities_ok = _extract_from_chunks(
+            chunks[1:],
+            "extract_entities.prompt",
+            "Extract the entities now in JSON format.",
+            _parse_entities,
+            logs,
+        )
+        items = items + more_items
+        entities = entities + more_entities
+        ok = ok and items_ok and entities_ok
+    items = _merge_candidates(items, logs, "items")
+    entities = _merge_candidates(entities, logs, "entities")
+
+    if ok:
+        record_artifact(
+            level_name,
+            "extract_combined",
+            inputs,
+            output={"findable_items": items, "entities": entities},
+        )
+    logs.append(f"Extracted {len(items)} raw items and {len(entities)} raw entities.")
+    return {
+        "level_json_generated": "level" in sections or os.path.exists(json_path),
+        "extracted_items_raw": items,
+        "extracted_entities_raw": entities,
+        **logs.updates(),
+    }
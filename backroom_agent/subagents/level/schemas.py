@@ -0,0 +1,98 @@
+"""
+合并抽取 (extract_combined) 输出的校验模型。
+
+一次 LLM 调用返回 {"level", "findable_items", "entities"} 三部分；
+每部分单独校验，缺失或不合法的部分会被点名重试，其余部分保留。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+COMBINED_SECTIONS = ("level", "findable_items", "entities")
+
+
+class LevelDocument(BaseModel):
+    """Level game-context JSON (see prompts/generate_json.prompt)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    level_id: str = Field(min_length=1)
+    title: Optional[str] = None
+    transitions: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ItemCandidate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str = Field(min_length=1)
+    id: str = Field(min_length=1)
+    description: str = ""
+    category: str = "Uncategorized"
+
+
+class EntityCandidate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str = Field(min_length=1)
+    id: str = Field(min_length=1)
+    description: str = ""
+    behavior: str = ""
+
+
+def _validate_list(
+    value: Any, model: type[BaseModel], logs: List[str]
+) -> Optional[List[Dict[str, Any]]]:
+    """Validates a candidate list; invalid entries are dropped, a non-list is rejected."""
+    if not isinstance(value, list):
+        return None
+    valid = []
+    for entry in value:
+        try:
+            valid.append(model.model_validate(entry).model_dump())
+        except ValidationError as e:
+            logs.append(f"Dropped invalid {model.__name__}: {e.errors()[0]['msg']}")
+    return valid
+
+
+def validate_combined(
+    payload: Any, logs: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Validates each section of a combined extraction payload.
+
+    Returns (valid_sections, problems): problems maps every missing or
+    invalid section to a short reason, used in the retry request.
+    """
+    if not isinstance(payload, dict):
+        return {}, {s: "response is not a JSON object" for s in COMBINED_SECTIONS}
+
+    sections: Dict[str, Any] = {}
+    problems: Dict[str, str] = {}
+
+    if "level" not in payload:
+        problems["level"] = "missing"
+    else:
+        try:
+            sections["level"] = LevelDocument.model_validate(
+                payload["level"]
+            ).model_dump(exclude_none=False)
+        except ValidationError as e:
+            problems["level"] = (
+                f"invalid ({e.errors()[0]['loc']}: {e.errors()[0]['msg']})"
+            )
+
+    for key, model in (
+        ("findable_items", ItemCandidate),
+        ("entities", EntityCandidate),
+    ):
+        if key not in payload:
+            problems[key] = "missing"
+            continue
+        valid = _validate_list(payload[key], model, logs)
+        if valid is None:
+            problems[key] = "must be a list"
+        else:
+            sections[key] = valid
+
+    return sections, problems
@@ -1,19 +1,24 @@
-import operator
 from typing import Annotated, Any, Dict, List, Optional, TypedDict
 
+from .events import LevelEvent, add_counters, append_events
+
 
 class LevelAgentState(TypedDict):
     # --- Input / Config ---
     force_update: bool
 
     # --- Shared / Accumulators ---
-    logs: Annotated[List[str], operator.add]
+    # Bounded structured event log: each node returns only its own events
+    logs: Annotated[List[LevelEvent], append_events]
+    log_counters: Annotated[Dict[str, int], add_counters]
 
     # --- Node: fetch_content ---
     url: Optional[str]
     level_name: str
     html_content: str
     extracted_links: List[Dict[str, str]]
+    # Page unchanged (304 / same hash) and artifacts exist: downstream is skipped
+    content_unchanged: bool
 
     # --- Node: generate_json ---
     level_json_generated: bool
@@ -23,6 +28,9 @@ class LevelAgentState(TypedDict):
 
     # --- Node: filter_items ---
     final_items: List[Dict[str, Any]]
+    # Per final item: [start, end] match offsets into the normalised page text
+    # (html_to_match_text); kept out of the saved JSON and LLM context
+    final_item_spans: List[List[List[int]]]
     items_extracted: bool
 
     # --- Node: extract_entities ---
@@ -30,4 +38,10 @@ class LevelAgentState(TypedDict):
 
     # --- Node: filter_entities ---
     final_entities: List[Dict[str, Any]]
+    # Same as final_item_spans, per final entity
+    final_entity_spans: List[List[List[int]]]
     entities_extracted: bool
+
+    # --- Node: update_level_json ---
+    saved_item_paths: List[str]
+    saved_entity_paths: List[str]
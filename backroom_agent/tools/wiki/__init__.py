@@ -1,8 +1,14 @@
-from .fetch import fetch_url_content, get_level_name_from_url
-from .parse import clean_html_content
+from .fetch import (AsyncWikiFetcher, fetch_url_content,
+                    fetch_url_content_async, get_level_name_from_url)
+from .parse import clean_html_content, clean_page_content
+from .reclean import reclean_raw_pages
 
 __all__ = [
+    "AsyncWikiFetcher",
     "fetch_url_content",
+    "fetch_url_content_async",
     "get_level_name_from_url",
     "clean_html_content",
+    "clean_page_content",
+    "reclean_raw_pages",
 ]
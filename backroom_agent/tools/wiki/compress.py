@@ -0,0 +1,262 @@
+"""
+清洗后 HTML 的上下文压缩。
+
+LLM 节点不再直接接收带标签的 HTML：先转换为紧凑的 Markdown 风格文本
+(标题 / 列表 / 表格保留结构，链接只保留文字，去掉目录、语言切换等样板行)，
+再用 tokenizer 统计 token；超出预算时按标题切分为多个块，而不是截断。
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+from backroom_agent.constants import TOKENIZER_ENCODING
+from backroom_agent.tools.wiki.constants import BOILERPLATE_PATTERNS
+from backroom_agent.utils.logger import logger
+
+_BOILERPLATE_RE = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS))
+_INLINE_SPACE_RE = re.compile(r"[ \t\f\v\u00a0\u3000]+")
+_ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+# CJK punctuation, kana, ideographs, hangul, full-width forms
+_CJK_RE = re.compile(
+    "[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]"
+)
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_BLOCK_TAGS = {"p", "div", "blockquote", "ul", "ol", "dl", "table", "thead", "tbody"}
+_ROW_PREFIXES = ("- ", "| ")
+_CONTAINER_TAGS = {"ul", "ol", "dl", "table", "thead", "tbody", "tfoot", "tr"}
+
+# --- HTML -> text ---
+
+
+def _render(node, out: List[str]):
+    if isinstance(node, Comment):
+        return
+    if isinstance(node, NavigableString):
+        text = str(node)
+        # Whitespace between list items / table rows carries no content
+        if (
+            text.strip()
+            or node.parent is None
+            or node.parent.name not in _CONTAINER_TAGS
+        ):
+            out.append(text)
+        return
+    if not isinstance(node, Tag):
+        return
+
+    name = node.name
+    if name in _HEADING_TAGS:
+        out.append("\n\n" + "#" * int(name[1]) + " ")
+        _render_children(node, out)
+        out.append("\n\n")
+    elif name == "br":
+        out.append("\n")
+    elif name == "hr":
+        out.append("\n\n")
+    elif name == "li":
+        out.append("\n- ")
+        _render_children(node, out)
+    elif name == "dt":
+        out.append("\n")
+        _render_children(node, out)
+    elif name == "dd":
+        out.append("\n: ")
+        _render_children(node, out)
+    elif name == "tr":
+        cells = [
+            " ".join(cell.get_text(" ", strip=True).split())
+            for cell in node.find_all(["th", "td"], recursive=False)
+        ]
+        if any(cells):
+            out.append("\n| " + " | ".join(cells) + " |")
+    elif name == "pre":
+        out.append("\n\n```\n" + node.get_text().strip("\n") + "\n```\n\n")
+    elif name == "a" and str(node.get("href", "")).startswith("#"):
+        # In-page anchors: table of contents and footnote markers
+        return
+    elif name in _BLOCK_TAGS:
+        out.append("\n\n")
+        _render_children(node, out)
+        out.append("\n\n")
+    else:
+        # Inline formatting (strong/em/a/code...) keeps only its text
+        _render_children(node, out)
+
+
+def _render_children(node: Tag, out: List[str]):
+    for child in node.children:
+        _render(child, out)
+
+
+@lru_cache(maxsize=64)
+def html_to_text(html: str) -> str:
+    """
+    Converts cleaned HTML (data/level/{level}.html) into compact Markdown-ish
+    text: headings as '#', list items as '-', table rows as '| a | b |';
+    boilerplate lines, zero-width characters and repeated lines are dropped.
+    """
+    if not html:
+        return ""
+    out: List[str] = []
+    _render(BeautifulSoup(html, "html.parser"), out)
+
+    lines: List[str] = []
+    in_code = False
+    for line in _ZERO_WIDTH_RE.sub("", "".join(out)).split("\n"):
+        if line.startswith("```"):
+            in_code = not in_code
+        if in_code:
+            lines.append(line.rstrip())
+            continue
+        line = _INLINE_SPACE_RE.sub(" ", line).strip()
+        if _BOILERPLATE_RE.fullmatch(line) or line in ("-", ":", "#"):
+            continue
+        if line and lines and line == lines[-1]:
+            continue
+        if not line and (not lines or not lines[-1]):
+            continue
+        if line.startswith(_ROW_PREFIXES) and len(lines) > 1 and not lines[-1]:
+            if lines[-2].startswith(_ROW_PREFIXES):
+                lines.pop()  # keep list items / table rows together
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+# --- Token counting ---
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if TOKENIZER_ENCODING:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception as e:
+                logger.warning(
+                    f"Tokenizer '{TOKENIZER_ENCODING}' unavailable ({e}); "
+                    "falling back to a character-based estimate."
+                )
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Character-based estimate: one token per CJK character, ~4 chars otherwise."""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken (TOKENIZER_ENCODING) if available."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# --- Chunking ---
+
+
+def split_sections(text: str) -> List[str]:
+    """Splits text before every Markdown heading line."""
+    sections: List[str] = []
+    current: List[str] = []
+    for line in text.split("\n"):
+        if line.startswith("#") and current:
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current).strip())
+    return [s for s in sections if s]
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Splits one section by paragraphs, then lines, then characters."""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    for separator in ("\n\n", "\n"):
+        parts = [p for p in text.split(separator) if p.strip()]
+        if len(parts) > 1:
+            return _pack(
+                [q for p in parts for q in _split_oversized(p, max_tokens)],
+                max_tokens,
+                separator,
+            )
+
+    # A single huge line: cut proportionally to the token count
+    pieces = math.ceil(count_tokens(text) / max_tokens)
+    size = math.ceil(len(text) / pieces)
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _pack(parts: List[str], max_tokens: int, separator: str) -> List[str]:
+    """Greedily packs consecutive parts into chunks of at most max_tokens."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for part in parts:
+        tokens = count_tokens(part)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Returns [text] if it fits in max_tokens, else chunks made of whole
+    sections (split at headings). A section larger than the budget is split
+    further, each piece repeating the section heading for context.
+    """
+    if not text:
+        return []
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    parts: List[str] = []
+    for section in split_sections(text):
+        heading: Optional[str] = section.split("\n", 1)[0]
+        if not heading.startswith("#"):
+            heading = None
+        pieces = _split_oversized(section, max_tokens)
+        for i, piece in enumerate(pieces):
+            if i > 0 and heading:
+                piece = f"{heading}\n{piece}"
+            parts.append(piece)
+    return _pack(parts, max_tokens, "\n\n")
+
+
+def compress_html(html: str, max_tokens: int) -> List[str]:
+    """html_to_text + chunk_text: the page as one or more LLM-sized chunks."""
+    return chunk_text(html_to_text(html), max_tokens)
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Keeps the leading whole sections of `text` that fit in max_tokens
+    (for prompts that need a single context). Logs what was left out.
+    """
+    chunks = chunk_text(text, max_tokens)
+    if len(chunks) > 1:
+        logger.info(
+            f"Context over budget ({count_tokens(text)} > {max_tokens} tokens): "
+            f"using the first of {len(chunks)} chunks."
+        )
+    return chunks[0] if chunks else ""
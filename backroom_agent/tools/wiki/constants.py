@@ -12,6 +12,16 @@ REQUEST_HEADERS = {
     "Sec-Fetch-User": "?1",
 }
 
+# Fetch behaviour
+FETCH_TIMEOUT = 30.0
+# Jittered exponential backoff: base * 2**attempt (capped), scaled by 0.5-1.5
+FETCH_BACKOFF_BASE = 1.0
+FETCH_BACKOFF_CAP = 30.0
+# Statuses worth retrying (rate limits / transient server errors)
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+# Weight of the newest sample in the per-mirror latency / error-rate EWMA
+MIRROR_EWMA_ALPHA = 0.3
+
 # Tags to remove completely
 UNWANTED_TAGS = [
     "script",
@@ -92,6 +102,32 @@ USEFUL_TAGS = {
     "a",
 }
 
+# Tags removed when they contain no text (after unwrapping)
+EMPTY_CHECK_TAGS = [
+    "p",
+    "li",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "a",
+    "b",
+    "strong",
+    "i",
+    "em",
+    "u",
+    "blockquote",
+    "pre",
+    "code",
+    "div",
+    "span",
+]
+
+# Attributes kept on useful tags
+KEEP_ATTRIBUTES = ["href", "src", "alt", "title"]
+
 # IDs/Classes indicating main content
 MAIN_CONTENT_IDS = [
     "main-content",
@@ -107,3 +143,11 @@ MAIN_CONTENT_CLASSES = [
     "post-content",
     "entry-content",
 ]
+
+# Lines dropped when converting cleaned HTML to text for the LLM (regex, full line)
+BOILERPLATE_PATTERNS = [
+    r"本站仅供阅览使用.*",
+    r"语言語言[：:].*",
+    r"(折叠|展开|目录|脚注)",
+    r"«.*»",
+]
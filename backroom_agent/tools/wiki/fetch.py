@@ -1,12 +1,27 @@
-import os
+import asyncio
+import importlib.util
 import random
+import threading
 import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests
+import httpx
 
-from backroom_agent.tools.wiki.constants import REQUEST_HEADERS
-from backroom_agent.utils.common import get_project_root
+from backroom_agent.constants import WIKI_HEDGE_DELAY, WIKI_HOST_CONCURRENCY
+from backroom_agent.tools.wiki.constants import (FETCH_BACKOFF_BASE,
+                                                 FETCH_BACKOFF_CAP,
+                                                 FETCH_TIMEOUT,
+                                                 REQUEST_HEADERS,
+                                                 RETRYABLE_STATUS_CODES)
+from backroom_agent.tools.wiki.mirror_health import MirrorHealth, mirror_health
+from backroom_agent.utils.rate_limit import (DomainRateLimiter,
+                                             wiki_rate_limiter)
+
+# HTTP/2 与 brotli 为可选依赖 (pip install "httpx[http2,brotli]")
+# httpx 会根据已安装的解码器自动设置 Accept-Encoding (gzip/deflate/br)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 def get_level_name_from_url(url: str) -> str:
@@ -15,28 +30,304 @@ def get_level_name_from_url(url: str) -> str:
     return path.strip("/").split("/")[-1]
 
 
-def fetch_url_content(url: str, retries: int = 4) -> str | None:
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Jittered exponential backoff; honours a numeric Retry-After header."""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), FETCH_BACKOFF_CAP)
+    delay = min(FETCH_BACKOFF_CAP, FETCH_BACKOFF_BASE * (2**attempt))
+    return delay * random.uniform(0.5, 1.5)
+
+
+@dataclass
+class FetchResponse:
+    """Result of a (conditional) fetch: status 200 with text, or 304 Not Modified."""
+
+    status: int
+    text: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+# (url, etag, last_modified): one mirror's candidate for a hedged fetch
+MirrorRequest = Tuple[str, Optional[str], Optional[str]]
+
+
+class AsyncWikiFetcher:
     """
-    Fetches raw content from a URL with retries and browser headers.
+    异步 wiki 抓取器。
+
+    - 每个镜像 host 一个共享的 keep-alive AsyncClient (可用时启用 HTTP/2)
+    - 每个 host 独立的并发上限，以及按 host 的请求间隔限速
+    - 重试使用带抖动的指数退避 (asyncio.sleep)，不会阻塞其它抓取
+    - 每次请求的延迟与成败记入镜像健康度；fetch_first 对多个镜像抢跑 (hedged request)
+
+    客户端与信号量绑定在创建它们的事件循环上；同步代码请使用
+    fetch_url_content，它会把请求提交到后台事件循环线程执行。
     """
-    try:
+
+    def __init__(
+        self,
+        per_host_concurrency: int = WIKI_HOST_CONCURRENCY,
+        timeout: float = FETCH_TIMEOUT,
+        rate_limiter: Optional[DomainRateLimiter] = wiki_rate_limiter,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        health: Optional[MirrorHealth] = mirror_health,
+    ):
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.health = health
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # HTTP/2 禁止 Connection 等逐跳头，由 httpx 自行管理连接复用
+        self._headers = {
+            k: v for k, v in REQUEST_HEADERS.items() if k.lower() != "connection"
+        }
+
+    def _client_for(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers=self._headers,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE and self._transport is None,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.per_host_concurrency,
+                    max_keepalive_connections=self.per_host_concurrency,
+                ),
+                transport=self._transport,
+            )
+            self._clients[host] = client
+        return client
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_concurrency)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch_response(
+        self,
+        url: str,
+        retries: int = 4,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> FetchResponse | None:
+        """
+        Fetches a URL, optionally as a conditional request (If-None-Match /
+        If-Modified-Since). Returns a FetchResponse for 200 and 304, None on
+        404 or when every attempt failed.
+        """
+        host = urlparse(url).netloc
+        client = self._client_for(host)
+
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
         for attempt in range(retries):
-            try:
-                response = requests.get(url, headers=REQUEST_HEADERS, timeout=30)
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code == 404:
-                    print(f"URL not found: {url}")
-                    return None
-            except requests.RequestException as e:
-                print(f"Attempt {attempt+1} failed for {url}: {e}")
-                if attempt == retries - 1:
+            retry_after = None
+            async with self._semaphore_for(host):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire(url)
+                started = time.monotonic()
+                try:
+                    response = await client.get(url, headers=headers)
+                    if self.health:
+                        # 404 is a healthy answer from the mirror
+                        self.health.record(
+                            host,
+                            time.monotonic() - started,
+                            ok=response.status_code in (200, 304, 404),
+                        )
+                    if response.status_code in (200, 304):
+                        return FetchResponse(
+                            status=response.status_code,
+                            text=response.text if response.status_code == 200 else None,
+                            etag=response.headers.get("ETag") or etag,
+                            last_modified=response.headers.get("Last-Modified")
+                            or last_modified,
+                        )
+                    if response.status_code == 404:
+                        print(f"URL not found: {url}")
+                        return None
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        print(f"Unexpected status {response.status_code} for {url}")
+                        return None
+                    retry_after = response.headers.get("Retry-After")
+                    print(
+                        f"Attempt {attempt+1} for {url} got status {response.status_code}"
+                    )
+                except httpx.HTTPError as e:
+                    if self.health:
+                        self.health.record(host, time.monotonic() - started, ok=False)
+                    print(f"Attempt {attempt+1} failed for {url}: {e}")
+                except asyncio.CancelledError:
+                    # Lost a hedged race: still at least this slow
+                    if self.health:
+                        self.health.record(host, time.monotonic() - started, ok=True)
                     raise
 
-                wait_time = (2**attempt) + random.uniform(0.5, 1.5)
-                time.sleep(wait_time)
+            if attempt < retries - 1:
+                # 退避在信号量之外进行，其它请求可以继续使用该 host
+                await asyncio.sleep(_backoff_delay(attempt, retry_after))
 
+        print(f"Error fetching URL: giving up on {url} after {retries} attempts")
         return None
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {str(e)}")
-        return None
+
+    async def fetch_first(
+        self,
+        requests: List[MirrorRequest],
+        hedge_delay: float = WIKI_HEDGE_DELAY,
+        retries: int = 4,
+    ) -> Tuple[Optional[str], Optional[FetchResponse]]:
+        """
+        Hedged fetch of one page from several mirrors. The healthiest mirror is
+        requested first; the next one starts after hedge_delay seconds (or as
+        soon as a running request fails). The first 200/304 wins and the other
+        requests are cancelled. Returns (winning_url, response) or (None, None).
+        """
+        if self.health:
+            ranked = self.health.order([url for url, _, _ in requests])
+            requests = sorted(requests, key=lambda r: ranked.index(r[0]))
+        waiting = list(requests)
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch():
+            url, etag, last_modified = waiting.pop(0)
+            task = asyncio.create_task(
+                self.fetch_response(
+                    url, retries=retries, etag=etag, last_modified=last_modified
+                )
+            )
+            running[task] = url
+
+        launch()
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=hedge_delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                launch_next = not done  # hedge delay elapsed
+                for task in done:
+                    url = running.pop(task)
+                    response = None if task.exception() else task.result()
+                    if response is not None:
+                        return url, response
+                    launch_next = True  # this mirror failed
+                if waiting and launch_next:
+                    launch()
+            return None, None
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def fetch(self, url: str, retries: int = 4) -> str | None:
+        """
+        Fetches raw content from a URL. Returns None on 404 or when every
+        attempt failed.
+        """
+        response = await self.fetch_response(url, retries=retries)
+        return response.text if response else None
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# --- Shared fetcher on a background event loop ---
+# 所有线程 (同步节点、批量导入的工作线程) 共享同一组连接池
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_fetcher: Optional[AsyncWikiFetcher] = None
+_loop_lock = threading.Lock()
+
+
+def _get_fetcher_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _fetcher
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="wiki-fetcher", daemon=True
+            ).start()
+            _loop = loop
+            _fetcher = AsyncWikiFetcher()
+        return _loop
+
+
+def _get_shared_fetcher() -> AsyncWikiFetcher:
+    assert _fetcher is not None
+    return _fetcher
+
+
+def _run_on_fetcher_loop(coro_factory):
+    """Submits a coroutine (built on the fetcher loop's fetcher) and returns a Future."""
+    loop = _get_fetcher_loop()
+
+    async def runner():
+        return await coro_factory(_get_shared_fetcher())
+
+    return asyncio.run_coroutine_threadsafe(runner(), loop)
+
+
+async def fetch_url_content_async(url: str, retries: int = 4) -> str | None:
+    """
+    Async variant of fetch_url_content, usable from any event loop.
+    The request runs on the shared fetcher loop so connections are reused.
+    """
+    future = _run_on_fetcher_loop(lambda f: f.fetch(url, retries=retries))
+    return await asyncio.wrap_future(future)
+
+
+def fetch_url_content(url: str, retries: int = 4) -> str | None:
+    """
+    Fetches raw content from a URL with retries and browser headers.
+    Blocks only the calling thread; concurrent callers share keep-alive
+    connections and per-host limits.
+    """
+    return _run_on_fetcher_loop(lambda f: f.fetch(url, retries=retries)).result()
+
+
+def fetch_url_conditional(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    retries: int = 4,
+) -> FetchResponse | None:
+    """
+    Conditional GET on the shared fetcher: sends the stored validators and
+    returns a 304 FetchResponse when the page has not changed.
+    """
+    future = _run_on_fetcher_loop(
+        lambda f: f.fetch_response(
+            url, retries=retries, etag=etag, last_modified=last_modified
+        )
+    )
+    return future.result()
+
+
+def fetch_url_hedged(
+    requests: List[MirrorRequest], hedge_delay: float = WIKI_HEDGE_DELAY
+) -> Tuple[Optional[str], Optional[FetchResponse]]:
+    """
+    Races the same page across mirrors on the shared fetcher (see
+    AsyncWikiFetcher.fetch_first). Returns (winning_url, response).
+    """
+    future = _run_on_fetcher_loop(
+        lambda f: f.fetch_first(requests, hedge_delay=hedge_delay)
+    )
+    return future.result()
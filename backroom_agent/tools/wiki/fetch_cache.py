@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backroom_agent.utils.common import get_project_root
+
+
+def content_hash(text: str) -> str:
+    """sha256 of page content, used to detect unchanged pages."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FetchCache:
+    """
+    抓取缓存：按 URL 记录 HTTP 校验信息 (ETag / Last-Modified) 与原始内容哈希。
+
+    fetch_wiki_content 用它发送条件请求 (If-None-Match / If-Modified-Since)，
+    收到 304 时直接复用 data/raw 中的缓存，并把页面标记为未变化，
+    下游的 JSON 生成与 LLM 抽取据此跳过。
+
+    以 JSON 文件持久化 (原子写入)，线程安全。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def update(
+        self,
+        url: str,
+        content_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        level_name: Optional[str] = None,
+    ):
+        with self._lock:
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "level_name": level_name,
+                "checked_at": int(time.time()),
+            }
+            self._save()
+
+    def invalidate(self, url: str):
+        with self._lock:
+            if self._entries.pop(url, None) is not None:
+                self._save()
+
+
+_fetch_cache: Optional[FetchCache] = None
+_fetch_cache_lock = threading.Lock()
+
+
+def get_fetch_cache() -> FetchCache:
+    """Returns the process-wide fetch cache stored at data/raw/.fetch_cache.json."""
+    global _fetch_cache
+    with _fetch_cache_lock:
+        if _fetch_cache is None:
+            _fetch_cache = FetchCache(
+                os.path.join(get_project_root(), "data/raw", ".fetch_cache.json")
+            )
+        return _fetch_cache
@@ -0,0 +1,98 @@
+"""
+多模式名称匹配 (Aho-Corasick)。
+
+对一组候选名称（及别名）构建一个自动机，在去标签、归一化空白后的页面文本上
+单次扫描，返回每个名称的全部出现位置（用于溯源）。
+"""
+
+import html
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Block-level tags become a space so adjacent blocks do not run together;
+# inline tags are removed so "杏<b>仁</b>水" still reads "杏仁水".
+_BLOCK_TAG_RE = re.compile(
+    r"</?(?:p|div|br|hr|li|ul|ol|tr|td|th|table|h[1-6]|blockquote|section)\b[^>]*>",
+    re.IGNORECASE,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+Span = Tuple[int, int]
+
+
+def normalize_for_match(text: str) -> str:
+    """NFKC, case-folded, whitespace runs collapsed to one space."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def html_to_match_text(html_content: str) -> str:
+    """Tag-stripped, entity-decoded and normalised page text."""
+    text = _BLOCK_TAG_RE.sub(" ", html_content)
+    text = _TAG_RE.sub("", text)
+    return normalize_for_match(html.unescape(text))
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    Patterns are matched as given; normalise them (and the text) with
+    normalize_for_match first for case/width/whitespace-insensitive matching.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for pattern in set(patterns):
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                # Patterns ending at the fallback state also end here
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yields (start, end, pattern) for every occurrence, overlapping included."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._out[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+    def find_all(self, text: str) -> Dict[str, List[Span]]:
+        """Maps each pattern found in text to its (start, end) spans."""
+        found: Dict[str, List[Span]] = {}
+        for start, end, pattern in self.iter_matches(text):
+            found.setdefault(pattern, []).append((start, end))
+        return found
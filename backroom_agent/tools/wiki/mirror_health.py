@@ -0,0 +1,71 @@
+import threading
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from backroom_agent.tools.wiki.constants import (FETCH_TIMEOUT,
+                                                 MIRROR_EWMA_ALPHA)
+
+
+class MirrorHealth:
+    """
+    镜像健康度：按 host 记录请求延迟与错误率的指数滑动平均 (EWMA)。
+
+    评分 = 平均延迟 + 错误率 * FETCH_TIMEOUT（一次失败约等于一次超时），越低越好。
+    抢跑抓取 (AsyncWikiFetcher.fetch_first) 按评分排序镜像，所以一个批次中
+    变慢或失效的镜像会自动让位；尚无样本的镜像按中性先验评分 FETCH_TIMEOUT / 2
+    参与排序，因此能排在已知很差的镜像之前并获得采样机会。
+
+    线程安全，整个进程共享一个实例 (mirror_health)。
+    """
+
+    def __init__(self, alpha: float = MIRROR_EWMA_ALPHA):
+        self.alpha = alpha
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, latency: float, ok: bool):
+        """Adds one request sample (latency in seconds, ok=False for errors)."""
+        error = 0.0 if ok else 1.0
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                self._stats[host] = {
+                    "latency": latency,
+                    "error_rate": error,
+                    "samples": 1,
+                }
+                return
+            a = self.alpha
+            stats["latency"] = a * latency + (1 - a) * stats["latency"]
+            stats["error_rate"] = a * error + (1 - a) * stats["error_rate"]
+            stats["samples"] += 1
+
+    def score(self, host: str) -> float | None:
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                return None
+            return stats["latency"] + stats["error_rate"] * FETCH_TIMEOUT
+
+    def order(self, urls: List[str]) -> List[str]:
+        """
+        URLs sorted by their host's score (ties keep the configured order).
+        Unmeasured hosts get a neutral prior of FETCH_TIMEOUT / 2, so they are
+        still tried ahead of mirrors known to be bad.
+        """
+        prior = FETCH_TIMEOUT / 2
+
+        def key(indexed):
+            index, url = indexed
+            score = self.score(urlparse(url).netloc)
+            return (prior if score is None else score, index)
+
+        return [url for _, url in sorted(enumerate(urls), key=key)]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._stats.items()}
+
+
+# Global instance shared by every wiki fetch in the process
+mirror_health = MirrorHealth()
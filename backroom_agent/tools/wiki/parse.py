@@ -4,11 +4,18 @@ from typing import Dict, List, Tuple, cast
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString
 
-from backroom_agent.tools.wiki.constants import (GARBAGE_CLASSES,
+from backroom_agent.tools.wiki.constants import (EMPTY_CHECK_TAGS,
+                                                 GARBAGE_CLASSES,
+                                                 KEEP_ATTRIBUTES,
                                                  MAIN_CONTENT_CLASSES,
                                                  MAIN_CONTENT_IDS,
                                                  UNWANTED_TAGS, USEFUL_TAGS)
 
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional fast path
+    etree = None  # type: ignore[assignment]
+
 
 def _get_attr_str(tag: Tag, attr: str) -> str:
     """Helper to safely get an attribute as a string."""
@@ -20,9 +27,37 @@ def _get_attr_str(tag: Tag, attr: str) -> str:
 
 def clean_html_content(raw_html: str) -> Tuple[str, List[Dict[str, str]]]:
     """
-    Cleans raw HTML using BeautifulSoup, applying filters defined in constants.
+    Cleans raw HTML, applying filters defined in constants.
     Also extracts all meaningful links.
     Returns: (cleaned_html_string, list_of_links)
+
+    Uses the lxml fast path when available; its output is identical to the
+    BeautifulSoup reference implementation (see tests/test_wiki_parse.py).
+    """
+    if etree is not None:
+        result = _clean_html_content_lxml(raw_html)
+        if result is not None:
+            return result
+    return _clean_html_content_bs4(raw_html)
+
+
+def clean_page_content(raw_html: str) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    clean_html_content plus line normalization (strip lines, drop blank ones):
+    the form stored in data/level/{level}.html.
+    """
+    cleaned_content, extracted_links = clean_html_content(raw_html)
+    cleaned_content = "\n".join(
+        [line.strip() for line in cleaned_content.splitlines() if line.strip()]
+    )
+    return cleaned_content, extracted_links
+
+
+def _clean_html_content_bs4(raw_html: str) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Reference implementation on BeautifulSoup (html.parser).
+    Used as fallback when lxml is unavailable or the fast path cannot
+    guarantee identical output.
     """
     soup = BeautifulSoup(raw_html, "html.parser")
 
@@ -82,28 +117,7 @@ def clean_html_content(raw_html: str) -> Tuple[str, List[Dict[str, str]]]:
 
     # 5. Remove empty tags
     # Expand list to include formatting and anchors
-    tags_to_check = [
-        "p",
-        "li",
-        "h1",
-        "h2",
-        "h3",
-        "h4",
-        "h5",
-        "h6",
-        "a",
-        "b",
-        "strong",
-        "i",
-        "em",
-        "u",
-        "blockquote",
-        "pre",
-        "code",
-        "div",
-        "span",
-    ]
-    for tag in target.find_all(tags_to_check):
+    for tag in target.find_all(EMPTY_CHECK_TAGS):
         if not tag.get_text(strip=True):
             tag.decompose()
 
@@ -149,7 +163,7 @@ def _clean_attributes(tag: Tag):
     """Removes unwanted attributes from a tag, keeping only href/src/alt/title."""
     attrs = dict(tag.attrs)
     for attr in attrs:
-        if attr not in ["href", "src", "alt", "title"]:
+        if attr not in KEEP_ATTRIBUTES:
             del tag[attr]
 
     # Additional check for javascript hrefs
@@ -163,3 +177,283 @@ def _clean_attributes(tag: Tag):
 
             if href.startswith("javascript:") or href == "#":
                 tag.unwrap()
+
+
+# --- lxml fast path ---
+# 一次遍历完成垃圾节点标记与正文定位，再一次遍历完成链接抽取、解包、
+# 属性清理、空标签删除与空白归一化，最后按 BeautifulSoup 的规则序列化。
+# 需要逐字节复现 bs4 (html.parser) 的细节：
+# - 纯空白字符串在解析时折叠为 "\n" 或 " " (pre/textarea 内除外)
+# - 删除/解包节点不会合并相邻字符串，空白归一化按原字符串分别进行
+# - 注释也参与空白归一化，变短时会变成普通文本
+
+_GARBAGE_RE = re.compile("|".join(re.escape(g) for g in GARBAGE_CLASSES))
+_WHITESPACE_RE = re.compile(r"\s+")
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_UNWANTED_SET = frozenset(UNWANTED_TAGS)
+_EMPTY_CHECK_SET = frozenset(EMPTY_CHECK_TAGS)
+_KEEP_ATTRIBUTES_SET = frozenset(KEEP_ATTRIBUTES)
+_PRESERVE_WHITESPACE_TAGS = frozenset(["pre", "textarea"])
+_NO_NORMALIZE_TAGS = frozenset(["pre", "code"])
+# bs4 treats these attributes as whitespace-separated lists
+_LIST_ATTRIBUTES = frozenset(["class", "accesskey", "dropzone"])
+# Void elements as serialized by bs4 ("<br/>")
+_VOID_TAGS = frozenset(
+    [
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    ]
+)
+
+if etree is not None:
+    _LXML_PARSER = etree.HTMLParser(
+        encoding="utf-8", remove_comments=False, no_network=True, recover=True
+    )
+
+
+class _Comment(str):
+    """Comment text that survived whitespace normalization."""
+
+
+class _Node:
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag: str, attrs: List[Tuple[str, str]], children: List):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = children
+
+
+def _is_garbage_element(el) -> bool:
+    style = el.get("style")
+    if style and "display:none" in style.lower().replace(" ", ""):
+        return True
+    classes = el.get("class")
+    if classes and _GARBAGE_RE.search(" ".join(classes.split()).lower()):
+        return True
+    id_ = el.get("id")
+    return bool(id_ and _GARBAGE_RE.search(id_.lower()))
+
+
+def _find_main_content_lxml(root):
+    """
+    Single traversal: marks unwanted/garbage elements (with their subtrees)
+    and locates the main content element among the remaining ones.
+    Returns (target or None, dropped elements).
+    """
+    dropped = set()
+    first_by_id: Dict[str, object] = {}
+    first_by_class: Dict[str, object] = {}
+
+    for el in root.iter():
+        parent = el.getparent()
+        if parent is not None and parent in dropped:
+            dropped.add(el)
+            continue
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+        if tag in _UNWANTED_SET or _is_garbage_element(el):
+            dropped.add(el)
+            continue
+
+        id_ = el.get("id")
+        if id_ is not None:
+            first_by_id.setdefault(id_, el)
+        classes = el.get("class")
+        if classes is not None:
+            tokens = classes.split()
+            for name in tokens + [" ".join(tokens)]:
+                first_by_class.setdefault(name, el)
+
+    for pid in MAIN_CONTENT_IDS:
+        if pid in first_by_id:
+            return first_by_id[pid], dropped
+    for pcls in MAIN_CONTENT_CLASSES:
+        if pcls in first_by_class:
+            return first_by_class[pcls], dropped
+    return None, dropped
+
+
+def _parsed_text(text: str, preserve: bool) -> str:
+    """bs4 collapses ASCII-whitespace-only strings to a newline or a space."""
+    if not preserve and not text.strip(_ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _normalized_text(text: str, parent_tag: str) -> str:
+    if parent_tag in _NO_NORMALIZE_TAGS:
+        return text
+    new_text = _WHITESPACE_RE.sub(" ", text)
+    return new_text if len(new_text) < len(text) else text
+
+
+def _link_text(el, dropped) -> str:
+    """Equivalent of bs4 get_text(strip=True) on the cleaned subtree."""
+    parts: List[str] = []
+
+    def collect(node):
+        if node.text:
+            stripped = node.text.strip()
+            if stripped:
+                parts.append(stripped)
+        for child in node:
+            if child not in dropped and isinstance(child.tag, str):
+                collect(child)
+            if child.tail:
+                stripped = child.tail.strip()
+                if stripped:
+                    parts.append(stripped)
+
+    collect(el)
+    return "".join(parts)
+
+
+def _convert_children(el, parent_tag, dropped, links, preserve) -> Tuple[List, bool]:
+    """
+    Converts the children of `el` into cleaned nodes.
+    parent_tag is the nearest kept ancestor (unwrapped tags pass it through).
+    Returns (nodes, has_text).
+    """
+    nodes: List = []
+    has_text = False
+    preserve = preserve or el.tag in _PRESERVE_WHITESPACE_TAGS
+
+    if el.text:
+        text = _parsed_text(el.text, preserve)
+        nodes.append(_normalized_text(text, parent_tag))
+        has_text = has_text or bool(text.strip())
+
+    for child in el:
+        tag = child.tag
+        if child in dropped:
+            pass
+        elif tag is etree.Comment:
+            text = _parsed_text(child.text or "", preserve)
+            normalized = _normalized_text(text, parent_tag)
+            nodes.append(normalized if normalized is not text else _Comment(text))
+        elif isinstance(tag, str):
+            child_nodes, child_has_text = _convert_element(
+                child, parent_tag, dropped, links, preserve
+            )
+            nodes.extend(child_nodes)
+            has_text = has_text or child_has_text
+
+        if child.tail:
+            text = _parsed_text(child.tail, preserve)
+            nodes.append(_normalized_text(text, parent_tag))
+            has_text = has_text or bool(text.strip())
+
+    return nodes, has_text
+
+
+def _convert_element(el, parent_tag, dropped, links, preserve) -> Tuple[List, bool]:
+    tag = el.tag
+    href = el.get("href") if tag == "a" else None
+
+    if href is not None:
+        href = href.strip()
+        if href and not href.startswith("#") and not href.startswith("javascript:"):
+            links.append({"text": _link_text(el, dropped) or href, "url": href})
+
+    unwrap = tag not in USEFUL_TAGS
+    if not unwrap and tag == "a" and href:
+        lowered = href.lower()
+        unwrap = lowered.startswith("javascript:") or lowered == "#"
+
+    if unwrap:
+        return _convert_children(el, parent_tag, dropped, links, preserve)
+
+    children, has_text = _convert_children(el, tag, dropped, links, preserve)
+    if tag in _EMPTY_CHECK_SET and not has_text:
+        return [], False
+
+    attrs = [(k, v) for k, v in el.attrib.items() if k in _KEEP_ATTRIBUTES_SET]
+    return [_Node(tag, attrs, children)], has_text
+
+
+def _escape_text(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _quote_attr(value: str) -> str:
+    value = _escape_text(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', "&quot;") + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _serialize(node, out: List[str]):
+    if isinstance(node, _Comment):
+        out.append(f"<!--{node}-->")
+    elif isinstance(node, str):
+        out.append(_escape_text(node))
+    else:
+        out.append("<" + node.tag)
+        # bs4's default formatter sorts attributes
+        for key, value in sorted(node.attrs):
+            out.append(f" {key}={_quote_attr(value)}")
+        if node.tag in _VOID_TAGS and not node.children:
+            out.append("/>")
+            return
+        out.append(">")
+        for child in node.children:
+            _serialize(child, out)
+        out.append(f"</{node.tag}>")
+
+
+def _clean_html_content_lxml(raw_html: str):
+    """
+    lxml implementation of clean_html_content.
+    Returns None when the page has no recognizable main content (or cannot be
+    parsed), in which case the caller falls back to the bs4 implementation.
+    """
+    try:
+        root = etree.fromstring(raw_html.encode("utf-8"), _LXML_PARSER)
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return None
+    if root is None:
+        return None
+
+    target, dropped = _find_main_content_lxml(root)
+    if target is None:
+        return None
+
+    links: List[Dict[str, str]] = []
+    preserve = any(
+        ancestor.tag in _PRESERVE_WHITESPACE_TAGS for ancestor in target.iterancestors()
+    )
+    children, _ = _convert_children(target, target.tag, dropped, links, preserve)
+
+    attrs = [
+        (k, " ".join(v.split()) if k in _LIST_ATTRIBUTES else v)
+        for k, v in target.attrib.items()
+    ]
+    out: List[str] = []
+    _serialize(_Node(target.tag, attrs, children), out)
+    return "".join(out).strip(), links
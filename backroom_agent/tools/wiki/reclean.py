@@ -0,0 +1,134 @@
+"""
+原始页面批量重新清洗。
+
+清洗规则 (parse.py / constants.py) 修改后，无需重新抓取：
+用进程池并行地把 data/raw/*.html 重新清洗为 data/level/*.html。
+输出与现有文件相同时不写入；写入为原子操作 (临时文件 + os.replace)。
+"""
+
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from backroom_agent.tools.wiki.parse import clean_page_content
+
+STATUS_CREATED = "created"
+STATUS_UPDATED = "updated"
+STATUS_UNCHANGED = "unchanged"
+STATUS_FAILED = "failed"
+
+
+def _read_text(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def write_text_if_changed(path: str, content: str) -> bool:
+    """
+    Atomically writes `content` to `path` unless the file already holds it.
+    Returns True if the file was written.
+    """
+    if _read_text(path) == content:
+        return False
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def reclean_page(raw_path: str, level_dir: str, dry_run: bool = False) -> Dict:
+    """
+    Re-cleans one raw page into level_dir/{level}.html (process pool worker).
+    Returns {"level", "status", "raw_bytes", "error"}.
+    """
+    level_name = os.path.splitext(os.path.basename(raw_path))[0]
+    result: Dict[str, Any] = {
+        "level": level_name,
+        "status": STATUS_FAILED,
+        "raw_bytes": 0,
+        "error": None,
+    }
+    try:
+        with open(raw_path, "r", encoding="utf-8") as f:
+            raw_content = f.read()
+        result["raw_bytes"] = len(raw_content.encode("utf-8"))
+
+        cleaned_content, _ = clean_page_content(raw_content)
+        clean_path = os.path.join(level_dir, f"{level_name}.html")
+        existing = _read_text(clean_path)
+
+        if existing == cleaned_content:
+            result["status"] = STATUS_UNCHANGED
+            return result
+        if not dry_run:
+            write_text_if_changed(clean_path, cleaned_content)
+        result["status"] = STATUS_CREATED if existing is None else STATUS_UPDATED
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def reclean_raw_pages(
+    raw_dir: str,
+    level_dir: str,
+    workers: Optional[int] = None,
+    levels: Optional[List[str]] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Re-cleans every raw page (or only `levels`) in a process pool.
+
+    Returns a summary: per-page results, counts per status, elapsed seconds
+    and throughput (pages/s, raw MB/s).
+    """
+    raw_paths = sorted(glob.glob(os.path.join(raw_dir, "*.html")))
+    if levels:
+        wanted = set(levels)
+        raw_paths = [
+            p for p in raw_paths if os.path.splitext(os.path.basename(p))[0] in wanted
+        ]
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1 or len(raw_paths) <= 1:
+        results = [reclean_page(p, level_dir, dry_run) for p in raw_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    reclean_page,
+                    raw_paths,
+                    [level_dir] * len(raw_paths),
+                    [dry_run] * len(raw_paths),
+                    chunksize=max(1, len(raw_paths) // (workers * 4)),
+                )
+            )
+    elapsed = time.perf_counter() - start
+
+    counts = {
+        status: sum(1 for r in results if r["status"] == status)
+        for status in (STATUS_CREATED, STATUS_UPDATED, STATUS_UNCHANGED, STATUS_FAILED)
+    }
+    raw_mb = sum(r["raw_bytes"] for r in results) / (1024 * 1024)
+    return {
+        "results": results,
+        "counts": counts,
+        "workers": workers,
+        "elapsed": elapsed,
+        "pages_per_sec": len(results) / elapsed if elapsed > 0 else 0.0,
+        "mb_per_sec": raw_mb / elapsed if elapsed > 0 else 0.0,
+    }
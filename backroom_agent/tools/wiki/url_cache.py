@@ -0,0 +1,184 @@
+import glob
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from backroom_agent.constants import URL_CACHE_NEGATIVE_TTL, URL_CACHE_TTL
+from backroom_agent.utils.common import get_project_root
+
+from .parse import clean_html_content
+
+# Wikidot pages are single-segment slugs; "system:..." etc. are not levels
+_SLUG_RE = re.compile(r"^/[a-z0-9][a-z0-9-]*$")
+
+
+def normalize_level_key(name: str) -> str:
+    """Cache key for a level name or slug ("Level 0" -> "level-0")."""
+    return name.strip().lower().replace(" ", "-")
+
+
+class UrlResolutionCache:
+    """
+    层级名 -> URL 的解析缓存。
+
+    _resolve_missing_url 在非数字层级名上会做一次 DuckDuckGo 搜索；结果（包括
+    "没找到"）记录在这里，命中 URL_CACHE_TTL 内的记录时不再搜索，未命中的记录
+    保留 URL_CACHE_NEGATIVE_TTL。已抓取页面的内部链接 (extracted_links) 也会
+    写入缓存，使大部分解析无需联网。
+
+    以 JSON 文件持久化 (原子写入)，线程安全。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _is_fresh(entry: Dict[str, Any], now: float) -> bool:
+        ttl = URL_CACHE_TTL if entry.get("url") else URL_CACHE_NEGATIVE_TTL
+        return now - entry.get("resolved_at", 0) < ttl
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the fresh entry for name, or None if unknown or expired.
+        A fresh entry with url None is a cached miss (skip the search).
+        """
+        with self._lock:
+            entry = self._entries.get(normalize_level_key(name))
+            if entry is None or not self._is_fresh(entry, time.time()):
+                return None
+            return dict(entry)
+
+    def store(self, name: str, url: Optional[str], source: str):
+        """Records a resolution result; url None caches a miss."""
+        with self._lock:
+            self._entries[normalize_level_key(name)] = {
+                "url": url,
+                "source": source,
+                "resolved_at": int(time.time()),
+            }
+            self._save()
+
+    def learn_links(
+        self,
+        links: Iterable[Dict[str, str]],
+        base_url: str,
+        allowed_domains: List[str],
+    ) -> int:
+        """
+        Learns slug -> URL (and link text -> URL) from a page's extracted links.
+
+        Only same-wiki single-segment pages are used. Slugs always take the
+        linked URL; link texts never replace an existing positive entry, since
+        the same text can point at different pages. Returns new/updated keys.
+        """
+        now = time.time()
+        learned = 0
+        with self._lock:
+            for link in links:
+                url = urljoin(base_url, link.get("url", ""))
+                parsed = urlparse(url)
+                if parsed.netloc not in allowed_domains or not _SLUG_RE.match(
+                    parsed.path
+                ):
+                    continue
+                url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                entry = {"url": url, "source": "links", "resolved_at": int(now)}
+
+                slug = parsed.path.lstrip("/")
+                current = self._entries.get(slug)
+                if not current or current.get("url") != url:
+                    self._entries[slug] = entry
+                    learned += 1
+
+                text = normalize_level_key(link.get("text", ""))
+                if len(text) < 2 or text.isdigit() or text == slug:
+                    continue
+                current = self._entries.get(text)
+                if not current or not (
+                    current.get("url") and self._is_fresh(current, now)
+                ):
+                    self._entries[text] = entry
+                    learned += 1
+            if learned:
+                self._save()
+        return learned
+
+    def learn_from_level_pages(
+        self, level_dir: str, base_url: str, allowed_domains: List[str]
+    ) -> int:
+        """
+        Bulk resolver: learns from every fetched level in level_dir, using the
+        `links` of its JSON or, if missing, the links of the cleaned HTML page.
+        """
+        learned = 0
+        for html_path in sorted(glob.glob(os.path.join(level_dir, "*.html"))):
+            level = os.path.splitext(os.path.basename(html_path))[0]
+            links = read_page_links(level_dir, level)
+            learned += self.learn_links(links, base_url, allowed_domains)
+        return learned
+
+
+def read_page_links(level_dir: str, level: str) -> List[Dict[str, str]]:
+    """
+    Links of a fetched level: the `links` of data/level/{level}.json or, if
+    missing (older JSON), those of the cleaned page. [] if neither is readable.
+    """
+    json_path = os.path.join(level_dir, f"{level}.json")
+    html_path = os.path.join(level_dir, f"{level}.html")
+    try:
+        if os.path.exists(json_path):
+            with open(json_path, "r", encoding="utf-8") as f:
+                links = json.load(f).get("links") or []
+            if links:
+                return links
+        if os.path.exists(html_path):
+            with open(html_path, "r", encoding="utf-8") as f:
+                return clean_html_content(f.read())[1]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return []
+
+
+_url_cache: Optional[UrlResolutionCache] = None
+_url_cache_lock = threading.Lock()
+
+
+def get_url_cache() -> UrlResolutionCache:
+    """Returns the process-wide cache stored at data/raw/.url_cache.json."""
+    global _url_cache
+    with _url_cache_lock:
+        if _url_cache is None:
+            _url_cache = UrlResolutionCache(
+                os.path.join(get_project_root(), "data/raw", ".url_cache.json")
+            )
+        return _url_cache
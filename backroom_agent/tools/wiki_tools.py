@@ -1,13 +1,18 @@
 import os
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, cast
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langsmith import traceable
 
-# Import from new refactored modules
-from backroom_agent.tools.wiki.fetch import (fetch_url_content,
+from backroom_agent.constants import LEVEL_EXTRACT_TOKEN_BUDGET
+from backroom_agent.tools.wiki.compress import fit_to_budget, html_to_text
+from backroom_agent.tools.wiki.fetch import (fetch_url_conditional,
+                                             fetch_url_hedged,
                                              get_level_name_from_url)
-from backroom_agent.tools.wiki.parse import clean_html_content
+from backroom_agent.tools.wiki.fetch_cache import content_hash, get_fetch_cache
+from backroom_agent.tools.wiki.parse import clean_page_content
+from backroom_agent.tools.wiki.reclean import write_text_if_changed
 from backroom_agent.utils.common import (get_llm, get_project_root,
                                          load_prompt, save_to_file)
 
@@ -33,10 +38,11 @@ def convert_html_to_room_json(html_content: str, level_name: str) -> str:
     )
     system_prompt_text = load_prompt(prompt_path)
 
+    context = fit_to_budget(html_to_text(html_content), LEVEL_EXTRACT_TOKEN_BUDGET)
     messages = [
         SystemMessage(content=system_prompt_text),
         HumanMessage(
-            content=f"Here is the cleaned HTML content of the level:\n\n{html_content}"
+            content=f"Here is the content of the level page (converted to Markdown):\n\n{context}"
         ),
     ]
 
@@ -59,46 +65,142 @@ def convert_html_to_room_json(html_content: str, level_name: str) -> str:
     return content
 
 
-@traceable(run_type="tool", name="Fetch Wiki Content")
-def fetch_wiki_content(
-    url: str, save_files: bool = True
-) -> tuple[str | None, str | None, List[Dict[str, str]]]:
+@dataclass
+class WikiPage:
+    """A fetched and cleaned wiki page."""
+
+    content: str | None
+    level_name: str | None
+    links: List[Dict[str, str]] = field(default_factory=list)
+    # True when the raw page is identical to the cached copy in data/raw
+    unchanged: bool = False
+    # URL that served the page (the winning mirror for hedged fetches)
+    url: str | None = None
+
+
+def _read_text(path: str) -> str | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@traceable(run_type="tool", name="Fetch Wiki Page")
+def fetch_wiki_page(
+    url: str,
+    save_files: bool = True,
+    conditional: bool = True,
+    alternatives: Optional[List[str]] = None,
+) -> WikiPage:
     """
-    Fetches the content of a URL and cleans it, keeping only useful tags.
-    Saves raw content to data/raw and cleaned content to data/level.
+    Fetches and cleans a wiki page, using the fetch cache for conditional
+    requests (If-None-Match / If-Modified-Since).
+
+    A 304 response reuses data/raw/{level}.html without downloading the page;
+    a 200 response whose content hash matches the cached raw file is reported
+    as unchanged too. Unchanged raw files are not rewritten.
 
     Args:
         url (str): The URL to fetch.
         save_files (bool): Whether to save the raw and cleaned content to files.
+        conditional (bool): Whether to send the stored validators.
+        alternatives (List[str]): The same page on other mirrors; if given, the
+            mirrors are raced (hedged fetch) and the first valid response wins.
 
     Returns:
-        tuple[str | None, str | None, List[Dict[str, str]]]:
-        (cleaned HTML content, Level Name, Extracted Links)
+        WikiPage: cleaned content, level name, extracted links, the unchanged
+        flag and the URL that served the page.
     """
-    raw_content = fetch_url_content(url)
-
-    if not raw_content:
-        return None, None, []
-
     level_name = get_level_name_from_url(url)
     root_dir = get_project_root()
+    raw_path = os.path.join(root_dir, "data/raw", f"{level_name}.html")
+    clean_path = os.path.join(root_dir, "data/level", f"{level_name}.html")
+
+    cache = get_fetch_cache()
+    cached_raw = _read_text(raw_path)
+    raw_hash = content_hash(cached_raw) if cached_raw is not None else None
+
+    def validators(candidate: str):
+        entry = cache.get(candidate) if conditional else None
+        # Validators are only usable if the raw file is still the one they describe
+        if entry and entry.get("content_hash") != raw_hash:
+            return None
+        return entry
+
+    candidates = [url] + [a for a in alternatives or [] if a != url]
+    if len(candidates) > 1:
+        requests = []
+        for candidate in candidates:
+            entry = validators(candidate)
+            requests.append(
+                (
+                    candidate,
+                    entry.get("etag") if entry else None,
+                    entry.get("last_modified") if entry else None,
+                )
+            )
+        winner, response = fetch_url_hedged(requests)
+        url = winner or url
+        entry = validators(url)
+    else:
+        entry = validators(url)
+        response = fetch_url_conditional(
+            url,
+            etag=entry.get("etag") if entry else None,
+            last_modified=entry.get("last_modified") if entry else None,
+        )
+    if response is not None and response.not_modified and entry is None:
+        # 304 without usable validators: fetch the full page instead
+        response = fetch_url_conditional(url)
+    if response is None:
+        return WikiPage(None, None, [])
+
+    if response.not_modified:
+        raw_content = cast(str, cached_raw)
+        unchanged = True
+    else:
+        raw_content = response.text or ""
+        if not raw_content:
+            return WikiPage(None, None, [])
+        unchanged = cached_raw is not None and content_hash(cached_raw) == content_hash(
+            raw_content
+        )
+        if save_files and not unchanged:
+            save_to_file(raw_content, os.path.dirname(raw_path), f"{level_name}.html")
 
     if save_files:
-        save_to_file(
-            raw_content, os.path.join(root_dir, "data/raw"), f"{level_name}.html"
+        cache.update(
+            url,
+            content_hash(raw_content),
+            etag=response.etag,
+            last_modified=response.last_modified,
+            level_name=level_name,
         )
 
-    # Now unpack the link list as well
-    cleaned_content, extracted_links = clean_html_content(raw_content)
-
-    # Post-process cleaning (normalize newlines)
-    cleaned_content = "\n".join(
-        [line.strip() for line in cleaned_content.splitlines() if line.strip()]
-    )
+    # Now unpack the link list as well (newlines normalized)
+    cleaned_content, extracted_links = clean_page_content(raw_content)
 
     if save_files:
-        save_to_file(
-            cleaned_content, os.path.join(root_dir, "data/level"), f"{level_name}.html"
-        )
+        write_text_if_changed(clean_path, cleaned_content)
+
+    return WikiPage(cleaned_content, level_name, extracted_links, unchanged, url)
+
 
-    return cleaned_content, level_name, extracted_links
+@traceable(run_type="tool", name="Fetch Wiki Content")
+def fetch_wiki_content(
+    url: str, save_files: bool = True
+) -> tuple[str | None, str | None, List[Dict[str, str]]]:
+    """
+    Fetches the content of a URL and cleans it, keeping only useful tags.
+    Saves raw content to data/raw and cleaned content to data/level.
+
+    Args:
+        url (str): The URL to fetch.
+        save_files (bool): Whether to save the raw and cleaned content to files.
+
+    Returns:
+        tuple[str | None, str | None, List[Dict[str, str]]]:
+        (cleaned HTML content, Level Name, Extracted Links)
+    """
+    page = fetch_wiki_page(url, save_files=save_files)
+    return page.content, page.level_name, page.links
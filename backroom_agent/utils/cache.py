@@ -1,6 +1,6 @@
 import hashlib
 import json
-from typing import Any, Callable, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, cast
 
 import redis
 
@@ -40,6 +40,16 @@ class RedisCache:
             cls._instance = cls()
         return cls._instance
 
+    @property
+    def available(self) -> bool:
+        """True when Redis is connected (values are actually stored)."""
+        return self._client is not None
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """The shared Redis connection (str responses), or None when Redis is down."""
+        return self._client
+
     def _generate_key(self, prefix: str, content: str) -> str:
         """Generates a cache key based on a prefix and the hash of the content."""
         content_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
@@ -60,7 +70,11 @@ class RedisCache:
             return value
 
     def get(
-        self, prefix: str, content: str, on_miss: Optional[Callable[[], Any]] = None
+        self,
+        prefix: str,
+        content: str,
+        on_miss: Optional[Callable[[], Any]] = None,
+        ttl: int = 86400,
     ) -> Optional[Any]:
         """
         Retrieves a value from the cache.
@@ -86,23 +100,50 @@ class RedisCache:
                 try:
                     # Default TTL 24 hours
                     serialized = self._serialize(result)
-                    self._client.setex(key, 86400, serialized)
+                    self._client.setex(key, ttl, serialized)
                 except redis.RedisError as e:
                     logger.warning(f"Redis set error: {e}")
             return result
 
         return None
 
-    def set(self, prefix: str, content: str, value: Any) -> None:
-        """Sets a value in the cache."""
+    def set(self, prefix: str, content: str, value: Any, ttl: int = 86400) -> None:
+        """Sets a value in the cache (default TTL 24 hours)."""
         key = self._generate_key(prefix, content)
         if self._client:
             try:
                 serialized = self._serialize(value)
-                self._client.setex(key, 86400, serialized)
+                self._client.setex(key, ttl, serialized)
             except redis.RedisError as e:
                 logger.warning(f"Redis set error: {e}")
 
+    def get_many(self, prefix: str, contents: List[str]) -> List[Optional[Any]]:
+        """Retrieves several values in one round trip. Missing entries are None."""
+        if not self._client or not contents:
+            return [None] * len(contents)
+
+        keys = [self._generate_key(prefix, content) for content in contents]
+        try:
+            values = cast(List[Optional[str]], self._client.mget(keys))
+        except redis.RedisError as e:
+            logger.warning(f"Redis mget error: {e}")
+            return [None] * len(contents)
+
+        return [self._deserialize(v) if v is not None else None for v in values]
+
+    def set_many(self, prefix: str, values: Dict[str, Any], ttl: int = 86400) -> None:
+        """Sets several values (content -> value) in one pipeline."""
+        if not self._client or not values:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for content, value in values.items():
+                key = self._generate_key(prefix, content)
+                pipe.setex(key, ttl, self._serialize(value))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis pipeline set error: {e}")
+
 
 # Global instance
 memory_cache = RedisCache()
@@ -1,7 +1,9 @@
 import glob
 import json
 import os
-from typing import Dict, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from backroom_agent.utils.logger import logger
 
@@ -11,22 +13,125 @@ LEVEL_DATA_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "../../data/level")
 )
 
+# Parsed levels kept in memory (json, html, serialized context), keyed by path
+LEVEL_CACHE_SIZE = 64
+
+# level_id -> JSON path, rebuilt when the directory changes
+_level_index: Dict[str, str] = {}
+_level_index_mtime: Optional[float] = None
+# (mtime_ns, size) of the JSON file and of its HTML file (None if missing)
+_FileVersion = Tuple[Tuple[int, int], Optional[Tuple[int, int]]]
+# path -> (file version, json_data, html_content, serialized json)
+_level_cache: "OrderedDict[str, Tuple[_FileVersion, Dict, Optional[str], str]]" = (
+    OrderedDict()
+)
+_lock = threading.Lock()
 
-def find_level_data(target_level_id: str) -> Tuple[Optional[Dict], Optional[str]]:
-    """
-    Searches for a JSON file in data/level where the 'level_id' field matches target_level_id.
-    Returns the parsed JSON data and the content of the corresponding .html file.
 
-    :param target_level_id: The ID to search for (e.g., "Level 0")
-    :return: (json_data, html_content) or (None, None) if not found.
+def _dir_mtime() -> Optional[float]:
+    try:
+        return os.stat(LEVEL_DATA_DIR).st_mtime
+    except OSError:
+        return None
+
+
+def _build_level_index() -> Dict[str, str]:
+    """Scans data/level once and maps every level_id to its JSON file."""
+    index: Dict[str, str] = {}
+    for file_path in sorted(glob.glob(os.path.join(LEVEL_DATA_DIR, "*.json"))):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON: {file_path}")
+            continue
+        except Exception as e:
+            logger.warning(f"Error reading {file_path}: {e}")
+            continue
+        level_id = data.get("level_id") if isinstance(data, dict) else None
+        if isinstance(level_id, str):
+            index.setdefault(level_id, file_path)
+    return index
+
+
+def _indexed_path(target_level_id: str) -> Optional[str]:
+    """JSON path for the level, (re)building the index if data/level changed."""
+    global _level_index, _level_index_mtime
+    mtime = _dir_mtime()
+    with _lock:
+        if _level_index_mtime is not None and mtime == _level_index_mtime:
+            return _level_index.get(target_level_id)
+    index = _build_level_index()
+    with _lock:
+        _level_index, _level_index_mtime = index, mtime
+    logger.debug(f"Level index built: {len(index)} levels")
+    return index.get(target_level_id)
+
+
+def list_level_ids() -> List[str]:
+    """All level_ids in data/level, in file name order."""
+    _indexed_path("")
+    with _lock:
+        return sorted(_level_index, key=lambda lid: _level_index[lid])
+
+
+def level_exists(level_id: str) -> bool:
+    """Whether a level with this level_id exists in data/level (index lookup only)."""
+    return _indexed_path(level_id) is not None
+
+
+def _html_path(json_path: str) -> str:
+    return json_path.replace(".json", ".html")
+
+
+def _stat_version(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_cached(file_path: str) -> Optional[Tuple[Dict, Optional[str], str]]:
     """
+    (json_data, html_content, serialized json) for a level file, cached until
+    the JSON or its HTML file changes (mtime and size of both).
+    """
+    json_version = _stat_version(file_path)
+    if json_version is None:
+        return None
+    version: _FileVersion = (json_version, _stat_version(_html_path(file_path)))
+
+    with _lock:
+        cached = _level_cache.get(file_path)
+        if cached and cached[0] == version:
+            _level_cache.move_to_end(file_path)
+            return cached[1], cached[2], cached[3]
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        logger.warning(f"Failed to parse JSON: {file_path}")
+        return None
+    except Exception as e:
+        logger.warning(f"Error reading {file_path}: {e}")
+        return None
+
+    data, html_content = _load_pair(file_path, data)
+    serialized = json.dumps(data, ensure_ascii=False, indent=2)
+    with _lock:
+        _level_cache[file_path] = (version, data, html_content, serialized)
+        _level_cache.move_to_end(file_path)
+        while len(_level_cache) > LEVEL_CACHE_SIZE:
+            _level_cache.popitem(last=False)
+    return data, html_content, serialized
+
+
+def _find_cached(target_level_id: str) -> Optional[Tuple[Dict, Optional[str], str]]:
     if not os.path.exists(LEVEL_DATA_DIR):
         logger.error(f"Level data directory not found at: {LEVEL_DATA_DIR}")
-        return None, None
-
-    logger.info(
-        f"Searching for level data for ID: '{target_level_id}' in {LEVEL_DATA_DIR}"
-    )
+        return None
 
     # Optimization: Try to guess the filename first (e.g., "Level 0" -> "level-0.json")
     # This is just a heuristic fast path.
@@ -34,41 +139,52 @@ def find_level_data(target_level_id: str) -> Tuple[Optional[Dict], Optional[str]
     guessed_path = os.path.join(LEVEL_DATA_DIR, guessed_filename)
 
     if os.path.exists(guessed_path):
-        try:
-            with open(guessed_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if data.get("level_id") == target_level_id:
-                return _load_pair(guessed_path, data)
-        except Exception:
-            # Fallback to full scan if read fails or ID doesn't match
-            pass
-
-    # Full scan
-    pattern = os.path.join(LEVEL_DATA_DIR, "*.json")
-    for file_path in glob.glob(pattern):
-        # Skip the guessed path if we already checked it
-        if file_path == guessed_path:
-            continue
+        loaded = _load_cached(guessed_path)
+        if loaded and loaded[0].get("level_id") == target_level_id:
+            return loaded
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    # Fallback: level_id index (one directory scan, reused until data/level changes)
+    file_path = _indexed_path(target_level_id)
+    if file_path and file_path != guessed_path:
+        loaded = _load_cached(file_path)
+        if loaded and loaded[0].get("level_id") == target_level_id:
+            return loaded
 
-            if data.get("level_id") == target_level_id:
-                return _load_pair(file_path, data)
+    logger.warning(f"No level data found for ID: {target_level_id}")
+    return None
 
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to parse JSON: {file_path}")
-        except Exception as e:
-            logger.warning(f"Error reading {file_path}: {e}")
 
-    logger.warning(f"No level data found for ID: {target_level_id}")
-    return None, None
+def find_level_data(target_level_id: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Searches for a JSON file in data/level where the 'level_id' field matches target_level_id.
+    Returns the parsed JSON data and the content of the corresponding .html file.
+
+    Parsed levels are cached in memory (invalidated by file mtime), so repeated
+    lookups and levels warmed by the prefetcher cost no disk reads.
+
+    :param target_level_id: The ID to search for (e.g., "Level 0")
+    :return: (json_data, html_content) or (None, None) if not found.
+    """
+    logger.info(
+        f"Searching for level data for ID: '{target_level_id}' in {LEVEL_DATA_DIR}"
+    )
+    loaded = _find_cached(target_level_id)
+    if not loaded:
+        return None, None
+    _, html_content, serialized = loaded
+    # Callers get their own copy; the cached dict stays pristine
+    return json.loads(serialized), html_content
+
+
+def get_level_context_json(target_level_id: str) -> Optional[str]:
+    """The level JSON serialized for LLM context (cached), or None if not found."""
+    loaded = _find_cached(target_level_id)
+    return loaded[2] if loaded else None
 
 
 def _load_pair(json_path: str, json_data: Dict) -> Tuple[Dict, Optional[str]]:
     """Helper to load the HTML file corresponding to a JSON file."""
-    html_path = json_path.replace(".json", ".html")
+    html_path = _html_path(json_path)
     html_content = None
 
     if os.path.exists(html_path):
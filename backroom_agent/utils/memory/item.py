@@ -1,5 +1,7 @@
+import sys
 import time
 import uuid
+from typing import Any, Dict, Optional
 
 
 class MemoryItem:
@@ -7,14 +9,45 @@ class MemoryItem:
     Represents a single unit of memory with metadata.
     """
 
-    def __init__(self, content: str):
-        self.id: str = str(uuid.uuid4())
+    # Many small items live per session: no per-instance __dict__
+    __slots__ = ("id", "content", "usage_count", "created_at", "last_used_at")
+
+    def __init__(
+        self,
+        content: str,
+        id: Optional[str] = None,
+        usage_count: int = 0,
+        created_at: Optional[float] = None,
+        last_used_at: Optional[float] = None,
+    ):
+        self.id: str = id or str(uuid.uuid4())
         self.content: str = content
-        self.usage_count: int = 0
-        self.created_at: float = time.time()
-        self.last_used_at: float = self.created_at
+        self.usage_count: int = usage_count
+        self.created_at: float = created_at if created_at is not None else time.time()
+        self.last_used_at: float = (
+            last_used_at if last_used_at is not None else self.created_at
+        )
 
     def touch(self):
         """Updates last used time and increments usage count."""
         self.usage_count += 1
         self.last_used_at = time.time()
+
+    def approx_size(self) -> int:
+        """Approximate bytes held by the item (for the manager's memory budget)."""
+        return (
+            sys.getsizeof(self) + sys.getsizeof(self.id) + sys.getsizeof(self.content)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MemoryItem":
+        return cls(
+            data["content"],
+            id=data.get("id"),
+            usage_count=data.get("usage_count", 0),
+            created_at=data.get("created_at"),
+            last_used_at=data.get("last_used_at"),
+        )
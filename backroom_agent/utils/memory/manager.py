@@ -1,39 +1,186 @@
-from typing import Dict, List
+"""
+会话记忆管理：每个 session_id 一个 MemoryManager，进程内注册表有界。
 
+- 注册表按 LRU 排序：超过 MEMORY_MAX_SESSIONS 个会话、超过 MEMORY_BUDGET_BYTES
+  (记忆条目的估算内存) 或闲置超过 MEMORY_SESSION_TTL 秒的会话被移出进程
+- 每个会话的记忆是长度为 MEMORY_MAX_ITEMS 的环形缓冲 (deque)，最旧的条目自动丢弃
+- 写后持久化 (write-behind)：修改只标记为脏，由后台线程合并写入 Redis 列表
+  backroom:memory:{session_id}（MEMORY_PERSIST_TTL 秒后过期）；被移出的会话在
+  下次 get_instance 时从 Redis 恢复。Redis 不可用时记忆只保存在进程内
+- 尚未写入 Redis 的被移出会话 (写入失败时会一直保留) 同样计入会话数与内存预算；
+  超出限制时最早移出的会话被丢弃并记录警告
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional
+
+import redis
+
+from backroom_agent.constants import (MEMORY_BUDGET_BYTES, MEMORY_MAX_ITEMS,
+                                      MEMORY_MAX_SESSIONS, MEMORY_PERSIST_TTL,
+                                      MEMORY_SESSION_TTL)
+from backroom_agent.utils.cache import RedisCache
 from backroom_agent.utils.logger import logger
 
 from .item import MemoryItem
 
+# One writer: flushes of a session never interleave
+_flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-flush")
+
+# MemoryManager._client before the first lookup of the shared connection
+_UNRESOLVED: Any = object()
+
 
 class MemoryManager:
     """
     Manages memories for the agent.
     """
 
-    _instances: Dict[str, "MemoryManager"] = {}
+    # session_id -> manager, least recently used first
+    _instances: "OrderedDict[str, MemoryManager]" = OrderedDict()
+    # Evicted managers whose changes are not in Redis yet (revived on access),
+    # oldest eviction first
+    _evicted: Dict[str, "MemoryManager"] = {}
+    # Approximate bytes held by the memories of resident / evicted managers
+    _total_size: int = 0
+    _evicted_size: int = 0
+    _lock = threading.RLock()
+    # Shares the Redis connection of memory_cache, looked up on first use
+    # (None: process-only memories)
+    _client: Optional[redis.Redis] = _UNRESOLVED
+
+    @classmethod
+    def _redis(cls) -> Optional[redis.Redis]:
+        """The Redis connection used for persistence (None: process-only memories)."""
+        if cls._client is _UNRESOLVED:
+            cls._client = RedisCache.get_instance().client
+        return cls._client
 
     @classmethod
     def get_instance(cls, session_id: str) -> "MemoryManager":
-        """Returns the singleton instance for the given session_id."""
-        if session_id not in cls._instances:
-            cls._instances[session_id] = cls(session_id)
-        return cls._instances[session_id]
+        """Returns the instance for the given session_id, rehydrating it if evicted."""
+        with cls._lock:
+            manager = cls._instances.get(session_id) or cls._pop_evicted(session_id)
+            if manager is not None:
+                cls._admit(manager)
+                return manager
+
+        # Not resident: load the persisted memories outside the lock
+        manager = cls(session_id)
+        manager._rehydrate()
+        with cls._lock:
+            existing = cls._instances.get(session_id)
+            if existing is not None:
+                # Another thread admitted it first
+                cls._admit(existing)
+                return existing
+            cls._admit(manager)
+        return manager
+
+    @classmethod
+    def _admit(cls, manager: "MemoryManager"):
+        """Marks the manager most recently used (adding it if needed); lock held."""
+        manager.last_access = time.time()
+        if manager.session_id not in cls._instances:
+            cls._instances[manager.session_id] = manager
+            cls._total_size += manager.size
+        cls._instances.move_to_end(manager.session_id)
+        cls._evict()
+
+    @classmethod
+    def _pop_evicted(cls, session_id: str) -> Optional["MemoryManager"]:
+        """Removes an evicted manager from the pending set; lock held."""
+        manager = cls._evicted.pop(session_id, None)
+        if manager is not None:
+            cls._evicted_size -= manager.size
+        return manager
+
+    @classmethod
+    def _over_budget(cls) -> bool:
+        return cls._total_size + cls._evicted_size > MEMORY_BUDGET_BYTES
+
+    @classmethod
+    def _evict(cls):
+        """
+        Drops least recently used managers while the registry is over its
+        session count or memory budget, and idle ones; lock held. The most
+        recently used manager always stays. Evicted managers still waiting
+        for their Redis write count against the same limits.
+        """
+        now = time.time()
+        while len(cls._instances) > 1:
+            session_id, oldest = next(iter(cls._instances.items()))
+            idle = now - oldest.last_access > MEMORY_SESSION_TTL
+            over = len(cls._instances) > MEMORY_MAX_SESSIONS or cls._over_budget()
+            if not (idle or over):
+                break
+            cls._instances.popitem(last=False)
+            cls._total_size -= oldest.size
+            if oldest._dirty and cls._redis():
+                cls._evicted[session_id] = oldest
+                cls._evicted_size += oldest.size
+                oldest._schedule_flush()
+            logger.debug(f"Memory session evicted: {session_id}")
+
+        # Unsaved sessions (e.g. Redis keeps failing) cannot pile up without bound
+        while cls._evicted and (
+            len(cls._evicted) > MEMORY_MAX_SESSIONS or cls._over_budget()
+        ):
+            session_id = next(iter(cls._evicted))
+            cls._pop_evicted(session_id)
+            logger.warning(f"Memory session dropped before it was saved: {session_id}")
+
+    @classmethod
+    def flush_all(cls):
+        """Writes every pending change to Redis now (e.g. on shutdown)."""
+        with cls._lock:
+            managers = list(cls._instances.values()) + list(cls._evicted.values())
+        for manager in managers:
+            manager._flush()
 
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.memories: List[MemoryItem] = []
+        self.memories: Deque[MemoryItem] = deque(maxlen=MEMORY_MAX_ITEMS)
+        self.size = 0
+        self.last_access = time.time()
+        # Changed since the last write to Redis / a flush is queued
+        self._dirty = False
+        self._flush_pending = False
+
+    def _resize(self, delta: int):
+        """Applies a size change to the manager (and the budget if resident); lock held."""
+        self.size += delta
+        if MemoryManager._instances.get(self.session_id) is self:
+            MemoryManager._total_size += delta
+        elif MemoryManager._evicted.get(self.session_id) is self:
+            MemoryManager._evicted_size += delta
 
     def add_memory(self, content: str):
         """Adds a memory item with metadata."""
         item = MemoryItem(content)
-        self.memories.append(item)
+        with self._lock:
+            delta = item.approx_size()
+            if len(self.memories) == self.memories.maxlen:
+                # The ring buffer drops the oldest item on append
+                delta -= self.memories[0].approx_size()
+            self.memories.append(item)
+            self._resize(delta)
+            self._dirty = True
+            if MemoryManager._instances.get(self.session_id) is self:
+                MemoryManager._admit(self)
+        self._schedule_flush()
 
     def get_recent_memories(self, k: int = 5) -> List[MemoryItem]:
         """Retrieves the last k memories and updates their usage stats."""
-        # Retrieve the relevant memories
-        recent = self.memories[-k:]
+        with self._lock:
+            # Retrieve the relevant memories
+            recent = list(self.memories)[-k:] if k > 0 else []
 
-        # Update usage stats
+        # Update usage stats (kept in process; persisted with the next change)
         for item in recent:
             item.touch()
 
@@ -41,4 +188,80 @@ class MemoryManager:
 
     def clear(self):
         """Clears all memories."""
-        self.memories = []
+        with self._lock:
+            self.memories.clear()
+            self._resize(-self.size)
+            self._dirty = True
+        self._schedule_flush()
+
+    # --- Redis persistence (write-behind) ---
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"backroom:memory:{session_id}"
+
+    def _schedule_flush(self):
+        """Queues a background write unless one is already queued."""
+        if not self._redis():
+            return
+        with self._lock:
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        _flush_executor.submit(self._flush)
+
+    def _flush(self):
+        """Replaces the persisted list with the current memories."""
+        client = self._redis()
+        with self._lock:
+            self._flush_pending = False
+            if not self._dirty or not client:
+                return
+            self._dirty = False
+            payload = [
+                json.dumps(item.to_dict(), ensure_ascii=False) for item in self.memories
+            ]
+
+        key = self._key(self.session_id)
+        try:
+            pipe = client.pipeline()
+            pipe.delete(key)
+            if payload:
+                pipe.rpush(key, *payload)
+                pipe.expire(key, MEMORY_PERSIST_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Memory flush error ({self.session_id}): {e}")
+            with self._lock:
+                # Retried with the next change (or flush_all)
+                self._dirty = True
+        finally:
+            with self._lock:
+                if (
+                    not self._dirty
+                    and MemoryManager._evicted.get(self.session_id) is self
+                ):
+                    MemoryManager._pop_evicted(self.session_id)
+
+    def _rehydrate(self):
+        """Loads the persisted memories of the session (newest MEMORY_MAX_ITEMS)."""
+        client = self._redis()
+        if not client:
+            return
+        try:
+            raw_items = client.lrange(self._key(self.session_id), -MEMORY_MAX_ITEMS, -1)
+        except redis.RedisError as e:
+            logger.warning(f"Memory load error ({self.session_id}): {e}")
+            return
+
+        for raw in raw_items:  # type: ignore[union-attr]
+            try:
+                item = MemoryItem.from_dict(json.loads(raw))
+            except (ValueError, KeyError, TypeError):
+                continue
+            self.memories.append(item)
+            self.size += item.approx_size()
+        if raw_items:
+            logger.debug(
+                f"Memory session rehydrated: {self.session_id} ({len(self.memories)} items)"
+            )
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+from backroom_agent.constants import WIKI_MIN_REQUEST_INTERVAL
+
+
+class DomainRateLimiter:
+    """
+    按域名限速：同一 host 的两次请求之间至少间隔 min_interval 秒。
+
+    不同 host (例如两个 wiki 镜像) 互不影响，可以并行请求。
+    线程安全；同时提供阻塞 (wait) 与异步 (acquire) 两种等待方式，
+    取代各处的固定 time.sleep。
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, url: str) -> float:
+        """为 url 所在 host 预约下一个请求时间，返回需要等待的秒数。"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+            return slot - now
+
+    def wait(self, url: str):
+        """阻塞当前线程直到可以请求 url。"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self, url: str):
+        """异步等待直到可以请求 url，不阻塞事件循环中的其它任务。"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Global instance shared by every wiki fetch in the process
+wiki_rate_limiter = DomainRateLimiter(WIKI_MIN_REQUEST_INTERVAL)
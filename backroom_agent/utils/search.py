@@ -6,14 +6,20 @@ from langsmith import traceable
 from backroom_agent.utils.logger import logger
 
 
+class SearchError(Exception):
+    """The search could not be completed (rate limit, network error, ...)."""
+
+
 @traceable(run_type="tool", name="Search Backrooms Wiki")
-def search_backrooms_wiki(query_content: str) -> str | None:
+def search_backrooms_wiki(query_content: str, raise_errors: bool = False) -> str | None:
     """
     Searches for a Backrooms wiki page for the given content.
     Returns the URL of the first result matching backrooms-wiki-cn.wikidot.com.
 
     Args:
         query_content: The term to search for (e.g., "Level 1" or "Entity 2")
+        raise_errors: Raise SearchError when the search fails instead of
+            returning None, so callers can tell a failure from "no result"
 
     Returns:
         str: The URL if found, else None
@@ -43,5 +49,7 @@ def search_backrooms_wiki(query_content: str) -> str | None:
                         return url
     except Exception as e:
         logger.error(f"Search error: {e}")
+        if raise_errors:
+            raise SearchError(str(e)) from e
 
     return None
@@ -0,0 +1,191 @@
+"""
+服务端会话存储：按 session_id 保存权威的 GameState、消息记录与版本号。
+
+- Redis 哈希 backroom:session:{session_id}（字段 version / state / messages），
+  SESSION_TTL 秒无活动后过期
+- 进程内 LRU 缓存已校验的 GameState 对象：命中时只向 Redis 读取 version 字段，
+  不再传输与校验完整的状态
+- 乐观并发：save() 需要传入读取时的版本号，版本不一致 (其它请求已写入) 时抛出
+  SessionConflictError；Redis 不可用时退化为进程内存储，语义不变
+- 已连接 Redis 但写入失败时 save() 抛出 SessionSaveError，不保留只存在于本进程的
+  新版本 (多 worker 部署中其它进程看不到它)
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import redis
+
+from backroom_agent.constants import (SESSION_CACHE_SIZE, SESSION_MAX_MESSAGES,
+                                      SESSION_TTL)
+from backroom_agent.protocol import GameState
+from backroom_agent.utils.cache import RedisCache
+from backroom_agent.utils.logger import logger
+
+
+class SessionConflictError(Exception):
+    """The session was written by another request since it was loaded."""
+
+    def __init__(self, session_id: str, expected: int, actual: int):
+        super().__init__(
+            f"Session {session_id} is at version {actual}, expected {expected}"
+        )
+        self.session_id = session_id
+        self.expected = expected
+        self.actual = actual
+
+
+class SessionSaveError(Exception):
+    """The session could not be written to Redis; nothing was saved."""
+
+
+@dataclass
+class Session:
+    session_id: str
+    # 0 = not stored yet; every successful save increments it
+    version: int = 0
+    state: Optional[GameState] = None
+    # [{"sender": "player" | "dm" | "system" | "init", "text": ...}]
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    updated_at: float = 0.0
+
+    def append_message(self, sender: str, text: str):
+        self.messages.append({"sender": sender, "text": text})
+
+    def copy(self) -> "Session":
+        # GameState objects are replaced, never mutated, by the graph nodes
+        return Session(
+            self.session_id,
+            self.version,
+            self.state,
+            [dict(m) for m in self.messages],
+            self.updated_at,
+        )
+
+
+class SessionStore:
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._client = client
+        self._cache: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"backroom:session:{session_id}"
+
+    def _cache_put(self, session: Session):
+        with self._lock:
+            self._cache[session.session_id] = session
+            self._cache.move_to_end(session.session_id)
+            while len(self._cache) > SESSION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._cache.get(session_id)
+            if session is not None:
+                self._cache.move_to_end(session_id)
+            return session
+
+    def load(self, session_id: str) -> Session:
+        """The stored session (a copy), or a new one at version 0."""
+        cached = self._cache_get(session_id)
+        if not self._client:
+            return cached.copy() if cached else Session(session_id)
+
+        key = self._key(session_id)
+        try:
+            version = self._client.hget(key, "version")
+            if version is None:
+                return Session(session_id)
+            if cached and cached.version == int(version):  # type: ignore[arg-type]
+                return cached.copy()
+            data = self._client.hgetall(key)
+        except redis.RedisError as e:
+            logger.warning(f"Session load error ({session_id}): {e}")
+            return cached.copy() if cached else Session(session_id)
+
+        session = self._decode(session_id, data)  # type: ignore[arg-type]
+        self._cache_put(session)
+        return session.copy()
+
+    def save(self, session: Session) -> int:
+        """
+        Writes the session if it is still at session.version and returns the
+        new version. Raises SessionConflictError otherwise, and SessionSaveError
+        when Redis fails.
+        """
+        expected = session.version
+        stored = Session(
+            session.session_id,
+            expected + 1,
+            session.state,
+            session.messages[-SESSION_MAX_MESSAGES:],
+            time.time(),
+        )
+
+        if self._client:
+            self._save_redis(stored, expected)
+        else:
+            with self._lock:
+                current = self._cache.get(session.session_id)
+                actual = current.version if current else 0
+                if actual != expected:
+                    raise SessionConflictError(session.session_id, expected, actual)
+                self._cache[session.session_id] = stored
+
+        self._cache_put(stored)
+        session.version = stored.version
+        return stored.version
+
+    def _save_redis(self, stored: Session, expected: int):
+        assert self._client is not None
+        key = self._key(stored.session_id)
+        try:
+            with self._client.pipeline() as pipe:
+                pipe.watch(key)
+                actual = int(pipe.hget(key, "version") or 0)  # type: ignore[arg-type]
+                if actual != expected:
+                    pipe.unwatch()
+                    raise SessionConflictError(stored.session_id, expected, actual)
+                pipe.multi()
+                pipe.hset(key, mapping=self._encode(stored))
+                pipe.expire(key, SESSION_TTL)
+                pipe.execute()
+        except redis.WatchError:
+            raise SessionConflictError(stored.session_id, expected, -1)
+        except redis.RedisError as e:
+            logger.warning(f"Session save error ({stored.session_id}): {e}")
+            raise SessionSaveError(str(e)) from e
+
+    @staticmethod
+    def _encode(session: Session) -> Dict[str, str]:
+        return {
+            "version": str(session.version),
+            "state": session.state.model_dump_json() if session.state else "",
+            "messages": json.dumps(session.messages, ensure_ascii=False),
+            "updated_at": str(session.updated_at),
+        }
+
+    @staticmethod
+    def _decode(session_id: str, data: Dict[str, str]) -> Session:
+        state_json = data.get("state") or ""
+        try:
+            messages = json.loads(data.get("messages") or "[]")
+        except json.JSONDecodeError:
+            messages = []
+        return Session(
+            session_id,
+            int(data.get("version") or 0),
+            GameState.model_validate_json(state_json) if state_json else None,
+            messages,
+            float(data.get("updated_at") or 0),
+        )
+
+
+# Global instance (shares the Redis connection of memory_cache)
+session_store = SessionStore(RedisCache.get_instance().client)
@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from .chroma_store import ChromaVectorStore
+from .embedding_cache import get_embedding_cache_stats
 # 使用相对导入，方便包内部重构
 from .pickle_store import PickleVectorStore
 
@@ -24,18 +26,26 @@ __all__ = [
     "ChromaVectorStore",
     "rebuild_vector_db",
     "update_vector_db",
+    "delete_from_vector_db",
     "search_similar_items",
+    "get_embedding_cache_stats",
 ]
 
 
+@lru_cache(maxsize=32)
 def _get_store(
     backend: str,
     db_path: str,
     provider: str,
     model_name: str,
     collection_name: str = "item_collection",
+    quantization: str = "none",
 ):
-    """Factory to get the correct vector store instance."""
+    """
+    Factory to get the correct vector store instance.
+    Instances are cached so repeated searches reuse the same store (and its
+    Chroma client); the embedding model itself is shared process-wide.
+    """
     if backend == "chroma":
         # For Chroma, db_path is treated as persist_directory
         # If the user passed a file path (ending in .pkl), strip it to get a dir
@@ -56,7 +66,10 @@ def _get_store(
     else:
         # Default to Pickle
         return PickleVectorStore(
-            db_path=db_path, provider=provider, model_name=model_name
+            db_path=db_path,
+            provider=provider,
+            model_name=model_name,
+            quantization=quantization,
         )
 
 
@@ -66,11 +79,14 @@ def rebuild_vector_db(
     provider: str = "local",
     model_name: str = "all-MiniLM-L6-v2",
     backend: str = "pickle",  # "pickle" or "chroma"
+    quantization: str = "none",  # "none", "float16" or "int8" (pickle only)
 ):
     """
     Rebuilds the vector database from scratch using all items in data/item.
     """
-    store = _get_store(backend, db_path, provider, model_name)
+    store = _get_store(
+        backend, db_path, provider, model_name, quantization=quantization
+    )
     store.build_index(item_data_dir=item_dir)
 
 
@@ -88,6 +104,20 @@ def update_vector_db(
     store.update_index(file_paths)
 
 
+def delete_from_vector_db(
+    ids: List[str],
+    db_path: str = "./data/vector_store/item_vector_store.pkl",
+    provider: str = "local",
+    model_name: str = "all-MiniLM-L6-v2",
+    backend: str = "pickle",
+):
+    """
+    Removes items with the given IDs from the vector database.
+    """
+    store = _get_store(backend, db_path, provider, model_name)
+    store.delete_ids(ids)
+
+
 def search_similar_items(
     query: str,
     k: int = 5,
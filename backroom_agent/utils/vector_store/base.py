@@ -3,7 +3,7 @@ from typing import Dict, List, Optional
 
 from langchain_core.embeddings import Embeddings
 
-from .factory import get_embedding_model
+from .embedding_cache import get_cached_embedding_model
 
 
 class BaseVectorStore(ABC):
@@ -37,9 +37,12 @@ class BaseVectorStore(ABC):
         """
         延迟初始化 Embedding 模型，避免在不需要时加载模型。
         子类在需要使用 self.embedding_model 前应调用此方法 (或 super()._init_resources())。
+        模型外层带有 (provider, model, backend, text) 级别的 embedding 缓存。
         """
         if self.embedding_model is None:
-            self.embedding_model = get_embedding_model(self.provider, self.model_name)
+            self.embedding_model = get_cached_embedding_model(
+                self.provider, self.model_name
+            )
 
     @abstractmethod
     def build_index(self, item_data_dir: str = "./data/item"):
@@ -55,3 +58,8 @@ class BaseVectorStore(ABC):
     def update_index(self, file_paths: List[str]):
         """增量更新索引。"""
         pass
+
+    @abstractmethod
+    def delete_ids(self, ids: List[str]):
+        """按 id 从索引中删除物品。"""
+        pass
@@ -0,0 +1,75 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    动态批处理包装器。
+
+    多个线程并发调用 embed_query 时，请求先进入队列，由后台线程在
+    max_wait_ms 窗口内 (或凑满 max_batch 条) 合并为一次 embed_documents 调用，
+    减少模型前向次数。单个请求时最多只增加 max_wait_ms 的延迟。
+
+    注意：合并后走的是 embed_documents，因此只适用于 query / document
+    编码方式相同的模型 (例如默认配置的 sentence-transformers)。
+    """
+
+    def __init__(
+        self, inner: Embeddings, max_batch: int = 32, max_wait_ms: float = 2.0
+    ):
+        self.inner = inner
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.inner.embed_documents(texts)
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Embedding model returned {len(vectors)} vectors "
+                        f"for {len(batch)} texts"
+                    )
+                for (_, future), vec in zip(batch, vectors):
+                    future.set_result(vec)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                # BaseException (e.g. KeyboardInterrupt) ends the worker: callers
+                # must not wait forever on the futures it took from the queue
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Embedding batch aborted"))
+
+    def embed_query(self, text: str) -> List[float]:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # 文档批量编码本身已经是批处理，直接透传
+        return self.inner.embed_documents(texts)
@@ -40,7 +40,10 @@ class ChromaVectorStore(BaseVectorStore):
     def _init_resources(self):
         """初始化 Embedding 模型和 Chroma 客户端。"""
         self._init_model()  # Inherited from BaseVectorStore
+        self._init_client()
 
+    def _init_client(self):
+        """初始化 Chroma 客户端 (不加载 Embedding 模型)。"""
         if self.client is None:
             # 初始化持久化客户端
             os.makedirs(self.persist_directory, exist_ok=True)
@@ -220,3 +223,17 @@ class ChromaVectorStore(BaseVectorStore):
             documents=texts,
         )
         print(f"Updated {len(new_items)} items.")
+
+    def delete_ids(self, ids: List[str]):
+        """
+        从 Collection 中删除指定 id 的物品。
+        删除操作不需要 Embedding 模型，因此只初始化客户端。
+        """
+        if not ids:
+            return
+
+        self._init_client()
+        assert self.collection is not None
+
+        self.collection.delete(ids=list(ids))
+        print(f"Deleted {len(ids)} items from ChromaDB.")
@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from backroom_agent.constants import (EMBEDDING_BACKEND, EMBEDDING_CACHE_REDIS,
+                                      EMBEDDING_CACHE_REDIS_TTL,
+                                      EMBEDDING_CACHE_SIZE)
+
+from .factory import get_embedding_model, model_cache_key
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedding 缓存包装器。
+
+    以 (provider, model, backend, text) 为键，在模型前面加一层进程内 LRU 缓存，
+    可选地以 RedisCache 作为二级持久化缓存 (跨进程/重启共享)。
+    重复出现的物品名、实体名和玩家短语不再触发模型推理或远程 embedding API。
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        provider: str,
+        model_name: str,
+        backend: str = EMBEDDING_BACKEND,
+        max_size: int = EMBEDDING_CACHE_SIZE,
+        use_redis: bool = EMBEDDING_CACHE_REDIS,
+        redis_ttl: int = EMBEDDING_CACHE_REDIS_TTL,
+    ):
+        self.inner = inner
+        self.provider = provider
+        self.model_name = model_name
+        self.key = model_cache_key(provider, model_name, backend)
+        self.max_size = max_size
+        self.redis_ttl = redis_ttl
+        # 不同本地后端 (torch / onnx / torch-int8) 的向量不同，不能共享 Redis 条目
+        self._redis_prefix = "embedding:" + ":".join(p for p in self.key if p)
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0}
+
+        self._redis = None
+        if use_redis:
+            # 延迟导入：未启用持久化时不连接 Redis
+            from backroom_agent.utils.cache import RedisCache
+
+            self._redis = RedisCache.get_instance()
+
+    # --- LRU helpers ---
+
+    def _lru_get(self, text: str) -> Optional[List[float]]:
+        with self._lock:
+            vec = self._lru.get(text)
+            if vec is not None:
+                self._lru.move_to_end(text)
+            return vec
+
+    def _lru_put(self, text: str, vec: List[float]):
+        with self._lock:
+            self._lru[text] = vec
+            self._lru.move_to_end(text)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def _lookup(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """依次查询 LRU 与 Redis，并回填 LRU。"""
+        found = [self._lru_get(text) for text in texts]
+        local_hits = sum(vec is not None for vec in found)
+
+        redis_hits = 0
+        missing = [i for i, vec in enumerate(found) if vec is None]
+        if self._redis is not None and missing:
+            remote = self._redis.get_many(
+                self._redis_prefix, [texts[i] for i in missing]
+            )
+            for i, vec in zip(missing, remote):
+                if isinstance(vec, list):
+                    found[i] = vec
+                    self._lru_put(texts[i], vec)
+                    redis_hits += 1
+
+        with self._lock:
+            self._stats["hits"] += local_hits
+            self._stats["redis_hits"] += redis_hits
+            self._stats["misses"] += len(texts) - local_hits - redis_hits
+        return found
+
+    def _store(self, texts: List[str], vectors: List[List[float]]):
+        for text, vec in zip(texts, vectors):
+            self._lru_put(text, vec)
+        if self._redis is not None:
+            self._redis.set_many(
+                self._redis_prefix, dict(zip(texts, vectors)), ttl=self.redis_ttl
+            )
+
+    # --- Embeddings API ---
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self._lookup([text])[0]
+        if cached is not None:
+            return cached
+
+        vec = list(self.inner.embed_query(text))
+        self._store([text], [vec])
+        return vec
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = self._lookup(texts)
+
+        # 只对未命中的文本 (去重后) 调用一次模型
+        missing = list(dict.fromkeys(t for t, vec in zip(texts, found) if vec is None))
+        if missing:
+            vectors = [list(v) for v in self.inner.embed_documents(missing)]
+            self._store(missing, vectors)
+            computed = dict(zip(missing, vectors))
+            found = [
+                vec if vec is not None else computed[text]
+                for text, vec in zip(texts, found)
+            ]
+
+        return [vec for vec in found if vec is not None]
+
+    def stats(self) -> Dict[str, float]:
+        """返回命中统计 (hits / redis_hits / misses / hit_rate / size)。"""
+        with self._lock:
+            total = sum(self._stats.values())
+            hit_rate = (
+                (self._stats["hits"] + self._stats["redis_hits"]) / total
+                if total
+                else 0.0
+            )
+            return {**self._stats, "hit_rate": hit_rate, "size": len(self._lru)}
+
+
+# 进程级缓存包装器：同一 (provider, model, backend) 共享一份 LRU
+_CACHED_MODELS: Dict[Tuple[str, str, str], CachedEmbeddings] = {}
+_CACHED_MODELS_LOCK = threading.Lock()
+
+
+def get_cached_embedding_model(
+    provider: str = "local",
+    model_name: str = "all-MiniLM-L6-v2",
+    backend: str = EMBEDDING_BACKEND,
+) -> CachedEmbeddings:
+    """Returns the process-wide cached embedding model for provider/model/backend."""
+    key = model_cache_key(provider, model_name, backend)
+    with _CACHED_MODELS_LOCK:
+        model = _CACHED_MODELS.get(key)
+        if model is None:
+            model = CachedEmbeddings(
+                get_embedding_model(provider, model_name, backend),
+                provider,
+                model_name,
+                backend,
+            )
+            _CACHED_MODELS[key] = model
+        return model
+
+
+def get_embedding_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Hit-rate statistics for every cached model, keyed by "provider/model[/backend]"."""
+    with _CACHED_MODELS_LOCK:
+        models = dict(_CACHED_MODELS)
+    return {
+        "/".join(p for p in key if p): model.stats() for key, model in models.items()
+    }
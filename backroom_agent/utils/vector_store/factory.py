@@ -1,20 +1,66 @@
-from typing import Any
+import threading
+from typing import Any, Dict, Tuple
 
 from langchain_core.embeddings import Embeddings
 
 from backroom_agent.constants import (DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL,
+                                      EMBEDDING_BACKEND,
+                                      EMBEDDING_BATCH_WAIT_MS,
+                                      EMBEDDING_MAX_BATCH, EMBEDDING_ONNX_FILE,
                                       OPENAI_API_KEY)
 
+from .batching import BatchingEmbeddings
+
+# 进程级模型缓存：同一 (provider, model, backend) 只加载一次
+# Process-wide cache so every store instance shares one loaded model
+_MODEL_CACHE: Dict[Tuple[str, str, str], Embeddings] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def model_cache_key(
+    provider: str, model_name: str, backend: str = EMBEDDING_BACKEND
+) -> Tuple[str, str, str]:
+    """
+    Identity of an embedding model: (provider, model, backend). The local
+    backends produce different vectors; remote providers have no backend.
+    """
+    return (provider, model_name, backend if provider != "openai" else "")
+
 
 def get_embedding_model(
-    provider: str = "local", model_name: str = "all-MiniLM-L6-v2"
+    provider: str = "local",
+    model_name: str = "all-MiniLM-L6-v2",
+    backend: str = EMBEDDING_BACKEND,
 ) -> Embeddings:
     """
-    Factory function to get the embedding model based on provider and model name.
+    Returns the shared embedding model for provider/model/backend, loading it once
+    per process.
 
     Args:
         provider (str): "local" (HuggingFace) or "openai".
         model_name (str): The name of the model to use.
+        backend (str): Local inference backend: "torch", "torch-int8" or "onnx".
+    """
+    key = model_cache_key(provider, model_name, backend)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _create_embedding_model(provider, model_name, backend)
+            _MODEL_CACHE[key] = model
+        return model
+
+
+def _create_embedding_model(
+    provider: str = "local",
+    model_name: str = "all-MiniLM-L6-v2",
+    backend: str = "torch",
+) -> Embeddings:
+    """
+    Factory function to build the embedding model based on provider and model name.
     """
     if provider == "openai":
         try:
@@ -41,5 +87,43 @@ def get_embedding_model(
             raise ImportError(
                 "Missing dependencies: pip install langchain-huggingface sentence-transformers scikit-learn"
             )
-        print(f"Initializing local embedding model ({model_name})...")
-        return HuggingFaceEmbeddings(model_name=model_name)
+
+        model_kwargs: Dict[str, Any] = {}
+        if backend == "onnx":
+            # Requires: pip install "sentence-transformers[onnx]"
+            model_kwargs["backend"] = "onnx"
+            if EMBEDDING_ONNX_FILE:
+                # e.g. "onnx/model_qint8_avx512_vnni.onnx" for an int8-quantized export
+                model_kwargs["model_kwargs"] = {"file_name": EMBEDDING_ONNX_FILE}
+        elif backend not in ("torch", "torch-int8"):
+            raise ValueError(
+                f"Invalid embedding backend '{backend}'. Supported: 'torch', 'torch-int8', 'onnx'"
+            )
+
+        print(
+            f"Initializing local embedding model ({model_name}, backend={backend})..."
+        )
+        embeddings = HuggingFaceEmbeddings(
+            model_name=model_name, model_kwargs=model_kwargs
+        )
+
+        if backend == "torch-int8":
+            _quantize_torch_model(embeddings)
+
+        return BatchingEmbeddings(
+            embeddings,
+            max_batch=EMBEDDING_MAX_BATCH,
+            max_wait_ms=EMBEDDING_BATCH_WAIT_MS,
+        )
+
+
+def _quantize_torch_model(embeddings: Any):
+    """Applies dynamic int8 quantization to the Linear layers (CPU inference)."""
+    import torch
+
+    client = getattr(embeddings, "_client", None)
+    if client is None:
+        return
+    embeddings._client = torch.quantization.quantize_dynamic(
+        client, {torch.nn.Linear}, dtype=torch.qint8
+    )
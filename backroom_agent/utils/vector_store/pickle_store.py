@@ -1,6 +1,12 @@
+import glob
 import os
 import pickle
-from typing import Any, Dict, List, Tuple, cast
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -11,8 +17,99 @@ try:
 except ImportError:
     cosine_similarity = None
 
+# 跨进程写锁 (仅 POSIX)；没有 fcntl 的平台上只能依赖单写入者
+# Cross-process write lock (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
 from .base import BaseVectorStore
 from .loader import load_item_from_file, load_items_from_dir
+from .quantization import (QUANTIZATION_MODES, approximate_scores,
+                           normalize_rows, quantize)
+
+# 增量段数量达到该阈值时，将所有增量合并回基础文件
+# Number of delta segments that triggers a compaction into the base file
+DEFAULT_COMPACT_THRESHOLD = 8
+
+# 量化模式下，第一阶段取 k * DEFAULT_RERANK_FACTOR 个候选再做精确重排
+# Candidates kept by the quantized scan per requested result
+DEFAULT_RERANK_FACTOR = 4
+
+
+_last_segment_seq = 0
+
+
+def _next_segment_seq() -> int:
+    """
+    返回严格递增的段序号 (纳秒时间戳)，保证同一进程内连续写入的增量段按写入顺序排序。
+    """
+    global _last_segment_seq
+    _last_segment_seq = max(time.time_ns(), _last_segment_seq + 1)
+    return _last_segment_seq
+
+
+def _atomic_write(path: str, writer):
+    """
+    原子写入文件：先写入同目录下的临时文件，再通过 os.replace 替换。
+    并发读取者要么看到旧文件，要么看到完整的新文件，不会读到截断的内容。
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            writer(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _atomic_pickle_dump(data: Any, path: str):
+    """原子写入 pickle 文件。"""
+    _atomic_write(path, lambda f: pickle.dump(data, f))
+
+
+@dataclass
+class _IndexSnapshot:
+    """
+    基础文件 + 增量段合并后的只读视图。
+
+    行的顺序为 [基础文件的行..., 增量段追加的行...]。被增量段覆盖或删除的行
+    在 alive 中标记为 False，搜索时屏蔽，压缩时物理移除。
+    """
+
+    items: List[Dict]
+    alive: np.ndarray
+    # 基础文件的精确向量 (普通 ndarray 或内存映射的 float32 sidecar)
+    base_exact: Optional[np.ndarray]
+    # 基础文件的量化向量 (未量化时为 None)
+    base_quantized: Optional[Dict[str, Any]]
+    # 增量段追加的精确向量
+    delta_matrix: Optional[np.ndarray]
+    merged_deltas: List[str]
+
+    @property
+    def base_size(self) -> int:
+        return 0 if self.base_exact is None else int(self.base_exact.shape[0])
+
+    def exact_matrix(self) -> Optional[np.ndarray]:
+        """拼接出全部行的精确向量 (float32)。"""
+        parts = [
+            np.asarray(m, dtype=np.float32)
+            for m in (self.base_exact, self.delta_matrix)
+            if m is not None and len(m)
+        ]
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else np.vstack(parts)
 
 
 class PickleVectorStore(BaseVectorStore):
@@ -20,6 +117,16 @@ class PickleVectorStore(BaseVectorStore):
     一个简单的基于内存的向量存储实现。
     使用 numpy 存储向量矩阵，使用 pickle 序列化到磁盘。
     依赖 scikit-learn 计算余弦相似度。
+
+    存储格式：
+    - 基础文件 ``db_path``: 全量的 items 与 embedding_matrix。
+    - 增量目录 ``db_path + ".deltas"``: 每次 update_index 追加一个只包含变更项的段文件。
+    读取时按顺序合并 基础文件 + 所有增量段 (同 id 以后写入者为准)，
+    增量段数量达到阈值时自动压缩回基础文件。所有写入均为 临时文件 + os.replace。
+
+    量化 (quantization="float16" / "int8")：
+    基础文件中只保存量化后的向量，精确的 float32 向量写入 sidecar ``.npy`` 文件并以
+    内存映射方式打开。搜索时先在量化矩阵上扫描出候选，再读取候选行做精确重排。
     """
 
     def __init__(
@@ -27,6 +134,9 @@ class PickleVectorStore(BaseVectorStore):
         db_path: str = "./data/vector_store/item_vector_store.pkl",
         model_name: str = "all-MiniLM-L6-v2",
         provider: str = "local",
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        quantization: str = "none",
+        rerank_factor: int = DEFAULT_RERANK_FACTOR,
     ):
         """
         初始化向量存储。
@@ -35,12 +145,269 @@ class PickleVectorStore(BaseVectorStore):
             db_path: 向量数据库文件保存路径 (.pkl)
             model_name: 使用的 embedding 模型名称
             provider: 模型提供商 ("local" 或 "openai")
+            compact_threshold: 增量段数量达到该值时触发压缩
+            quantization: 基础文件的向量存储方式 ("none", "float16", "int8")，
+                只影响写入；读取时根据文件内容自动识别
+            rerank_factor: 量化搜索时每个结果保留的候选数量倍数
         """
         super().__init__(model_name=model_name, provider=provider)
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Invalid quantization '{quantization}'. Supported: {', '.join(QUANTIZATION_MODES)}"
+            )
         self.db_path = db_path
+        self.delta_dir = f"{db_path}.deltas"
+        self.lock_path = f"{db_path}.lock"
+        self.compact_threshold = compact_threshold
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
 
     # _init_model is inherited, but we verify it works as intended.
 
+    # --- Segment helpers ---
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        基础文件的排他写锁 (fcntl.flock)，跨进程生效。
+        压缩与全量重建都在锁内进行，保证同一时刻只有一个写入者替换基础文件
+        和 sidecar；追加增量段不需要加锁。
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _list_deltas(self) -> List[str]:
+        """按写入顺序返回所有增量段文件路径 (文件名以递增序号开头，可直接排序)。"""
+        return sorted(glob.glob(os.path.join(self.delta_dir, "*.pkl")))
+
+    def _list_sidecars(self) -> List[str]:
+        """返回所有精确向量 sidecar 文件路径。"""
+        return glob.glob(f"{glob.escape(self.db_path)}.*.f32.npy")
+
+    def _write_delta(
+        self,
+        items: List[Dict],
+        embedding_matrix: Optional[np.ndarray],
+        deleted_ids: Optional[List[str]] = None,
+    ) -> str:
+        """写入一个新的增量段，只包含本次变更的物品和删除标记 (tombstone)。"""
+        name = f"{_next_segment_seq():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.pkl"
+        path = os.path.join(self.delta_dir, name)
+        _atomic_pickle_dump(
+            {
+                "items": items,
+                "embedding_matrix": embedding_matrix,
+                "deleted_ids": deleted_ids or [],
+            },
+            path,
+        )
+        return path
+
+    def _write_base(
+        self,
+        items: List[Dict],
+        matrix: Optional[np.ndarray],
+        quantization: Optional[str] = None,
+    ):
+        """
+        原子写入基础文件。量化模式下先写入新的 sidecar，再替换基础文件，
+        最后删除不再被引用的旧 sidecar。
+
+        Args:
+            quantization: 本次写入的存储方式，默认使用 self.quantization
+        """
+        mode = quantization or self.quantization
+        data: Dict[str, Any] = {"items": items}
+        if matrix is None or mode == "none":
+            data["embedding_matrix"] = matrix
+        else:
+            exact = np.ascontiguousarray(matrix, dtype=np.float32)
+            sidecar = f"{self.db_path}.{uuid.uuid4().hex[:12]}.f32.npy"
+            _atomic_write(sidecar, lambda f: np.save(f, exact))
+            data["embedding_matrix"] = None
+            data["quantized"] = quantize(exact, mode)
+            data["exact_path"] = os.path.basename(sidecar)
+
+        _atomic_pickle_dump(data, self.db_path)
+
+        current = data.get("exact_path")
+        for path in self._list_sidecars():
+            if os.path.basename(path) != current:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _read_segment(path: str) -> Optional[Dict[str, Any]]:
+        """读取单个段文件。文件在读取前被压缩删除时返回 None。"""
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _read_base(
+        self,
+    ) -> Tuple[bool, List[Dict], Optional[np.ndarray], Optional[Dict[str, Any]]]:
+        """
+        读取基础文件。
+
+        Returns:
+            (是否读取成功, items, 精确向量, 量化向量)
+            sidecar 在读取前被并发写入替换时返回 False，由调用方重试。
+        """
+        if not os.path.exists(self.db_path):
+            return True, [], None, None
+        base = self._read_segment(self.db_path)
+        if base is None:
+            return True, [], None, None
+
+        items_raw = base.get("items", [])
+        items: List[Dict] = list(items_raw) if isinstance(items_raw, list) else []
+
+        exact_name = base.get("exact_path")
+        if not exact_name:
+            return True, items, base.get("embedding_matrix"), None
+
+        exact_path = os.path.join(os.path.dirname(self.db_path), exact_name)
+        try:
+            # 内存映射：重排时只会读入候选行对应的页
+            exact = np.load(exact_path, mmap_mode="r")
+        except FileNotFoundError:
+            return False, [], None, None
+        return True, items, exact, base.get("quantized")
+
+    def _load_index(self) -> _IndexSnapshot:
+        """
+        加载并合并 基础文件 + 增量段。
+
+        合并是幂等的 (同 id 后者覆盖前者，删除标记只作用于已出现的 id)，
+        因此即使压缩与读取并发发生、同一批变更既出现在新基础文件中又出现在
+        尚未删除的增量段里，结果也一致。
+
+        Raises:
+            RuntimeError: 重试后仍无法读取基础文件 (sidecar 缺失)。此时不能返回
+                只含增量段的快照，否则压缩会把它当作完整索引写回。
+        """
+        base_ok = False
+        items: List[Dict] = []
+        base_exact: Optional[np.ndarray] = None
+        base_quantized: Optional[Dict[str, Any]] = None
+        deltas: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        for _ in range(3):
+            # 先列出增量段再读基础文件：若期间发生压缩导致某个增量段或 sidecar 消失，
+            # 说明基础文件已更新，重新加载一次即可得到一致的快照。
+            delta_paths = self._list_deltas()
+            base_ok, items, base_exact, base_quantized = self._read_base()
+            deltas = [(p, self._read_segment(p)) for p in delta_paths]
+            if base_ok and all(delta is not None for _, delta in deltas):
+                break
+        if not base_ok:
+            raise RuntimeError(f"Could not read the base index at {self.db_path}")
+
+        id_to_index = {item["id"]: i for i, item in enumerate(items)}
+        alive = [True] * len(items)
+        appended_vecs: List[Any] = []
+        merged_deltas: List[str] = []
+
+        for delta_path, delta in deltas:
+            if delta is None:
+                # 已被并发的压缩合并进基础文件
+                continue
+            merged_deltas.append(delta_path)
+
+            delta_matrix = delta.get("embedding_matrix")
+            for i, item in enumerate(delta.get("items", [])):
+                idx = id_to_index.get(item["id"])
+                if idx is not None:
+                    # 旧行失效，新版本作为追加行 (基础文件可能是只读的内存映射/量化矩阵)
+                    alive[idx] = False
+                id_to_index[item["id"]] = len(items)
+                items.append(item)
+                alive.append(True)
+                appended_vecs.append(delta_matrix[i])
+
+            for deleted_id in delta.get("deleted_ids", []):
+                idx = id_to_index.get(deleted_id)
+                if idx is not None:
+                    alive[idx] = False
+
+        return _IndexSnapshot(
+            items=items,
+            alive=np.array(alive, dtype=bool),
+            base_exact=base_exact,
+            base_quantized=base_quantized,
+            delta_matrix=(
+                np.asarray(appended_vecs, dtype=np.float32) if appended_vecs else None
+            ),
+            merged_deltas=merged_deltas,
+        )
+
+    def compact(self):
+        """
+        压缩：将所有增量段合并写回基础文件，再删除已合并的增量段。
+        被标记删除或覆盖的行在此时被物理移除。
+        基础文件通过 os.replace 原子替换，压缩期间的搜索不受影响。
+        基础文件沿用其构建时的量化方式 (与执行压缩的 store 的 quantization 无关)。
+
+        整个过程持有写锁，并在锁内重新列出增量段：并发的压缩者串行执行，
+        后来者只会看到前者留下的增量段，不会用过期的快照覆盖基础文件。
+        """
+        with self._write_lock():
+            self._compact_locked()
+
+    def _compact_locked(self):
+        snapshot = self._load_index()
+        if not snapshot.merged_deltas:
+            return
+
+        if snapshot.base_quantized is not None:
+            mode = snapshot.base_quantized["mode"]
+        elif snapshot.base_exact is not None:
+            mode = "none"
+        else:
+            # 还没有基础文件 (或基础文件为空)：使用本 store 的设置
+            mode = self.quantization
+
+        alive = snapshot.alive
+        items = [item for item, keep in zip(snapshot.items, alive) if keep]
+        matrix = snapshot.exact_matrix()
+        if matrix is not None:
+            matrix = matrix[alive]
+
+        self._write_base(items, matrix, quantization=mode)
+
+        # 按写入顺序删除，保证残留的增量段始终是一个后缀，合并结果不变
+        for delta_path in snapshot.merged_deltas:
+            try:
+                os.remove(delta_path)
+            except FileNotFoundError:
+                pass
+
+        print(
+            f"Compacted {len(snapshot.merged_deltas)} delta segments into {self.db_path}. "
+            f"Total items: {len(items)}"
+        )
+
+    def _clear_deltas(self, delta_paths: List[str]):
+        """删除给定的增量段 (全量重建后调用)。"""
+        for delta_path in delta_paths:
+            try:
+                os.remove(delta_path)
+            except FileNotFoundError:
+                pass
+
+    # --- Public API ---
+
     def build_index(self, item_data_dir: str = "./data/item"):
         """
         构建索引并保存。
@@ -52,6 +419,9 @@ class PickleVectorStore(BaseVectorStore):
         self._init_model()
         assert self.embedding_model is not None
 
+        # 重建开始前已存在的增量段会被新的基础文件取代；之后写入的保留
+        stale_deltas = self._list_deltas()
+
         # 加载所有数据
         items = load_items_from_dir(item_data_dir)
         if not items:
@@ -63,24 +433,21 @@ class PickleVectorStore(BaseVectorStore):
         # 提取文本并生成向量
         texts = [item["text"] for item in items]
         embeddings = self.embedding_model.embed_documents(texts)
-        embedding_matrix = np.array(embeddings)
+        embedding_matrix = np.asarray(embeddings, dtype=np.float32)
 
-        # 准备保存的数据结构
-        data = {"items": items, "embedding_matrix": embedding_matrix}
+        # 原子写入基础文件，随后旧的增量段已失效
+        with self._write_lock():
+            self._write_base(items, embedding_matrix)
+            self._clear_deltas(stale_deltas)
 
-        # 确保存储目录存在
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-
-        # 序列化保存到文件
-        with open(self.db_path, "wb") as f:
-            pickle.dump(data, f)
-
-        print(f"Save        to {self.db_path}")
+        print(f"Saved index to {self.db_path} (quantization: {self.quantization})")
 
     def search(self, query: str, k: int = 3) -> List[Dict]:
         """
         搜索物品。
         计算查询文本与库中所有物品的余弦相似度，返回前 k 个最相似的物品。
+        基础文件为量化存储时，先在量化矩阵上取出 k * rerank_factor 个候选，
+        再用精确的 float32 向量对候选重排。
 
         Args:
             query: 查询文本
@@ -89,7 +456,7 @@ class PickleVectorStore(BaseVectorStore):
         Returns:
             包含物品信息和相似度分数的列表
         """
-        if not os.path.exists(self.db_path):
+        if not os.path.exists(self.db_path) and not self._list_deltas():
             print(f"Index not found at {self.db_path}. Please build it first.")
             return []
 
@@ -101,37 +468,95 @@ class PickleVectorStore(BaseVectorStore):
         self._init_model()
         assert self.embedding_model is not None
 
-        # 加载索引
-        with open(self.db_path, "rb") as f:
-            data = pickle.load(f)
-
-        items = data["items"]
-        matrix = data["embedding_matrix"]
+        # 加载索引 (基础文件 + 增量段)
+        snapshot = self._load_index()
+        alive = snapshot.alive
+        k = min(k, int(alive.sum()))
+        if k <= 0:
+            return []
 
         # 生成查询向量
         query_vec_list = self.embedding_model.embed_query(query)
         # 转换为 numpy 数组并调整形状 (1, dimension)
-        query_vec = np.array(query_vec_list).reshape(1, -1)
+        query_vec = np.asarray(query_vec_list, dtype=np.float32).reshape(1, -1)
+
+        if snapshot.base_quantized is None:
+            # 精确扫描 Exact scan
+            matrix = snapshot.exact_matrix()
+            assert matrix is not None
+            candidates = np.arange(len(snapshot.items))
+            scores = cosine_similarity(query_vec, matrix)[0]
+        else:
+            candidates = self._quantized_candidates(snapshot, query_vec, k)
+            scores = self._rerank(snapshot, query_vec, candidates)
 
-        # 计算相似度
-        scores = cosine_similarity(query_vec, matrix)[0]
+        # 屏蔽已删除的行 Mask out tombstoned rows
+        scores = np.where(alive[candidates], scores, -np.inf)
         # 获取前 k 个最高分的索引 (::-1 用于逆序，从高到低)
-        top_indices = scores.argsort()[-k:][::-1]
+        top = scores.argsort()[-k:][::-1]
 
         results = []
-        for idx in top_indices:
-            score = scores[idx]
-            item = items[idx]
+        for pos in top:
+            idx = candidates[pos]
+            item = snapshot.items[idx]
             results.append(
-                {"score": float(score), **item}  # 展开 item，包含 id, text, metadata
+                {
+                    "score": float(scores[pos]),
+                    **item,
+                }  # 展开 item，包含 id, text, metadata
             )
 
         return results
 
+    def _quantized_candidates(
+        self, snapshot: _IndexSnapshot, query_vec: np.ndarray, k: int
+    ) -> np.ndarray:
+        """第一阶段：在量化矩阵上近似扫描，返回候选行号 (含全部增量行)。"""
+        assert snapshot.base_quantized is not None
+        base_size = snapshot.base_size
+
+        approx = approximate_scores(
+            normalize_rows(query_vec)[0], snapshot.base_quantized
+        )
+        approx[~snapshot.alive[:base_size]] = -np.inf
+
+        n_candidates = min(base_size, k * self.rerank_factor)
+        if n_candidates < base_size:
+            base_candidates = np.argpartition(approx, -n_candidates)[-n_candidates:]
+        else:
+            base_candidates = np.arange(base_size)
+
+        # 增量行数量很少，直接全部参与精确重排
+        delta_rows = np.arange(base_size, len(snapshot.items))
+        return np.concatenate([np.sort(base_candidates), delta_rows])
+
+    @staticmethod
+    def _rerank(
+        snapshot: _IndexSnapshot, query_vec: np.ndarray, candidates: np.ndarray
+    ) -> np.ndarray:
+        """第二阶段：只读取候选行的精确 float32 向量计算余弦相似度。"""
+        assert cosine_similarity is not None
+        base_size = snapshot.base_size
+        base_rows = candidates[candidates < base_size]
+        delta_rows = candidates[candidates >= base_size] - base_size
+
+        parts = []
+        if len(base_rows):
+            assert snapshot.base_exact is not None
+            parts.append(np.asarray(snapshot.base_exact[base_rows], dtype=np.float32))
+        if len(delta_rows):
+            assert snapshot.delta_matrix is not None
+            parts.append(snapshot.delta_matrix[delta_rows])
+        if not parts:
+            return np.empty(0, dtype=np.float32)
+
+        return cosine_similarity(query_vec, np.vstack(parts))[0]
+
     def update_index(self, file_paths: List[str]):
         """
         增量更新索引。
-        仅重新计算新文件或修改文件的 embedding，避免全量重建。
+        仅为新文件或修改文件计算 embedding，并写入一个新的增量段，
+        不读取也不重写基础文件，开销只与变更项数量相关。
 
         Args:
             file_paths: 需要更新的文件路径列表
@@ -142,108 +567,53 @@ class PickleVectorStore(BaseVectorStore):
         self._init_model()
         assert self.embedding_model is not None
 
-        # 加载现有索引 Load existing index
-        if os.path.exists(self.db_path):
-            with open(self.db_path, "rb") as f:
-                data = pickle.load(f)
-            # Explicitly cast items to list of dicts for mypy
-            items_raw = data.get("items", [])
-            if isinstance(items_raw, list):
-                items: List[Dict] = items_raw
-            else:
-                items = []
-
-            embedding_matrix = data.get("embedding_matrix")
-        else:
-            items = []
-            embedding_matrix = None
-
-        # 建立 ID 到索引的映射，方便快速查找
-        # Helper to find index by item id
-        id_to_index = {item["id"]: i for i, item in enumerate(items)}
-
-        new_items_data: List[Dict[str, Any]] = (
-            []
-        )  # List of tuples (target_index, item_data)
-
-        # 2. 处理输入文件 Process input files
-        processed_count = 0
+        # 1. 处理输入文件 Process input files (同一 id 只保留最后一次)
+        changed: Dict[str, Dict] = {}
         for file_path in file_paths:
             item_dict = load_item_from_file(file_path)
-            if not item_dict:
-                continue
-
-            item_id = item_dict["id"]
-            target_idx = id_to_index.get(item_id, -1)
-            # 记录是否已存在及其位置，如果不存在 target_idx 为 -1
-            new_items_data.append({"target_index": target_idx, "item": item_dict})
-            processed_count += 1
+            if item_dict:
+                changed[item_dict["id"]] = item_dict
 
-        if not new_items_data:
+        if not changed:
             print("No valid items found to update.")
             return
 
-        # 3. 生成新数据的 Embeddings
-        texts_to_embed = [x["item"]["text"] for x in new_items_data]
+        # 2. 生成新数据的 Embeddings
+        new_items = list(changed.values())
+        texts_to_embed = [item["text"] for item in new_items]
 
         print(
             f"Generating embeddings for {len(texts_to_embed)} items (Incremental update)..."
         )
-        # 批量生成向量
         embeddings = self.embedding_model.embed_documents(texts_to_embed)
-        new_embeddings_matrix = np.array(embeddings)
-
-        # 4. 更新内部状态 Update internal state
 
-        # 如果已有矩阵，则需要合并更新
-        if embedding_matrix is not None:
-
-            # 分离出“更新现有项”和“追加新项”
-            updates: List[Tuple[int, Dict, Any]] = []
-            appends: List[Tuple[Dict, Any]] = []
-
-            for i, data in enumerate(new_items_data):
-                target_idx = data["target_index"]
-                vec = new_embeddings_matrix[i]
-                item = data["item"]
-
-                if target_idx >= 0:
-                    updates.append((target_idx, item, vec))
-                else:
-                    appends.append((item, vec))
-
-            # Ensure items is typed as List[Dict] if inferred as List[Object]
-            items_typed: List[Dict] = cast(List[Dict], items)
-
-            # 应用更新 (替换旧值)
-            for idx, item, vec in updates:
-                if 0 <= idx < len(items_typed):
-                    items_typed[idx] = item
-                    embedding_matrix[idx] = vec
+        # 3. 写入增量段 Append delta segment
+        delta_path = self._write_delta(
+            new_items, np.asarray(embeddings, dtype=np.float32)
+        )
+        print(f"Wrote delta segment {delta_path} ({len(new_items)} items).")
 
-            # 应用追加 (添加到末尾)
-            if appends:
-                new_items_list = [x[0] for x in appends]
-                new_vecs_list = [x[1] for x in appends]
-                items_typed.extend(new_items_list)
-                # 使用 vstack 堆叠矩阵
-                embedding_matrix = np.vstack(
-                    [embedding_matrix, np.array(new_vecs_list)]
-                )
+        # 4. 周期性压缩 Periodic compaction
+        if len(self._list_deltas()) >= self.compact_threshold:
+            self.compact()
 
-            # Reassign back to items (though list is mutable so items_typed modification affects items)
-            items = items_typed
+    def delete_ids(self, ids: List[str]):
+        """
+        删除指定 id 的物品。
+        只写入一个带删除标记 (tombstone) 的增量段，不需要生成 embedding；
+        被删除的行在搜索时被屏蔽，并在下一次压缩时被物理移除。
 
-        else:
-            # 如果是全新数据库
-            items = [x["item"] for x in new_items_data]
-            embedding_matrix = new_embeddings_matrix
+        Args:
+            ids: 需要删除的物品 id 列表
+        """
+        if not ids:
+            return
 
-        # 5. 保存 Save
-        data = {"items": items, "embedding_matrix": embedding_matrix}
+        if not os.path.exists(self.db_path) and not self._list_deltas():
+            return
 
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with open(self.db_path, "wb") as f:
-            pickle.dump(data, f)
+        delta_path = self._write_delta([], None, deleted_ids=list(ids))
+        print(f"Wrote tombstone segment {delta_path} ({len(ids)} ids).")
 
-        print(f"Updated index at {self.db_path}. Total items: {len(items)}")
+        if len(self._list_deltas()) >= self.compact_threshold:
+            self.compact()
@@ -13,10 +13,15 @@ export function useGameEngine() {
   const [diceAnimation, setDiceAnimation] = useState<DiceRoll | null>(null);
 
   const isInitialized = useRef(false);
+  // Server-side session version; while known, the server holds the game state
+  const stateVersionRef = useRef<number | null>(null);
   const isAnimating = useRef(false);
 
   // Queue system
   const pendingQueueRef = useRef<StreamChunk[]>([]);
+  // Pacing: the queue is held until this time (from chunk.min_display_ms)
+  const holdUntilRef = useRef<number>(0);
+  const holdTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   // Logic/Dice Lock system
   const pendingDiceRef = useRef<DiceRoll | null>(null);
   const lastLogicMsgIdRef = useRef<number | null>(null);
@@ -228,6 +233,11 @@ export function useGameEngine() {
         });
         tryProcessQueue();
         break;
+
+      case StreamChunkType.SESSION:
+        // Only queued with resync: the turn shown so far was not saved
+        resyncSession().finally(tryProcessQueue);
+        break;
     }
   };
 
@@ -241,6 +251,18 @@ export function useGameEngine() {
       
       const queue = pendingQueueRef.current;
       if (queue.length === 0) return;
+
+      // Pacing Hold: the previous chunk asked to stay on screen a while
+      const remaining = holdUntilRef.current - Date.now();
+      if (remaining > 0) {
+          if (!holdTimerRef.current) {
+              holdTimerRef.current = setTimeout(() => {
+                  holdTimerRef.current = null;
+                  tryProcessQueue();
+              }, remaining);
+          }
+          return;
+      }
       
       let nextChunkIndex = 0;
 
@@ -259,7 +281,10 @@ export function useGameEngine() {
       const nextChunk = queue[nextChunkIndex];
       // Remove from the found position
       queue.splice(nextChunkIndex, 1);
-      
+
+      if (nextChunk.min_display_ms) {
+          holdUntilRef.current = Date.now() + nextChunk.min_display_ms;
+      }
       handleChunkLive(nextChunk);
   };
 
@@ -268,6 +293,13 @@ export function useGameEngine() {
    * Handles "patching" logic for updates (Suggestions, late LogicEvents) to avoid visual popping.
    */
   const enqueueChunk = async (chunk: StreamChunk) => {
+    // Session metadata is not displayed
+    if (chunk.type === StreamChunkType.SESSION) {
+        stateVersionRef.current = chunk.version;
+        // A resync waits for the turn's chunks, so the server state lands last
+        if (!chunk.resync) return;
+    }
+
     // Patching logic for late updates targetting the previous message
     if (chunk.type === StreamChunkType.LOGIC_EVENT || chunk.type === StreamChunkType.SUGGESTIONS) {
         const queue = pendingQueueRef.current;
@@ -281,6 +313,10 @@ export function useGameEngine() {
                     } else {
                         target.options = chunk.options;
                     }
+                    // Keep the patch's pacing hint on the message it joins
+                    if (chunk.min_display_ms) {
+                        target.min_display_ms = Math.max(target.min_display_ms || 0, chunk.min_display_ms);
+                    }
                     return; // Handled in place
                 }
             }
@@ -296,6 +332,24 @@ export function useGameEngine() {
   // 5. Network Layer
   // ==========================================
 
+  /** Adopts the server's session after a turn the server could not save. */
+  const resyncSession = async () => {
+      try {
+          const response = await fetch(`/api/session/${encodeURIComponent(sessionId)}`);
+          if (!response.ok) {
+              // Unknown (expired) session: the next request reseeds it
+              stateVersionRef.current = null;
+              return;
+          }
+          const session = await response.json();
+          stateVersionRef.current = session.version;
+          if (session.state) setGameState(session.state);
+      } catch (error) {
+          console.error("Session resync failed:", error);
+          stateVersionRef.current = null;
+      }
+  };
+
   const streamRequest = async (
       payload: Record<string, unknown>, 
       onSuccess?: () => void, 
@@ -309,6 +363,15 @@ export function useGameEngine() {
             body: JSON.stringify(payload)
         });
         
+        if (response.status === 409 && payload.state_version !== undefined) {
+            // Our session version is stale (or expired): reseed it with our state
+            stateVersionRef.current = null;
+            return streamRequest(
+                { ...payload, state_version: undefined, current_state: gameState },
+                onSuccess,
+                onError
+            );
+        }
         if (!response.ok) throw new Error('Network response was not ok');
 
         const reader = response.body?.getReader();
@@ -355,11 +418,14 @@ export function useGameEngine() {
       
       if (!gameState) return;
 
+      // With a session version the server already has the state: send input only
+      const version = stateVersionRef.current;
       streamRequest({
           event: { type: eventType, ...eventData },
           player_input: text,
           session_id: sessionId,
-          current_state: gameState
+          state_version: version ?? undefined,
+          current_state: version === null ? gameState : undefined
       }, undefined, () => {
          setMessages(prev => [...prev, { id: generateMsgId(), sender: 'system', text: "错误：与后端的连接已丢失。" }]);
       });
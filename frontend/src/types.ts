@@ -81,6 +81,7 @@ export const StreamChunkType = {
   LOGIC_EVENT: 'logic_event',
   INIT: 'init',
   SETTLEMENT: 'settlement',
+  SESSION: 'session',
 } as const;
 
 export type StreamChunkType = typeof StreamChunkType[keyof typeof StreamChunkType];
@@ -93,7 +94,16 @@ export interface SettlementDelta {
     level_transition?: string;
 }
 
-export interface StreamChunkSettlement {
+/**
+ * Pacing hints carried by every stream chunk. The server sends chunks as soon
+ * as they are ready; the client decides when to display them.
+ */
+export interface ChunkPacing {
+  ts?: number;              // server emit time (ms since epoch)
+  min_display_ms?: number;  // hold the queue this long after applying the chunk
+}
+
+export interface StreamChunkSettlement extends ChunkPacing {
     type: typeof StreamChunkType.SETTLEMENT;
     delta: SettlementDelta;
 }
@@ -113,7 +123,7 @@ export interface LogicEvent {
   outcomes: EventOutcome[];
 }
 
-export interface StreamChunkMessage {
+export interface StreamChunkMessage extends ChunkPacing {
   type: typeof StreamChunkType.MESSAGE;
   text: string;
   sender: 'dm' | 'system';
@@ -121,31 +131,37 @@ export interface StreamChunkMessage {
   options?: string[];
 }
 
-export interface StreamChunkInit {
+export interface StreamChunkInit extends ChunkPacing {
   type: typeof StreamChunkType.INIT;
   text: string;
 }
 
-export interface StreamChunkDice {
+export interface StreamChunkDice extends ChunkPacing {
   type: typeof StreamChunkType.DICE_ROLL;
   dice: DiceRoll;
 }
 
-export interface StreamChunkState {
+export interface StreamChunkState extends ChunkPacing {
   type: typeof StreamChunkType.STATE;
   state: GameState;
 }
 
-export interface StreamChunkSuggestions {
+export interface StreamChunkSuggestions extends ChunkPacing {
   type: typeof StreamChunkType.SUGGESTIONS;
   options: string[];
 }
 
-export interface StreamChunkLogicEvent {
+export interface StreamChunkLogicEvent extends ChunkPacing {
   type: typeof StreamChunkType.LOGIC_EVENT;
   event: LogicEvent;
 }
 
+export interface StreamChunkSession extends ChunkPacing {
+  type: typeof StreamChunkType.SESSION;
+  version: number;  // send back as state_version on the next request
+  resync?: boolean;  // turn not saved: reload GET /api/session/{session_id}
+}
+
 
 export type StreamChunk = 
   | StreamChunkMessage 
@@ -154,7 +170,8 @@ export type StreamChunk =
   | StreamChunkSuggestions
   | StreamChunkLogicEvent
   | StreamChunkInit
-  | StreamChunkSettlement;
+  | StreamChunkSettlement
+  | StreamChunkSession;
 
 export interface ChatResponse {
   messages: BackendMessage[];
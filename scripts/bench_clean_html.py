@@ -0,0 +1,81 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.tools.wiki import parse
+from backroom_agent.utils.common import get_project_root
+
+
+def _time_per_page(func, raw_html: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(raw_html)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_clean_html(raw_dir: str, repeat: int = 5):
+    """
+    Benchmarks clean_html_content on data/raw: BeautifulSoup reference vs
+    lxml fast path, per page (ms) and in total. Also checks the outputs match.
+    """
+    if parse.etree is None:
+        print("lxml is not installed; only the bs4 implementation is available.")
+        return
+
+    files = sorted(glob.glob(os.path.join(raw_dir, "*.html")))
+    if not files:
+        print(f"No raw pages found in {raw_dir}")
+        return
+
+    total_bs4 = total_lxml = 0.0
+    mismatches = []
+    print(f"{'page':<40} {'KB':>7} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            raw_html = f.read()
+        name = os.path.basename(path)
+
+        if parse._clean_html_content_lxml(raw_html) != parse._clean_html_content_bs4(
+            raw_html
+        ):
+            mismatches.append(name)
+
+        bs4_ms = _time_per_page(parse._clean_html_content_bs4, raw_html, repeat)
+        lxml_ms = _time_per_page(parse.clean_html_content, raw_html, repeat)
+        total_bs4 += bs4_ms
+        total_lxml += lxml_ms
+        print(
+            f"{name:<40} {len(raw_html) / 1024:>7.1f} {bs4_ms:>9.2f} "
+            f"{lxml_ms:>9.2f} {bs4_ms / lxml_ms:>7.1f}x"
+        )
+
+    count = len(files)
+    print("-" * 77)
+    print(
+        f"{'mean':<40} {'':>7} {total_bs4 / count:>9.2f} "
+        f"{total_lxml / count:>9.2f} {total_bs4 / total_lxml:>7.1f}x"
+    )
+    if mismatches:
+        print(f"Output mismatch on {len(mismatches)} page(s): {', '.join(mismatches)}")
+    else:
+        print(f"Output identical on all {count} pages.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--raw-dir",
+        default=os.path.join(get_project_root(), "data/raw"),
+        help="Directory of raw wiki pages",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per page (averaged)"
+    )
+    args = parser.parse_args()
+
+    bench_clean_html(args.raw_dir, repeat=args.repeat)
@@ -0,0 +1,144 @@
+import argparse
+import contextvars
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from backroom_agent.subagents.level import manifest, nodes_llm
+from backroom_agent.utils.common import get_project_root
+
+_usage_var: contextvars.ContextVar = contextvars.ContextVar(
+    "bench_usage_callback", default=None
+)
+register_configure_hook(_usage_var, inheritable=True)
+
+
+class _CountingUsageHandler(UsageMetadataCallbackHandler):
+    """Sums token usage per model and counts LLM calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def on_llm_end(self, response, **kwargs):
+        self.calls += 1
+        super().on_llm_end(response, **kwargs)
+
+
+def _run_fanout(state: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_json, then extract_items / extract_entities in parallel (as in the graph)."""
+    result = dict(nodes_llm.generate_json_node(dict(state)))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, node, dict(state))
+            for node in (nodes_llm.extract_items_node, nodes_llm.extract_entities_node)
+        ]
+        for future in futures:
+            result.update(future.result())
+    return result
+
+
+def _run_combined(state: Dict[str, Any]) -> Dict[str, Any]:
+    return nodes_llm.extract_combined_node(dict(state))
+
+
+def _measure(run: Callable, state: Dict[str, Any]) -> Dict[str, Any]:
+    handler = _CountingUsageHandler()
+    token = _usage_var.set(handler)
+    try:
+        started = time.perf_counter()
+        result = run(state)
+        elapsed = time.perf_counter() - started
+    finally:
+        _usage_var.reset(token)
+
+    usage = handler.usage_metadata.values()
+    return {
+        "calls": handler.calls,
+        "input_tokens": sum(u.get("input_tokens", 0) for u in usage),
+        "output_tokens": sum(u.get("output_tokens", 0) for u in usage),
+        "seconds": elapsed,
+        "items": len(result.get("extracted_items_raw", [])),
+        "entities": len(result.get("extracted_entities_raw", [])),
+    }
+
+
+def bench_level_extraction(levels: List[str], modes: List[str]):
+    """
+    Runs each extraction mode on data/level/{level}.html with the configured
+    LLM and prints LLM calls, input/output tokens and wall time per level.
+
+    Outputs and manifests go to a scratch project root, so data/level is left
+    untouched and cached artifacts never short-circuit the LLM calls.
+    """
+    runners = {"fanout": _run_fanout, "combined": _run_combined}
+    level_dir = os.path.join(get_project_root(), "data/level")
+    totals = {
+        mode: {"input_tokens": 0, "output_tokens": 0, "seconds": 0.0} for mode in modes
+    }
+
+    header = f"{'level':<12} {'mode':<9} {'calls':>5} {'in tok':>8} {'out tok':>8} {'sec':>7} {'items':>6} {'ents':>5}"
+    print(header)
+    print("-" * len(header))
+    for level in levels:
+        with open(os.path.join(level_dir, f"{level}.html"), "r", encoding="utf-8") as f:
+            html_content = f.read()
+        state = {
+            "level_name": level,
+            "html_content": html_content,
+            "force_update": True,
+            "logs": [],
+        }
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as scratch, mock.patch.object(
+                nodes_llm, "get_project_root", return_value=scratch
+            ), mock.patch.object(manifest, "get_project_root", return_value=scratch):
+                stats = _measure(runners[mode], state)
+            for key in totals[mode]:
+                totals[mode][key] += stats[key]
+            print(
+                f"{level:<12} {mode:<9} {stats['calls']:>5} {stats['input_tokens']:>8} "
+                f"{stats['output_tokens']:>8} {stats['seconds']:>7.1f} "
+                f"{stats['items']:>6} {stats['entities']:>5}"
+            )
+
+    print("\n--- Totals ---")
+    for mode, total in totals.items():
+        print(
+            f"{mode:<9} in={total['input_tokens']} out={total['output_tokens']} "
+            f"time={total['seconds']:.1f}s"
+        )
+    if len(modes) == 2 and totals["fanout"]["input_tokens"]:
+        fanout, combined = totals["fanout"], totals["combined"]
+        print(
+            f"combined/fanout: input tokens {combined['input_tokens'] / fanout['input_tokens']:.2f}x, "
+            f"wall time {combined['seconds'] / max(fanout['seconds'], 1e-9):.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark fan-out vs combined level extraction (uses the configured LLM)"
+    )
+    parser.add_argument(
+        "levels", nargs="+", help="Levels with a cleaned page, e.g. level-0 level-1"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["fanout", "combined"],
+        choices=["fanout", "combined"],
+    )
+    args = parser.parse_args()
+
+    bench_level_extraction(args.levels, args.modes)
@@ -9,7 +9,10 @@ import requests
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from backroom_agent.subagents.level.nodes.fetch import WIKI_MIRRORS
+from backroom_agent.tools.wiki.url_cache import get_url_cache
 from backroom_agent.tools.wiki_tools import fetch_wiki_content
+from backroom_agent.utils.common import get_project_root
 from backroom_agent.utils.search import search_backrooms_wiki
 
 
@@ -26,9 +29,21 @@ def resolve_level_url(level_name):
             "Heuristic (Regex)",
         )
 
-    # 2. Search Fallback
+    # 2. URL cache (shared with the level agent)
+    cache = get_url_cache()
+    cached = cache.lookup(normalized_name)
+    if cached is not None:
+        if cached["url"]:
+            return cached["url"], f"Cache ({cached['source']})"
+        return (
+            f"https://backrooms-wiki-cn.wikidot.com/{normalized_name}",
+            "Fallback (Cached miss)",
+        )
+
+    # 3. Search Fallback
     try:
         found_url = search_backrooms_wiki(level_name)
+        cache.store(normalized_name, found_url, source="search")
         if found_url:
             return found_url, "Search Found"
     except Exception:
@@ -41,6 +56,14 @@ def resolve_level_url(level_name):
 
 
 def check_level_urls(start, end):
+    # Learn URLs from already-fetched pages first so most names resolve offline
+    learned = get_url_cache().learn_from_level_pages(
+        os.path.join(get_project_root(), "data/level"),
+        base_url=WIKI_MIRRORS[0],
+        allowed_domains=[urlparse(m).netloc for m in WIKI_MIRRORS],
+    )
+    print(f"URL cache: learned {learned} entries from fetched pages\n")
+
     print(
         f"{'Level':<10} | {'Method':<20} | {'Status':<15} | {'Content Len':<12} | {'URL'}"
     )
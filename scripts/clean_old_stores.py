@@ -1,4 +1,5 @@
 import argparse
+import glob
 import os
 import shutil
 
@@ -16,10 +17,19 @@ def clean_stores(backend="pickle"):
         paths_to_remove = [
             os.path.join(vector_store_dir, "item_vector_store.pkl"),
             os.path.join(vector_store_dir, "entity_vector_store.pkl"),
+            # Incremental delta segments
+            os.path.join(vector_store_dir, "item_vector_store.pkl.deltas"),
+            os.path.join(vector_store_dir, "entity_vector_store.pkl.deltas"),
             # Legacy paths
             os.path.join(root, "data/simple_vector_store.pkl"),
             os.path.join(root, "data/entity_vector_store.pkl"),
         ]
+
+        # Exact-vector sidecars written by quantized indices
+        for store_name in ("item_vector_store.pkl", "entity_vector_store.pkl"):
+            paths_to_remove.extend(
+                glob.glob(os.path.join(vector_store_dir, f"{store_name}.*.f32.npy"))
+            )
     elif backend == "chroma":
         # Chroma Directories
         paths_to_remove = [
@@ -1,15 +1,28 @@
+import argparse
 import glob
 import json
 import os
 
 from backroom_agent.utils.analysis import get_all_level_references
 from backroom_agent.utils.common import get_project_root
+from backroom_agent.utils.vector_store import delete_from_vector_db
 
 
-def clean_orphans():
+def _read_id(file_path: str) -> str:
+    """Returns the ID the vector store indexed this file under."""
+    fallback = os.path.splitext(os.path.basename(file_path))[0]
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("id", fallback)
+    except Exception:
+        return fallback
+
+
+def clean_orphans(backend="pickle"):
     root = get_project_root()
     item_root_dir = os.path.join(root, "data/item")
     entity_root_dir = os.path.join(root, "data/entity")
+    vector_store_dir = os.path.join(root, "data/vector_store")
 
     print("Analyzing references to find valid IDs...")
     refs = get_all_level_references()
@@ -22,7 +35,7 @@ def clean_orphans():
 
     # 2. Cleanup Items
     item_files = glob.glob(os.path.join(item_root_dir, "**", "*.json"), recursive=True)
-    deleted_items = 0
+    deleted_item_ids = []
     for file_path in item_files:
         filename = os.path.basename(file_path)
         item_id = os.path.splitext(filename)[0]
@@ -33,30 +46,53 @@ def clean_orphans():
 
         if item_id not in valid_item_ids:
             print(f"Deleting orphan item: {file_path}")
+            deleted_item_ids.append(_read_id(file_path))
             os.remove(file_path)
-            deleted_items += 1
 
     # Cleanup empty directories in item/
     for dirpath, dirnames, files in os.walk(item_root_dir, topdown=False):
         if not files and not dirnames and dirpath != item_root_dir:
             os.rmdir(dirpath)
 
-    print(f"Deleted {deleted_items} orphan item files.")
+    print(f"Deleted {len(deleted_item_ids)} orphan item files.")
 
     # 3. Cleanup Entities
     entity_files = glob.glob(os.path.join(entity_root_dir, "*.json"))
-    deleted_entities = 0
+    deleted_entity_ids = []
     for file_path in entity_files:
         filename = os.path.basename(file_path)
         entity_id = os.path.splitext(filename)[0]
 
         if entity_id not in valid_entity_ids:
             print(f"Deleting orphan entity: {file_path}")
+            deleted_entity_ids.append(_read_id(file_path))
             os.remove(file_path)
-            deleted_entities += 1
 
-    print(f"Deleted {deleted_entities} orphan entity files.")
+    print(f"Deleted {len(deleted_entity_ids)} orphan entity files.")
+
+    # 4. Drop orphans from the vector indices (no full rebuild needed)
+    if deleted_item_ids:
+        delete_from_vector_db(
+            deleted_item_ids,
+            db_path=os.path.join(vector_store_dir, "item_vector_store.pkl"),
+            backend=backend,
+        )
+    if deleted_entity_ids:
+        delete_from_vector_db(
+            deleted_entity_ids,
+            db_path=os.path.join(vector_store_dir, "entity_vector_store.pkl"),
+            backend=backend,
+        )
 
 
 if __name__ == "__main__":
-    clean_orphans()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--backend",
+        default="pickle",
+        choices=["pickle", "chroma"],
+        help="Vector store backend to prune",
+    )
+    args = parser.parse_args()
+
+    clean_orphans(backend=args.backend)
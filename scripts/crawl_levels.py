@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.constants import (INGEST_CONCURRENCY,
+                                      INGEST_LLM_CONCURRENCY,
+                                      LEVEL_EXTRACTION_MODE)
+from backroom_agent.subagents.level.crawl import crawl_levels
+from backroom_agent.subagents.level.ingest import default_progress_path
+
+# Configure logging to stdout
+logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Discover connected levels from seed levels and ingest them (most linked first)."
+    )
+    parser.add_argument(
+        "seeds", nargs="*", default=["level-0"], help="Seed levels (default: level-0)"
+    )
+    parser.add_argument(
+        "--max-levels", type=int, default=50, help="Max new levels to ingest"
+    )
+    parser.add_argument(
+        "--max-depth", type=int, default=None, help="Max link hops from the seeds"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Walk local data only and list the levels that would be ingested",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-ingest levels that already have a level JSON",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=INGEST_CONCURRENCY,
+        help="Levels per batch (processed at the same time)",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=INGEST_LLM_CONCURRENCY,
+        help="Concurrent LLM calls shared by all levels",
+    )
+    parser.add_argument(
+        "--progress",
+        default=default_progress_path(),
+        help="Progress file used to resume interrupted runs",
+    )
+    parser.add_argument(
+        "--skip-vectors",
+        action="store_true",
+        help="Do not update the vector indices at the end",
+    )
+    parser.add_argument(
+        "--backend",
+        default="pickle",
+        choices=["pickle", "chroma"],
+        help="Vector store backend to update",
+    )
+    parser.add_argument(
+        "--mode",
+        default=LEVEL_EXTRACTION_MODE,
+        choices=["fanout", "combined"],
+        help="Level extraction: 3 LLM calls (fanout) or 1 structured-output call (combined)",
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        crawl_levels(
+            args.seeds,
+            max_levels=args.max_levels,
+            max_depth=args.max_depth,
+            force=args.force,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+            update_vectors=not args.skip_vectors,
+            llm_concurrency=args.llm_concurrency,
+            progress_path=args.progress,
+            backend=args.backend,
+            mode=args.mode,
+        )
+    )
+
+    label = "Would ingest" if args.dry_run else "Ingested"
+    print(f"\n--- {label} ({len(result['ingested'])}) ---")
+    print(", ".join(result["ingested"]) or "(none)")
+    if result["failed"]:
+        print(f"\n[!] Failed ({len(result['failed'])}): {', '.join(result['failed'])}")
+
+    frontier = result["frontier"]
+    print(f"\n--- Frontier ({len(frontier)} discovered, not yet ingested) ---")
+    for slug, in_degree in frontier[:20]:
+        print(f"{slug:<24} in-degree {in_degree}")
+
+    if result["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.constants import (INGEST_CONCURRENCY,
+                                      INGEST_LLM_CONCURRENCY,
+                                      LEVEL_EXTRACTION_MODE)
+from backroom_agent.subagents.level.ingest import (STATUS_DONE,
+                                                   default_progress_path,
+                                                   ingest_levels)
+
+# Configure logging to stdout
+logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest many levels concurrently with the Level Agent (in-process)."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        help="Level names (e.g., 'level-1') or wiki URLs",
+    )
+    parser.add_argument(
+        "--range",
+        nargs=2,
+        type=int,
+        metavar=("START", "END"),
+        help="Add level-START .. level-END (inclusive) to the targets",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Force regeneration of JSON and re-extraction of items",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=INGEST_CONCURRENCY,
+        help="Levels processed at the same time",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=INGEST_LLM_CONCURRENCY,
+        help="Concurrent LLM calls shared by all levels",
+    )
+    parser.add_argument(
+        "--progress",
+        default=default_progress_path(),
+        help="Progress file used to resume interrupted runs",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore the progress file and process every target again",
+    )
+    parser.add_argument(
+        "--skip-vectors",
+        action="store_true",
+        help="Do not update the vector indices at the end",
+    )
+    parser.add_argument(
+        "--backend",
+        default="pickle",
+        choices=["pickle", "chroma"],
+        help="Vector store backend to update",
+    )
+    parser.add_argument(
+        "--mode",
+        default=LEVEL_EXTRACTION_MODE,
+        choices=["fanout", "combined"],
+        help="Level extraction: 3 LLM calls (fanout) or 1 structured-output call (combined)",
+    )
+    args = parser.parse_args()
+
+    targets = list(args.targets)
+    if args.range:
+        start, end = args.range
+        targets.extend(f"level-{i}" for i in range(start, end + 1))
+    # Keep order, drop duplicates
+    targets = list(dict.fromkeys(targets))
+
+    if not targets:
+        parser.error("No targets given. Pass level names/URLs or --range START END.")
+
+    progress = asyncio.run(
+        ingest_levels(
+            targets,
+            force=args.force,
+            concurrency=args.concurrency,
+            llm_concurrency=args.llm_concurrency,
+            progress_path=args.progress,
+            resume=not args.no_resume,
+            update_vectors=not args.skip_vectors,
+            backend=args.backend,
+            mode=args.mode,
+        )
+    )
+
+    print("\n--- Summary ---")
+    failed = []
+    for target in targets:
+        entry = progress["targets"].get(target, {})
+        status = entry.get("status", "skipped")
+        print(
+            f"{target}: {status}"
+            f" (items={entry.get('items', 0)}, entities={entry.get('entities', 0)})"
+        )
+        if status != STATUS_DONE:
+            failed.append(target)
+
+    if failed:
+        print(f"\n[!] {len(failed)} target(s) failed. Re-run to retry them.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+from urllib.parse import urlparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.subagents.level.nodes.fetch import WIKI_MIRRORS
+from backroom_agent.tools.wiki.url_cache import get_url_cache
+from backroom_agent.utils.common import get_project_root
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill the level name -> URL cache from the links of fetched pages (no network)"
+    )
+    parser.add_argument(
+        "--level-dir",
+        default=os.path.join(get_project_root(), "data/level"),
+        help="Directory with fetched level pages (default: data/level)",
+    )
+    args = parser.parse_args()
+
+    cache = get_url_cache()
+    learned = cache.learn_from_level_pages(
+        args.level_dir,
+        base_url=WIKI_MIRRORS[0],
+        allowed_domains=[urlparse(m).netloc for m in WIKI_MIRRORS],
+    )
+    print(f"Learned {learned} name -> URL entries into {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from backroom_agent.utils.common import get_project_root
 from backroom_agent.utils.vector_store import rebuild_vector_db
 
 
-def rebuild_indices(backend="pickle"):
+def rebuild_indices(backend="pickle", quantization="none"):
     root = get_project_root()
     item_root_dir = os.path.join(root, "data/item")
     entity_root_dir = os.path.join(root, "data/entity")
@@ -20,6 +20,7 @@ def rebuild_indices(backend="pickle"):
         item_dir=item_root_dir,
         db_path=os.path.join(vector_store_dir, "item_vector_store.pkl"),
         backend=backend,
+        quantization=quantization,
     )
 
     print(
@@ -29,6 +30,7 @@ def rebuild_indices(backend="pickle"):
         item_dir=entity_root_dir,
         db_path=os.path.join(vector_store_dir, "entity_vector_store.pkl"),
         backend=backend,
+        quantization=quantization,
     )
 
 
@@ -40,6 +42,12 @@ if __name__ == "__main__":
         choices=["pickle", "chroma"],
         help="Vector store backend to use",
     )
+    parser.add_argument(
+        "--quantization",
+        default="none",
+        choices=["none", "float16", "int8"],
+        help="Embedding storage for the pickle backend (quantized scan + exact re-rank)",
+    )
     args = parser.parse_args()
 
-    rebuild_indices(backend=args.backend)
+    rebuild_indices(backend=args.backend, quantization=args.quantization)
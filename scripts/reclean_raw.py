@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.tools.wiki.reclean import STATUS_FAILED, reclean_raw_pages
+from backroom_agent.utils.common import get_project_root
+
+
+def main():
+    root = get_project_root()
+    parser = argparse.ArgumentParser(
+        description="Re-clean data/raw/*.html into data/level/*.html after cleaning-rule changes"
+    )
+    parser.add_argument(
+        "levels", nargs="*", help="Only these levels (e.g. level-0 level-1)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument("--raw-dir", default=os.path.join(root, "data/raw"))
+    parser.add_argument("--level-dir", default=os.path.join(root, "data/level"))
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report changes without writing"
+    )
+    args = parser.parse_args()
+
+    summary = reclean_raw_pages(
+        args.raw_dir,
+        args.level_dir,
+        workers=args.workers,
+        levels=args.levels or None,
+        dry_run=args.dry_run,
+    )
+
+    for result in summary["results"]:
+        if result["status"] == STATUS_FAILED:
+            print(f"❌ {result['level']}: {result['error']}")
+        elif result["status"] != "unchanged":
+            print(f"✏️  {result['level']}: {result['status']}")
+
+    counts = summary["counts"]
+    total = sum(counts.values())
+    print(
+        f"\nRe-cleaned {total} pages with {summary['workers']} workers "
+        f"in {summary['elapsed']:.2f}s "
+        f"({summary['pages_per_sec']:.1f} pages/s, {summary['mb_per_sec']:.1f} MB/s)"
+    )
+    print(
+        "created: {created}, updated: {updated}, unchanged: {unchanged}, "
+        "failed: {failed}".format(**counts)
+        + (" (dry run, nothing written)" if args.dry_run else "")
+    )
+    if counts[STATUS_FAILED]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
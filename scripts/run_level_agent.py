@@ -10,6 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from typing import cast
 
 from backroom_agent.subagents.level import level_agent
+from backroom_agent.subagents.level.events import format_event
 from backroom_agent.subagents.level.state import LevelAgentState
 
 # Configure logging to stdout
@@ -56,8 +57,12 @@ def main():
 
     # Output results
     print("\n--- Execution Logs ---")
-    for log in result.get("logs", []):
-        print(f"[Log] {log}")
+    for event in result.get("logs", []):
+        print(f"[Log] {format_event(event)}")
+    counters = result.get("log_counters", {})
+    if counters:
+        summary = ", ".join(f"{k}={v}" for k, v in sorted(counters.items()))
+        print(f"[Counters] {summary}")
 
     print("\n--- Final Items (Filtered & Verified) ---")
     final_items = result.get("final_items", [])
@@ -8,6 +8,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from langchain_core.messages import HumanMessage
 
+from backroom_agent.agent.checkpoint import (discard_anonymous_thread,
+                                             thread_config)
 from backroom_agent.agent.graph import graph
 from backroom_agent.agent.state import State
 from backroom_agent.constants import GraphKeys
@@ -49,9 +51,12 @@ async def main():
     has_settlement = False
 
     # Run the graph
+    config = thread_config(None)
     try:
         async for chunk in graph.astream(
-            cast(State, input_state), stream_mode="updates"
+            cast(State, input_state),
+            config=config,
+            stream_mode="updates",
         ):
             for node, updates in chunk.items():
                 print(f"\n--- Node Executed: {node} ---")
@@ -97,6 +102,8 @@ async def main():
         import traceback
 
         traceback.print_exc()
+    finally:
+        await discard_anonymous_thread(graph.checkpointer, config)
 
     print("\n>>> TEST SUMMARY")
     if has_logic_event:
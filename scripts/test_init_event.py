@@ -7,6 +7,8 @@ from typing import cast
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backroom_agent.agent.checkpoint import (discard_anonymous_thread,
+                                             thread_config)
 from backroom_agent.agent.graph import graph
 from backroom_agent.agent.state import State
 from backroom_agent.constants import GraphKeys
@@ -42,9 +44,12 @@ async def main():
     print(f">>> Invoking graph for {game_state.level}...")
 
     # Run the graph
+    config = thread_config(None)
     try:
         async for chunk in graph.astream(
-            cast(State, input_state), stream_mode="updates"
+            cast(State, input_state),
+            config=config,
+            stream_mode="updates",
         ):
             for node, updates in chunk.items():
                 print(f"\n--- Node Executed: {node} ---")
@@ -67,6 +72,8 @@ async def main():
         import traceback
 
         traceback.print_exc()
+    finally:
+        await discard_anonymous_thread(graph.checkpointer, config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Tuple
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backroom_agent.agent.nodes.init import warm_level_intro
+from backroom_agent.constants import (INGEST_LLM_CONCURRENCY,
+                                      INIT_INTRO_CACHE_TTL,
+                                      INIT_INTRO_VARIANTS)
+from backroom_agent.utils.cache import memory_cache
+from backroom_agent.utils.level import find_level_data, list_level_ids
+
+
+def _warm(level_id: str, variants: int, force: bool) -> Tuple[int, int]:
+    _, level_context = find_level_data(level_id)
+    return warm_level_intro(level_id, level_context or "", variants, force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-generate the init (level intro) cache for every level in data/level"
+    )
+    parser.add_argument(
+        "levels", nargs="*", help="Level IDs to warm (default: all, e.g. 'Level 0')"
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=INIT_INTRO_VARIANTS,
+        help="Intro variants per level (init_node picks one at random)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=INGEST_LLM_CONCURRENCY,
+        help="Concurrent LLM calls",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate intros that are already cached",
+    )
+    args = parser.parse_args()
+
+    if not memory_cache.available:
+        print("Redis is not available; intros would not be stored. Aborting.")
+        sys.exit(1)
+
+    levels = args.levels or list_level_ids()
+    print(
+        f"Warming {len(levels)} levels x {args.variants} variant(s), "
+        f"TTL {INIT_INTRO_CACHE_TTL // 86400} days, concurrency {args.concurrency}"
+    )
+
+    start = time.time()
+    generated = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = {
+            pool.submit(_warm, level_id, args.variants, args.force): level_id
+            for level_id in levels
+        }
+        for future in as_completed(futures):
+            level_id = futures[future]
+            try:
+                count, invalid = future.result()
+            except Exception as e:
+                failed.append(level_id)
+                print(f"  ✗ {level_id}: {e}")
+                continue
+            generated += count
+            if invalid:
+                failed.append(level_id)
+                print(f"  ✗ {level_id}: {invalid} variant(s) with invalid LLM output")
+                continue
+            print(
+                f"  ✓ {level_id}: {count} generated"
+                if count
+                else f"  · {level_id}: cached"
+            )
+
+    print(
+        f"Done in {time.time() - start:.1f}s: {generated} intros generated, "
+        f"{len(failed)} levels failed"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
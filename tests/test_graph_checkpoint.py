@@ -0,0 +1,283 @@
+import asyncio
+import fnmatch
+import os
+import sys
+import unittest
+from typing import Annotated, List, TypedDict
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import (AIMessage, AnyMessage, HumanMessage,
+                                     RemoveMessage)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from backroom_agent.agent import checkpoint
+from backroom_agent.agent.checkpoint import (BoundedMemorySaver,
+                                             RedisCheckpointSaver,
+                                             discard_anonymous_thread,
+                                             get_checkpointer, realign_thread,
+                                             thread_config)
+from backroom_agent.protocol import (Attributes, DiceRoll, GameState, Item,
+                                     Vitals)
+from backroom_agent.utils import common
+
+# The agent nodes create their chat model at import time (no request is made)
+with mock.patch.object(common, "DEEPSEEK_API_KEY", common.DEEPSEEK_API_KEY or "test"):
+    from backroom_agent.agent.nodes import router
+
+
+def make_state() -> GameState:
+    return GameState(
+        level="Level 1",
+        attributes=Attributes(STR=10, DEX=12, CON=10, INT=10, WIS=10, CHA=10),
+        vitals=Vitals(hp=8, maxHp=10, sanity=70),
+        inventory=[Item(id="almond_water", name="杏仁水", quantity=2)],
+    )
+
+
+def _b(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """In-memory stand-in for the (bytes) Redis commands used by the saver."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        pass
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        h = self.data.setdefault(key, {})
+        for f, v in (mapping or {field: value}).items():
+            h[_b(f)] = _b(v)
+
+    def hsetnx(self, key, field, value):
+        self.data.setdefault(key, {}).setdefault(_b(field), _b(value))
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, set()).update(_b(m) for m in mapping)
+
+    def zrange(self, key, start, end):
+        members = sorted(self.data.get(key, set()))
+        return members[start:] if end == -1 else members[start : end + 1]
+
+    def zcard(self, key):
+        return len(self.data.get(key, set()))
+
+    def zrem(self, key, *members):
+        self.data.get(key, set()).difference_update(_b(m) for m in members)
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(_b(m) for m in members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [_b(k) for k in list(self.data) if fnmatch.fnmatch(k, match)]
+
+
+class TurnState(TypedDict):
+    messages: Annotated[List[AnyMessage], add_messages]
+    current_game_state: GameState
+
+
+def build_turn_graph(checkpointer):
+    """One DM reply per turn; the reply counts the messages seen so far."""
+
+    def reply(state: TurnState):
+        return {"messages": [AIMessage(content=f"seen {len(state['messages'])}")]}
+
+    workflow = StateGraph(TurnState)
+    workflow.add_node("reply", reply)
+    workflow.add_edge(START, "reply")
+    workflow.add_edge("reply", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def run_turns(graph, config, count):
+    async def main():
+        result = None
+        for i in range(count):
+            result = await graph.ainvoke(
+                {
+                    "messages": [HumanMessage(content=f"turn {i}")],
+                    "current_game_state": make_state(),
+                },
+                config,
+            )
+        return result
+
+    return asyncio.run(main())
+
+
+class TestCheckpointConfig(unittest.TestCase):
+    def test_thread_is_session(self):
+        config = thread_config("s1")
+        self.assertEqual(config["configurable"]["thread_id"], "s1")
+
+        # Anonymous requests never share a thread
+        a = thread_config(None)["configurable"]["thread_id"]
+        b = thread_config(None)["configurable"]["thread_id"]
+        self.assertNotEqual(a, b)
+
+    def test_backend_selection(self):
+        with mock.patch.object(checkpoint, "CHECKPOINT_BACKEND", "none"):
+            self.assertIsNone(get_checkpointer())
+        with mock.patch.object(checkpoint, "CHECKPOINT_BACKEND", "memory"):
+            self.assertIsInstance(get_checkpointer(), InMemorySaver)
+        with mock.patch.object(checkpoint, "CHECKPOINT_BACKEND", "sqlite"):
+            with self.assertRaises(ValueError):
+                get_checkpointer()
+
+
+class TestRedisCheckpointEncoding(unittest.TestCase):
+    def test_state_round_trip(self):
+        saver = RedisCheckpointSaver(client=mock.Mock())
+        values = {
+            "current_game_state": make_state(),
+            "dice_roll": DiceRoll(type="d20", result=17, reason="攀爬"),
+            "messages": [HumanMessage(content="开门"), AIMessage(content="门开了")],
+        }
+
+        loaded = saver._load(saver._dump(values))
+
+        self.assertEqual(loaded["current_game_state"], values["current_game_state"])
+        self.assertIsInstance(loaded["current_game_state"], GameState)
+        self.assertEqual(loaded["dice_roll"], values["dice_roll"])
+        self.assertEqual(
+            [type(m) for m in loaded["messages"]], [HumanMessage, AIMessage]
+        )
+
+
+class TestRedisCheckpointSaver(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeRedis()
+        self.saver = RedisCheckpointSaver(self.client, ttl=60, keep=3)
+        self.graph = build_turn_graph(self.saver)
+
+    def test_history_accumulates_and_old_checkpoints_are_pruned(self):
+        config = thread_config("s1")
+        result = run_turns(self.graph, config, 3)
+
+        self.assertEqual(
+            [m.content for m in result["messages"]],
+            ["turn 0", "seen 1", "turn 1", "seen 3", "turn 2", "seen 5"],
+        )
+        self.assertIsInstance(result["current_game_state"], GameState)
+
+        # 3 turns x 3 checkpoints (input, loop start, reply); newest 3 kept
+        index = "backroom:ckpt:s1:"
+        self.assertEqual(self.client.zcard(index), 3)
+        # Checkpoint hashes (and their writes) exist only for the kept ids
+        checkpoint_keys = [
+            k for k in self.client.data if k.startswith(index) and k != index
+        ]
+        kept = {i.decode() for i in self.client.zrange(index, 0, -1)}
+        self.assertTrue(
+            all(k[len(index) + 1 :].split(":")[0] in kept for k in checkpoint_keys)
+        )
+        self.assertTrue(all(ttl == 60 for ttl in self.client.ttls.values()))
+
+        history = list(self.saver.list(config))
+        self.assertEqual(len(history), 3)
+        self.assertEqual(
+            self.saver.get_tuple(config).checkpoint["id"],  # type: ignore[union-attr]
+            history[0].checkpoint["id"],
+        )
+        self.assertEqual(len(list(self.saver.list(config, limit=1))), 1)
+
+    def test_anonymous_thread_is_discarded(self):
+        config = thread_config(None)
+        run_turns(self.graph, config, 1)
+        self.assertTrue(self.client.data)
+
+        asyncio.run(discard_anonymous_thread(self.saver, config))
+        self.assertEqual(self.client.data, {})
+
+        # Session threads are kept
+        config = thread_config("s1")
+        run_turns(self.graph, config, 1)
+        asyncio.run(discard_anonymous_thread(self.saver, config))
+        self.assertEqual(self.client.zcard("backroom:ckpt:s1:"), 3)
+
+
+class TestBoundedMemorySaver(unittest.TestCase):
+    def test_keeps_newest_checkpoints_and_threads(self):
+        saver = BoundedMemorySaver(ttl=60, keep=2, max_threads=2)
+        graph = build_turn_graph(saver)
+
+        result = run_turns(graph, thread_config("s1"), 2)
+        self.assertEqual(len(result["messages"]), 4)
+        self.assertEqual(len(saver.storage["s1"][""]), 2)
+
+        run_turns(graph, thread_config("s2"), 1)
+        run_turns(graph, thread_config("s3"), 1)
+        self.assertEqual(set(saver.storage), {"s2", "s3"})
+        self.assertTrue(all(key[0] != "s1" for key in saver.blobs))
+
+        # Unknown threads leave no empty entries behind
+        self.assertIsNone(saver.get_tuple(thread_config("missing")))
+        self.assertNotIn("missing", saver.storage)
+
+
+class TestRealignThread(unittest.TestCase):
+    def test_thread_matches_stored_session(self):
+        graph = build_turn_graph(InMemorySaver())
+        config = thread_config("s1")
+        run_turns(graph, config, 2)
+
+        # Only the first turn was saved in the session store
+        stored = [
+            {"sender": "player", "text": "turn 0"},
+            {"sender": "dm", "text": "seen 1"},
+        ]
+        asyncio.run(realign_thread(graph, "s1", make_state(), stored))
+
+        snapshot = graph.get_state(config)
+        self.assertEqual(
+            [type(m) for m in snapshot.values["messages"]], [HumanMessage, AIMessage]
+        )
+        self.assertEqual(
+            [m.content for m in snapshot.values["messages"]], ["turn 0", "seen 1"]
+        )
+        self.assertEqual(snapshot.next, ())
+
+        # The next turn builds on the realigned history
+        result = run_turns(graph, config, 1)
+        self.assertEqual(result["messages"][-1].content, "seen 3")
+
+
+class TestHistoryTrim(unittest.TestCase):
+    def test_drops_oldest_messages(self):
+        messages = [HumanMessage(content=str(i), id=f"m{i}") for i in range(5)]
+        with mock.patch.object(router, "CHECKPOINT_MAX_MESSAGES", 3):
+            removals = router.trim_history(messages)
+            self.assertEqual(router.trim_history(messages[:3]), [])
+
+        self.assertTrue(all(isinstance(r, RemoveMessage) for r in removals))
+        self.assertEqual([r.id for r in removals], ["m0", "m1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.subagents.level import ingest
+from backroom_agent.utils.node_annotation import annotate_node
+from backroom_agent.utils.rate_limit import DomainRateLimiter
+
+
+class FakeGraph:
+    """Stands in for the compiled level graph; records which targets ran."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    async def ainvoke(self, state):
+        name = state["level_name"]
+        self.calls.append(name)
+        await asyncio.sleep(0)
+        if name in self.fail:
+            return {"level_name": name, "logs": ["boom"]}
+        return {
+            "level_name": name,
+            "html_content": "<p>x</p>",
+            "level_json_generated": True,
+            "final_items": [{"id": f"{name}-item"}],
+            "saved_item_paths": [f"/tmp/{name}-item.json"],
+        }
+
+
+class TestIngestLevels(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.progress_path = os.path.join(self.tmp.name, "progress.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, graph, targets, **kwargs):
+        with mock.patch.object(
+            ingest, "build_level_graph", return_value=graph
+        ), mock.patch.object(ingest, "_update_indices") as update:
+            progress = asyncio.run(
+                ingest.ingest_levels(
+                    targets, progress_path=self.progress_path, **kwargs
+                )
+            )
+        return progress, update
+
+    def test_resume_skips_completed_and_indexes_once(self):
+        first = FakeGraph(fail={"level-2"})
+        progress, update = self._run(first, ["level-1", "level-2"])
+        self.assertEqual(progress["targets"]["level-1"]["status"], "done")
+        self.assertEqual(progress["targets"]["level-2"]["status"], "failed")
+        update.assert_called_once_with(["/tmp/level-1-item.json"], [], "pickle")
+
+        second = FakeGraph()
+        progress, update = self._run(second, ["level-1", "level-2"])
+        self.assertEqual(second.calls, ["level-2"])
+        # level-1 was already indexed by the first run
+        update.assert_called_once_with(["/tmp/level-2-item.json"], [], "pickle")
+
+    def test_force_reruns_completed_targets(self):
+        for _ in range(2):
+            graph = FakeGraph()
+            progress, _ = self._run(graph, ["level-1", "level-2"], force=True)
+            self.assertEqual(sorted(graph.calls), ["level-1", "level-2"])
+            self.assertEqual(progress["targets"]["level-1"]["status"], "done")
+
+    def test_llm_nodes_share_concurrency_limit(self):
+        active = []
+        peak = []
+
+        @annotate_node("llm")
+        def llm_node(state):
+            active.append(1)
+            peak.append(len(active))
+            time.sleep(0.02)
+            active.pop()
+            return {}
+
+        async def main():
+            wrapped = ingest._limit_llm_nodes(asyncio.Semaphore(2))(llm_node)
+            await asyncio.gather(*(wrapped({}) for _ in range(6)))
+
+        asyncio.run(main())
+        self.assertLessEqual(max(peak), 2)
+
+
+class TestDomainRateLimiter(unittest.TestCase):
+    def test_spacing_is_per_host(self):
+        limiter = DomainRateLimiter(min_interval=10)
+        self.assertEqual(limiter._reserve("http://a.example/x"), 0)
+        self.assertEqual(limiter._reserve("http://b.example/x"), 0)
+        self.assertGreater(limiter._reserve("http://a.example/y"), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.utils import common
+
+# The agent nodes create their chat model at import time (no request is made)
+with mock.patch.object(common, "DEEPSEEK_API_KEY", common.DEEPSEEK_API_KEY or "test"):
+    from backroom_agent.agent.nodes import init
+
+
+class DictCache:
+    """In-memory stand-in for RedisCache that records TTLs."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get_many(self, prefix, contents):
+        return [self.values.get((prefix, c)) for c in contents]
+
+    def set(self, prefix, content, value, ttl=86400):
+        self.set_many(prefix, {content: value}, ttl)
+
+    def set_many(self, prefix, values, ttl=86400):
+        for content, value in values.items():
+            self.values[(prefix, content)] = value
+            self.ttls[(prefix, content)] = ttl
+
+
+class TestInitIntroCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = DictCache()
+        self.calls = 0
+
+        def generate(level, level_context, prompt_template):
+            self.calls += 1
+            if level == "Broken":
+                return {"message": "You have entered Broken."}, False
+            return {"message": f"{level} #{self.calls}", "suggestions": []}, True
+
+        for p in [
+            mock.patch.object(init, "memory_cache", self.cache),
+            mock.patch.object(init, "_generate_llm_intro", side_effect=generate),
+            mock.patch.object(init, "_load_init_prompt", return_value="prompt"),
+        ]:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_lazy_generation_uses_long_ttl(self):
+        intro, hit = init.get_level_intro("Level 0", "<p>ctx</p>")
+        self.assertFalse(hit)
+        again, hit = init.get_level_intro("Level 0", "<p>ctx</p>")
+        self.assertTrue(hit)
+        self.assertEqual(again, intro)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(set(self.cache.ttls.values()), {init.INIT_INTRO_CACHE_TTL})
+
+    def test_warm_variants(self):
+        self.assertEqual(init.warm_level_intro("Level 1", "ctx", variants=3), (3, 0))
+        # Already cached: nothing to generate unless forced
+        self.assertEqual(init.warm_level_intro("Level 1", "ctx", variants=3), (0, 0))
+        self.assertEqual(
+            init.warm_level_intro("Level 1", "ctx", variants=3, force=True), (3, 0)
+        )
+
+        with mock.patch.object(init, "INIT_INTRO_VARIANTS", 3):
+            seen = {
+                init.get_level_intro("Level 1", "ctx")[0]["message"] for _ in range(50)
+            }
+        self.assertEqual(seen, {"Level 1 #4", "Level 1 #5", "Level 1 #6"})
+        self.assertEqual(self.calls, 6)
+
+    def test_fallback_intro_is_not_cached(self):
+        intro, hit = init.get_level_intro("Broken", "ctx")
+        self.assertFalse(hit)
+        self.assertEqual(intro["message"], "You have entered Broken.")
+        self.assertEqual(self.cache.values, {})
+
+        self.assertEqual(init.warm_level_intro("Broken", "ctx", variants=2), (0, 2))
+        self.assertEqual(self.cache.values, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
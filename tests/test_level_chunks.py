@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+
+from backroom_agent.subagents.level import nodes_llm
+from backroom_agent.subagents.level.events import NodeLog
+
+
+class ChunkLLM:
+    """Answers each chunk with the items named in it."""
+
+    def invoke(self, messages):
+        names = messages[0].content.split("CHUNK:")[1].split()
+        if "broken" in names:
+            return AIMessage(content="not json")
+        items = [{"name": n, "id": n.lower(), "description": n * 2} for n in names]
+        return AIMessage(content="```json\n" + json.dumps(items) + "\n```")
+
+
+class TestChunkedExtraction(unittest.TestCase):
+    def setUp(self):
+        self.llm = ChunkLLM()
+        for target, value in (
+            ("get_llm", self.llm),
+            ("load_prompt", "CHUNK: {context}"),
+        ):
+            patcher = mock.patch.object(nodes_llm, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_results_keep_page_order(self):
+        chunks = [f"Item{i}" for i in range(8)]
+        logs = NodeLog("extract_items", "level-0")
+        items, ok = nodes_llm._extract_from_chunks(
+            chunks, "extract_items.prompt", "go", nodes_llm._parse_items, logs
+        )
+        self.assertTrue(ok)
+        self.assertEqual([i["name"] for i in items], chunks)
+
+    def test_chunk_calls_respect_llm_call_limit(self):
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+        invoke = self.llm.invoke
+
+        def slow_invoke(messages):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return invoke(messages)
+
+        self.llm.invoke = slow_invoke
+        chunks = [f"Item{i}" for i in range(8)]
+        with mock.patch.object(
+            nodes_llm, "LEVEL_CHUNK_CONCURRENCY", 4
+        ), nodes_llm.limit_llm_calls(2):
+            items, ok = nodes_llm._extract_from_chunks(
+                chunks,
+                "extract_items.prompt",
+                "go",
+                nodes_llm._parse_items,
+                NodeLog("extract_items", "level-0"),
+            )
+        self.assertTrue(ok)
+        self.assertEqual(len(items), 8)
+        self.assertLessEqual(peak[0], 2)
+
+    def test_failed_chunk_is_reported(self):
+        logs = NodeLog("extract_items", "level-0")
+        items, ok = nodes_llm._extract_from_chunks(
+            ["Crowbar", "broken", "Rope"],
+            "extract_items.prompt",
+            "go",
+            nodes_llm._parse_items,
+            logs,
+        )
+        self.assertFalse(ok)
+        self.assertEqual([i["name"] for i in items], ["Crowbar", "Rope"])
+        self.assertIn("chunk 2/3", logs.events[-1]["message"])
+        self.assertEqual(logs.events[-1]["level"], "ERROR")
+
+    def test_merge_by_normalized_name(self):
+        logs = NodeLog("extract_items", "level-0")
+        merged = nodes_llm._merge_candidates(
+            [
+                {"name": "Almond Water", "id": "almond_water", "description": ""},
+                {"name": "ＡＬＭＯＮＤ-water ", "id": "x", "description": "Drink."},
+                {"name": "杏仁水", "id": "almond_water_cn"},
+                {"name": "  "},
+            ],
+            logs,
+            "items",
+        )
+        self.assertEqual(
+            merged,
+            [
+                {"name": "Almond Water", "id": "almond_water", "description": "Drink."},
+                {"name": "杏仁水", "id": "almond_water_cn"},
+                {"name": "  "},
+            ],
+        )
+        self.assertEqual(logs.counters, {"items_merged": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+
+from backroom_agent.subagents.level import manifest, nodes_llm
+from backroom_agent.subagents.level.graph import build_level_graph
+
+
+class ScriptedLLM:
+    """Returns the given responses in order and records the prompts."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return AIMessage(content=self.responses[len(self.calls) - 1])
+
+
+def _json_block(payload):
+    return "```json\n" + json.dumps(payload, ensure_ascii=False) + "\n```"
+
+
+class TestCombinedExtraction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for module in (manifest, nodes_llm):
+            patcher = mock.patch.object(
+                module, "get_project_root", return_value=self.tmp.name
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.llm = ScriptedLLM(
+            # Entities missing, one invalid item
+            _json_block(
+                {
+                    "level": {"level_id": "Level 0", "title": "大厅"},
+                    "findable_items": [
+                        {"name": "杏仁水", "id": "almond_water", "category": "Food"},
+                        {"name": "无 ID 的物品"},
+                    ],
+                }
+            ),
+            _json_block({"entities": [{"name": "猎犬", "id": "hound"}]}),
+        )
+        patcher = mock.patch.object(nodes_llm, "get_llm", return_value=self.llm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _state(self):
+        return {
+            "level_name": "level-0",
+            "html_content": "<p>杏仁水与猎犬</p>",
+            "force_update": True,
+            "logs": [],
+        }
+
+    def test_retries_only_missing_sections(self):
+        result = nodes_llm.extract_combined_node(self._state())
+
+        self.assertEqual(len(self.llm.calls), 2)
+        self.assertIn("entities (missing)", self.llm.calls[1][-1].content)
+        self.assertTrue(result["level_json_generated"])
+        self.assertEqual(
+            [i["id"] for i in result["extracted_items_raw"]], ["almond_water"]
+        )
+        self.assertEqual([e["id"] for e in result["extracted_entities_raw"]], ["hound"])
+
+        with open(os.path.join(self.tmp.name, "data/level", "level-0.json")) as f:
+            self.assertEqual(json.load(f)["level_id"], "Level 0")
+
+        # Same page and prompts: reused from the manifest without LLM calls
+        again = nodes_llm.extract_combined_node(self._state())
+        self.assertEqual(len(self.llm.calls), 2)
+        self.assertEqual(
+            again["extracted_entities_raw"], result["extracted_entities_raw"]
+        )
+
+    def test_combined_graph_replaces_fanout_nodes(self):
+        nodes = set(build_level_graph(mode="combined").get_graph().nodes)
+        self.assertIn("extract_combined", nodes)
+        self.assertFalse({"generate_json", "extract_items"} & nodes)
+        with self.assertRaises(ValueError):
+            build_level_graph(mode="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
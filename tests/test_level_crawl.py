@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.subagents.level import crawl
+
+DOMAINS = ["brcn.backroomswiki.cn", "backrooms-wiki-cn.wikidot.com"]
+
+
+class TestLevelCrawl(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.level_dir = os.path.join(self.tmp.name, "data/level")
+        os.makedirs(self.level_dir)
+        # level-0 -> 1, 2 (same page on two mirrors), 3; level-1 -> 2, 4.2
+        self._write(
+            "level-0",
+            [
+                "/level-1",
+                "http://brcn.backroomswiki.cn/level-2",
+                "https://backrooms-wiki-cn.wikidot.com/level-2",
+                "/manila-room",
+                "https://example.com/level-9",
+            ],
+            exits=["Level 3"],
+        )
+        self._write("level-1", ["/level-2"], exits=["Level 4.2", "Level 0"])
+
+    def _write(self, level, urls, exits=()):
+        data = {
+            "level_id": level,
+            "links": [{"text": u, "url": u} for u in urls],
+            "transitions": {"exits": [{"next": e} for e in exits]},
+        }
+        with open(os.path.join(self.level_dir, f"{level}.json"), "w") as f:
+            json.dump(data, f)
+
+    def test_neighbours_dedupe_mirrors_and_skip_other_pages(self):
+        self.assertEqual(
+            crawl.level_neighbours(self.level_dir, "level-0", DOMAINS),
+            ["level-1", "level-2", "level-3"],
+        )
+
+    def test_priority_by_in_degree(self):
+        crawler = crawl.LevelCrawler(["level-0"], self.level_dir, DOMAINS)
+        self.assertEqual(crawler.next_batch(5), ["level-0"])
+        crawler.mark_done("level-0")
+        crawler.expand("level-0")
+        self.assertEqual(crawler.next_batch(1), ["level-1"])
+        crawler.mark_done("level-1")
+        crawler.expand("level-1")
+        # level-2 is linked twice now
+        self.assertEqual(
+            crawler.frontier(), [("level-2", 2), ("level-3", 1), ("level-4-2", 1)]
+        )
+        self.assertEqual(crawler.next_batch(5), ["level-2", "level-3", "level-4-2"])
+
+    def test_crawl_ingests_only_missing_levels(self):
+        batches = []
+
+        async def fake_ingest(targets, **kwargs):
+            batches.append(list(targets))
+            for target in targets:
+                self._write(target, [])
+            return {"targets": {t: {"status": "done"} for t in targets}}
+
+        with mock.patch.object(
+            crawl, "get_project_root", return_value=self.tmp.name
+        ), mock.patch.object(crawl, "ingest_levels", side_effect=fake_ingest):
+            result = asyncio.run(
+                crawl.crawl_levels(["level-0"], max_levels=2, concurrency=4)
+            )
+
+        self.assertEqual(result["ingested"], ["level-2", "level-3"])
+        # Budget of 2 caps each batch; the local level-1 is expanded, not ingested
+        self.assertEqual(batches, [["level-2"], ["level-3"], []])
+        self.assertEqual(result["frontier"], [("level-4-2", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
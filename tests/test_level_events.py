@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.graph import END, START, StateGraph
+
+from backroom_agent.subagents.level import events
+from backroom_agent.subagents.level.state import LevelAgentState
+
+
+class TestLevelEvents(unittest.TestCase):
+    def test_parallel_nodes_do_not_duplicate_events(self):
+        def node(name):
+            def run(state):
+                logs = events.NodeLog(name, state.get("level_name"))
+                logs.info(f"{name} done")
+                logs.count("calls")
+                return logs.updates()
+
+            return run
+
+        graph = StateGraph(LevelAgentState)
+        for name in ("a", "b", "c"):
+            graph.add_node(name, node(name))
+        graph.add_edge(START, "a")
+        graph.add_edge("a", "b")
+        graph.add_edge("a", "c")
+        graph.add_edge(["b", "c"], END)
+
+        result = graph.compile().invoke({"level_name": "level-0", "logs": []})
+
+        messages = sorted(e["message"] for e in result["logs"])
+        self.assertEqual(messages, ["a done", "b done", "c done"])
+        self.assertEqual(result["log_counters"], {"calls": 3})
+
+    def test_ring_buffer_keeps_latest(self):
+        with mock.patch.object(events, "LEVEL_LOG_MAX_EVENTS", 3):
+            merged = events.append_events([{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}])
+        self.assertEqual([e["n"] for e in merged], [1, 2, 3])
+
+    def test_debug_goes_to_logger_only(self):
+        logs = events.NodeLog("filter_items", "level-0")
+        logs.debug("Accepted: 杏仁水")
+        logs.append("Error fetching page")
+        self.assertEqual([e["level"] for e in logs.events], ["ERROR"])
+        self.assertEqual(
+            events.last_error(logs.updates()["logs"]), "Error fetching page"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+
+from backroom_agent.subagents.level import manifest, nodes_llm
+
+
+class FakeLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.content)
+
+
+class TestLevelManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(
+            manifest, "get_project_root", return_value=self.tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.llm = FakeLLM('```json\n{"findable_items": [{"name": "杏仁水"}]}\n```')
+        patcher = mock.patch.object(nodes_llm, "get_llm", return_value=self.llm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _state(self, html):
+        return {
+            "level_name": "level-0",
+            "html_content": html,
+            "force_update": True,
+            "logs": [],
+        }
+
+    def test_extraction_reused_when_inputs_match(self):
+        first = nodes_llm.extract_items_node(self._state("<p>杏仁水</p>"))
+        second = nodes_llm.extract_items_node(self._state("<p>杏仁水</p>"))
+
+        self.assertEqual(self.llm.calls, 1)
+        self.assertEqual(second["extracted_items_raw"], first["extracted_items_raw"])
+
+    def test_changed_html_or_prompt_reruns(self):
+        nodes_llm.extract_items_node(self._state("<p>杏仁水</p>"))
+        nodes_llm.extract_items_node(self._state("<p>杏仁水 v2</p>"))
+        self.assertEqual(self.llm.calls, 2)
+
+        with mock.patch.object(manifest, "prompt_hash", return_value="new"):
+            self.assertTrue(manifest.has_stale_prompts("level-0"))
+            nodes_llm.extract_items_node(self._state("<p>杏仁水 v2</p>"))
+        self.assertEqual(self.llm.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.agent import prefetch
+from backroom_agent.utils import level
+
+
+class InlineExecutor:
+    """Runs submitted work immediately so the test can observe it."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class TestLevelPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patches = [
+            mock.patch.object(level, "LEVEL_DATA_DIR", self.tmp.name),
+            mock.patch.object(level, "_level_index", {}),
+            mock.patch.object(level, "_level_index_mtime", None),
+            mock.patch.object(level, "_level_cache", level.OrderedDict()),
+            mock.patch.object(prefetch, "_executor", InlineExecutor()),
+            mock.patch.object(prefetch, "_recent", prefetch.OrderedDict()),
+            mock.patch.object(prefetch, "_inflight", set()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        self._write("level-0", "Level 0", ["Level 1", None, "Level 1", "Level !"])
+        self._write("level-1", "Level 1", ["Level 0"])
+        # File name does not follow the level_id: found through the index
+        self._write("level-fun", "Level !", [])
+
+    def _write(self, slug, level_id, exits):
+        data = {
+            "level_id": level_id,
+            "transitions": {"exits": [{"next": n} for n in exits]},
+        }
+        with open(os.path.join(self.tmp.name, f"{slug}.json"), "w") as f:
+            json.dump(data, f)
+        with open(os.path.join(self.tmp.name, f"{slug}.html"), "w") as f:
+            f.write(f"<p>{level_id}</p>")
+
+    def test_lookup_is_cached_and_copied(self):
+        data, html = level.find_level_data("Level !")
+        self.assertEqual(html, "<p>Level !</p>")
+        data["level_id"] = "mutated"
+
+        with mock.patch("builtins.open", side_effect=AssertionError("disk read")):
+            again, _ = level.find_level_data("Level !")
+            context = level.get_level_context_json("Level !")
+        self.assertEqual(again["level_id"], "Level !")
+        self.assertEqual(json.loads(context)["level_id"], "Level !")
+        self.assertEqual(level.find_level_data("Level 404"), (None, None))
+
+    def test_rewritten_html_is_reloaded(self):
+        self.assertEqual(level.find_level_data("Level 1")[1], "<p>Level 1</p>")
+
+        # e.g. scripts/reclean_raw.py rewrites only the HTML file
+        with open(os.path.join(self.tmp.name, "level-1.html"), "w") as f:
+            f.write("<p>Level 1 (recleaned)</p>")
+
+        self.assertEqual(
+            level.find_level_data("Level 1")[1], "<p>Level 1 (recleaned)</p>"
+        )
+
+    def test_adjacent_levels_from_exits(self):
+        self.assertEqual(prefetch.adjacent_levels("Level 0"), ["Level 1", "Level !"])
+        self.assertEqual(prefetch.adjacent_levels("Level 0", limit=1), ["Level 1"])
+        self.assertEqual(prefetch.adjacent_levels("Level 404"), [])
+
+    def test_unknown_exit_targets_do_not_use_the_limit(self):
+        self._write("level-2", "Level 2", ["random", "Level 4, Level 5", "Level 1"])
+        self.assertEqual(prefetch.adjacent_levels("Level 2", limit=1), ["Level 1"])
+
+    def test_prefetch_warms_once(self):
+        with mock.patch.object(prefetch.memory_cache, "_client", None):
+            scheduled = prefetch.prefetch_adjacent_levels("Level 0", include_self=True)
+            self.assertEqual(scheduled, ["Level 0", "Level 1", "Level !"])
+            self.assertIn(
+                os.path.join(self.tmp.name, "level-fun.json"), level._level_cache
+            )
+            # Within the cooldown nothing is scheduled again
+            self.assertEqual(prefetch.prefetch_adjacent_levels("Level 1"), [])
+            self.assertEqual(prefetch._inflight, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
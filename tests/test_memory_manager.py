@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import redis
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.utils.memory import MemoryItem, MemoryManager
+from backroom_agent.utils.memory import manager as manager_module
+
+
+class ListRedis:
+    """In-memory stand-in for the Redis list commands used by MemoryManager."""
+
+    def __init__(self):
+        self.lists = {}
+        self.ttls = {}
+
+    def pipeline(self):
+        return self
+
+    def delete(self, key):
+        self.lists.pop(key, None)
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def execute(self):
+        pass
+
+    def lrange(self, key, start, end):
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+
+class DownRedis(ListRedis):
+    """Accepts commands but fails every write (Redis went away)."""
+
+    def execute(self):
+        raise redis.ConnectionError("connection refused")
+
+
+class TestMemoryManager(unittest.TestCase):
+    def setUp(self):
+        self.redis = ListRedis()
+        patches = [
+            mock.patch.object(
+                MemoryManager, "_instances", manager_module.OrderedDict()
+            ),
+            mock.patch.object(MemoryManager, "_evicted", {}),
+            mock.patch.object(MemoryManager, "_total_size", 0),
+            mock.patch.object(MemoryManager, "_evicted_size", 0),
+            mock.patch.object(MemoryManager, "_client", self.redis),
+            mock.patch.object(manager_module, "MEMORY_MAX_SESSIONS", 2),
+            mock.patch.object(manager_module, "MEMORY_MAX_ITEMS", 3),
+            mock.patch.object(manager_module, "MEMORY_SESSION_TTL", 3600),
+            mock.patch.object(manager_module, "MEMORY_BUDGET_BYTES", 10**9),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_item_has_no_dict(self):
+        item = MemoryItem("走廊尽头有光")
+        self.assertFalse(hasattr(item, "__dict__"))
+        self.assertEqual(MemoryItem.from_dict(item.to_dict()).id, item.id)
+
+    def test_ring_buffer_keeps_newest(self):
+        manager = MemoryManager.get_instance("s1")
+        for i in range(5):
+            manager.add_memory(f"m{i}")
+
+        self.assertEqual([m.content for m in manager.memories], ["m2", "m3", "m4"])
+        self.assertEqual(manager.size, sum(m.approx_size() for m in manager.memories))
+        self.assertEqual(
+            [m.content for m in manager.get_recent_memories(2)], ["m3", "m4"]
+        )
+
+    def test_lru_eviction_and_rehydration(self):
+        MemoryManager.get_instance("s1").add_memory("s1 memory")
+        MemoryManager.get_instance("s2")
+        MemoryManager.get_instance("s1")  # s2 is now least recently used
+        MemoryManager.get_instance("s3")
+
+        self.assertEqual(list(MemoryManager._instances), ["s1", "s3"])
+
+        # s1 is evicted with its change written behind, then loaded back
+        MemoryManager.get_instance("s4")
+        MemoryManager.flush_all()
+        manager_module._flush_executor.submit(lambda: None).result()
+        self.assertEqual(MemoryManager._evicted, {})
+        self.assertNotIn("s1", MemoryManager._instances)
+
+        revived = MemoryManager.get_instance("s1")
+        self.assertEqual([m.content for m in revived.memories], ["s1 memory"])
+        self.assertIn("backroom:memory:s1", self.redis.ttls)
+
+    def test_budget_and_idle_eviction(self):
+        MemoryManager.get_instance("s1").add_memory("x" * 1000)
+        with mock.patch.object(manager_module, "MEMORY_BUDGET_BYTES", 500):
+            MemoryManager.get_instance("s2")
+        self.assertEqual(list(MemoryManager._instances), ["s2"])
+        self.assertEqual(MemoryManager._total_size, 0)
+
+        MemoryManager.get_instance("s2").last_access = time.time() - 7200
+        MemoryManager.get_instance("s3")
+        self.assertEqual(list(MemoryManager._instances), ["s3"])
+
+    def test_unsaved_evicted_sessions_are_bounded(self):
+        with mock.patch.object(MemoryManager, "_client", DownRedis()):
+            for i in range(200):
+                MemoryManager.get_instance(f"s{i}").add_memory(f"memory {i}")
+                manager_module._flush_executor.submit(lambda: None).result()
+
+            self.assertLessEqual(len(MemoryManager._evicted), 2)
+            self.assertEqual(
+                MemoryManager._evicted_size,
+                sum(m.size for m in MemoryManager._evicted.values()),
+            )
+
+            # Pending sessions count against the memory budget too
+            self.assertTrue(MemoryManager._evicted)
+            with mock.patch.object(manager_module, "MEMORY_BUDGET_BYTES", 0):
+                MemoryManager.get_instance("s199")
+            self.assertEqual(list(MemoryManager._instances), ["s199"])
+            self.assertEqual(MemoryManager._evicted, {})
+            self.assertEqual(MemoryManager._evicted_size, 0)
+
+    def test_client_is_looked_up_lazily(self):
+        shared = mock.Mock(client=None)
+        with mock.patch.object(
+            MemoryManager, "_client", manager_module._UNRESOLVED
+        ), mock.patch.object(manager_module.RedisCache, "get_instance") as get:
+            get.return_value = shared
+            self.assertIsNone(MemoryManager._redis())
+            self.assertIsNone(MemoryManager._redis())
+        get.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+import redis
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.protocol import (Attributes, ChatRequest, EventType,
+                                     GameEvent, GameState, Vitals)
+from backroom_agent.utils import common
+from backroom_agent.utils.session import (Session, SessionConflictError,
+                                          SessionSaveError, SessionStore)
+
+# The agent nodes create their chat model at import time (no request is made)
+with mock.patch.object(common, "DEEPSEEK_API_KEY", common.DEEPSEEK_API_KEY or "test"):
+    from backroom_agent import server
+
+
+def make_state(level: str) -> GameState:
+    return GameState(
+        level=level,
+        attributes=Attributes(STR=10, DEX=10, CON=10, INT=10, WIS=10, CHA=10),
+        vitals=Vitals(hp=10, maxHp=10, sanity=100),
+        inventory=[],
+    )
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        # In-process mode (no Redis); same versioning semantics
+        self.store = SessionStore(client=None)
+
+    def test_new_session_and_roundtrip(self):
+        session = self.store.load("s1")
+        self.assertEqual((session.version, session.state), (0, None))
+
+        session.state = make_state("Level 0")
+        session.append_message("player", "hello")
+        self.assertEqual(self.store.save(session), 1)
+
+        loaded = self.store.load("s1")
+        self.assertEqual(loaded.version, 1)
+        self.assertEqual(loaded.state.level, "Level 0")
+        self.assertEqual(loaded.messages, [{"sender": "player", "text": "hello"}])
+
+        # Loads are copies: unsaved changes do not leak into the store
+        loaded.append_message("dm", "unsaved")
+        self.assertEqual(len(self.store.load("s1").messages), 1)
+
+    def test_concurrent_writers_conflict(self):
+        self.store.save(Session("s2", state=make_state("Level 0")))
+        first, second = self.store.load("s2"), self.store.load("s2")
+
+        first.state = make_state("Level 1")
+        self.assertEqual(self.store.save(first), 2)
+
+        second.state = make_state("Level 2")
+        with self.assertRaises(SessionConflictError) as ctx:
+            self.store.save(second)
+        self.assertEqual((ctx.exception.expected, ctx.exception.actual), (1, 2))
+        self.assertEqual(self.store.load("s2").state.level, "Level 1")
+
+    def test_redis_failure_is_not_saved(self):
+        client = mock.Mock()
+        client.pipeline.side_effect = redis.ConnectionError("down")
+        store = SessionStore(client)
+
+        session = Session("s3", state=make_state("Level 0"))
+        with self.assertRaises(SessionSaveError):
+            store.save(session)
+        self.assertEqual(session.version, 0)
+        self.assertIsNone(store._cache_get("s3"))
+
+
+
+class TestSessionlessRequests(unittest.TestCase):
+    def test_not_stored(self):
+        store = SessionStore(client=None)
+
+        async def fake_handler(request, current_state, session):
+            yield "dm\n"
+
+        async def run_turn():
+            request = ChatRequest(
+                event=GameEvent(type=EventType.MESSAGE), player_input="hi"
+            )
+            session = Session("NO_SESSION")
+            return [c async for c in server.agent_turn_generator(request, session)]
+
+        with mock.patch.object(server, "session_store", store), mock.patch.object(
+            server, "handle_message", fake_handler
+        ):
+            for _ in range(2):
+                self.assertEqual(asyncio.run(run_turn()), ["dm\n"])
+
+        self.assertEqual(store.load("NO_SESSION").version, 0)
+
+
+class TestUnsavedTurn(unittest.TestCase):
+    def test_conflict_realigns_checkpoint_and_asks_for_resync(self):
+        store = SessionStore(client=None)
+        store.save(Session("s1", state=make_state("Level 0")))
+        # Another request saves while this turn runs
+        session = store.load("s1")
+        other = store.load("s1")
+        other.state = make_state("Level 2")
+        other.append_message("dm", "other turn")
+        store.save(other)
+
+        async def fake_handler(request, current_state, session):
+            yield "dm\n"
+
+        async def run_turn():
+            request = ChatRequest(
+                event=GameEvent(type=EventType.MESSAGE),
+                player_input="hi",
+                session_id="s1",
+                state_version=1,
+            )
+            return [c async for c in server.agent_turn_generator(request, session)]
+
+        realign = mock.AsyncMock()
+        with mock.patch.object(server, "session_store", store), mock.patch.object(
+            server, "handle_message", fake_handler
+        ), mock.patch.object(server, "realign_thread", realign):
+            chunks = asyncio.run(run_turn())
+
+        last = json.loads(chunks[-1])
+        self.assertEqual(
+            (last["type"], last["version"], last["resync"]), ("session", 2, True)
+        )
+        self.assertEqual(json.loads(chunks[-2])["sender"], "system")
+        (_, session_id, state, messages), _ = realign.call_args
+        self.assertEqual((session_id, state.level), ("s1", "Level 2"))
+        self.assertEqual(messages, [{"sender": "dm", "text": "other turn"}])
+        self.assertEqual(store.load("s1").version, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
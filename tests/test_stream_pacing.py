@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.protocol import (DiceRoll, StreamChunkDice,
+                                     StreamChunkMessage, StreamChunkType)
+
+
+class TestStreamPacing(unittest.TestCase):
+    def test_to_line_stamps_time_and_keeps_hints(self):
+        line = StreamChunkDice(
+            type=StreamChunkType.DICE_ROLL,
+            dice=DiceRoll(type="d20", result=18),
+            min_display_ms=2000,
+        ).to_line()
+
+        self.assertTrue(line.endswith("\n"))
+        payload = json.loads(line)
+        self.assertEqual(payload["type"], "dice_roll")
+        self.assertEqual(payload["min_display_ms"], 2000)
+        self.assertIsInstance(payload["ts"], int)
+
+    def test_plain_chunks_have_no_hold(self):
+        payload = json.loads(
+            StreamChunkMessage(
+                type=StreamChunkType.MESSAGE, text="hi", sender="dm"
+            ).to_line()
+        )
+        self.assertIsNone(payload["min_display_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
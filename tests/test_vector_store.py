@@ -0,0 +1,348 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from typing import List
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.embeddings import Embeddings
+
+from backroom_agent.utils.vector_store.batching import BatchingEmbeddings
+from backroom_agent.utils.vector_store.embedding_cache import CachedEmbeddings
+from backroom_agent.utils.vector_store.pickle_store import PickleVectorStore
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic embeddings: one dimension per known keyword."""
+
+    KEYWORDS = ["water", "food", "light", "tool", "weapon", "map"]
+
+    def embed_query(self, text: str) -> List[float]:
+        lowered = text.lower()
+        vec = [float(lowered.count(word)) for word in self.KEYWORDS]
+        return [v + 0.01 for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+class TestPickleVectorStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.item_dir = os.path.join(self.tmp.name, "item")
+        os.makedirs(self.item_dir)
+        self.db_path = os.path.join(self.tmp.name, "store", "items.pkl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_item(self, item_id: str, name: str, description: str) -> str:
+        path = os.path.join(self.item_dir, f"{item_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "id": item_id,
+                    "name": name,
+                    "category": "Resource",
+                    "description": description,
+                },
+                f,
+            )
+        return path
+
+    def _store(self, **kwargs) -> PickleVectorStore:
+        store = PickleVectorStore(db_path=self.db_path, **kwargs)
+        store.embedding_model = FakeEmbeddings()
+        return store
+
+    def test_update_writes_delta_without_touching_base(self):
+        self._write_item("water", "Almond Water", "water water")
+        store = self._store()
+        store.build_index(self.item_dir)
+        base_mtime = os.stat(self.db_path).st_mtime_ns
+
+        path = self._write_item("torch", "Torch", "a light tool")
+        store.update_index([path])
+
+        self.assertEqual(os.stat(self.db_path).st_mtime_ns, base_mtime)
+        self.assertEqual(len(store._list_deltas()), 1)
+
+        results = store.search("light", k=1)
+        self.assertEqual(results[0]["id"], "torch")
+
+    def test_delta_overrides_base_item(self):
+        self._write_item("water", "Almond Water", "water")
+        self._write_item("bread", "Bread", "food")
+        store = self._store()
+        store.build_index(self.item_dir)
+
+        path = self._write_item("bread", "Bread", "a weapon weapon weapon")
+        store.update_index([path])
+
+        snapshot = store._load_index()
+        self.assertEqual(int(snapshot.alive.sum()), 2)
+        self.assertEqual(store.search("weapon", k=1)[0]["id"], "bread")
+
+    def test_compaction_merges_deltas_into_base(self):
+        self._write_item("water", "Almond Water", "water")
+        store = self._store(compact_threshold=3)
+        store.build_index(self.item_dir)
+
+        for i in range(3):
+            path = self._write_item(f"map_{i}", f"Map {i}", "map " * (i + 1))
+            store.update_index([path])
+
+        self.assertEqual(store._list_deltas(), [])
+        items = store._load_index().items
+        self.assertEqual(
+            sorted(item["id"] for item in items), ["map_0", "map_1", "map_2", "water"]
+        )
+
+    def test_rebuild_discards_stale_deltas(self):
+        self._write_item("water", "Almond Water", "water")
+        store = self._store()
+        store.build_index(self.item_dir)
+        store.update_index([self._write_item("map", "Map", "map")])
+
+        store.build_index(self.item_dir)
+
+        self.assertEqual(store._list_deltas(), [])
+        self.assertEqual(len(store._load_index().items), 2)
+
+    def test_delete_ids_tombstones_until_compaction(self):
+        self._write_item("water", "Almond Water", "water")
+        self._write_item("map", "Map", "map")
+        store = self._store(compact_threshold=2)
+        store.build_index(self.item_dir)
+
+        store.delete_ids(["map"])
+
+        self.assertEqual(int(store._load_index().alive.sum()), 1)
+        self.assertEqual([r["id"] for r in store.search("map", k=5)], ["water"])
+
+        store.update_index([self._write_item("torch", "Torch", "light")])
+
+        self.assertEqual(store._list_deltas(), [])
+        snapshot = store._load_index()
+        self.assertEqual(
+            sorted(item["id"] for item in snapshot.items), ["torch", "water"]
+        )
+        self.assertEqual(snapshot.base_size, 2)
+        self.assertTrue(snapshot.alive.all())
+
+    def test_readd_after_delete(self):
+        self._write_item("map", "Map", "map")
+        store = self._store()
+        store.build_index(self.item_dir)
+
+        store.delete_ids(["map"])
+        store.update_index([self._write_item("map", "Map", "map")])
+
+        self.assertEqual(store.search("map", k=1)[0]["id"], "map")
+
+    def test_quantized_search_matches_exact(self):
+        for i, word in enumerate(FakeEmbeddings.KEYWORDS):
+            self._write_item(f"{word}_item", word.title(), f"{word} " * (i + 1))
+
+        exact = self._store()
+        exact.build_index(self.item_dir)
+        expected = [r["id"] for r in exact.search("light tool", k=3)]
+
+        for mode in ("float16", "int8"):
+            db_path = os.path.join(self.tmp.name, mode, "items.pkl")
+            store = PickleVectorStore(db_path=db_path, quantization=mode)
+            store.embedding_model = FakeEmbeddings()
+            store.build_index(self.item_dir)
+
+            snapshot = store._load_index()
+            assert snapshot.base_quantized is not None
+            self.assertEqual(snapshot.base_quantized["mode"], mode)
+            self.assertEqual(
+                [r["id"] for r in store.search("light tool", k=3)], expected
+            )
+
+    def test_quantized_compaction_replaces_sidecar(self):
+        self._write_item("water", "Almond Water", "water")
+        store = self._store(quantization="int8", compact_threshold=1)
+        store.build_index(self.item_dir)
+        first_sidecars = store._list_sidecars()
+
+        store.update_index([self._write_item("map", "Map", "map")])
+
+        sidecars = store._list_sidecars()
+        self.assertEqual(len(sidecars), 1)
+        self.assertNotEqual(sidecars, first_sidecars)
+        self.assertEqual(store.search("map", k=1)[0]["id"], "map")
+
+    def test_compaction_keeps_base_quantization(self):
+        self._write_item("water", "Almond Water", "water")
+        self._store(quantization="int8").build_index(self.item_dir)
+
+        # Update/delete callers do not know the build mode
+        store = self._store(compact_threshold=1)
+        store.update_index([self._write_item("map", "Map", "map")])
+
+        snapshot = store._load_index()
+        assert snapshot.base_quantized is not None
+        self.assertEqual(snapshot.base_quantized["mode"], "int8")
+        self.assertEqual(len(store._list_sidecars()), 1)
+        self.assertEqual(store.search("map", k=1)[0]["id"], "map")
+
+    def test_compaction_refuses_unreadable_base(self):
+        self._write_item("water", "Almond Water", "water")
+        store = self._store(quantization="int8")
+        store.build_index(self.item_dir)
+        store.update_index([self._write_item("map", "Map", "map")])
+        base_mtime = os.stat(self.db_path).st_mtime_ns
+
+        # The sidecar the base points at is gone: the index must not be rewritten
+        for path in store._list_sidecars():
+            os.remove(path)
+        with self.assertRaises(RuntimeError):
+            store.compact()
+
+        self.assertEqual(os.stat(self.db_path).st_mtime_ns, base_mtime)
+        self.assertEqual(len(store._list_deltas()), 1)
+
+    def test_compaction_waits_for_write_lock(self):
+        self._write_item("water", "Almond Water", "water")
+        store = self._store()
+        store.build_index(self.item_dir)
+        store.update_index([self._write_item("map", "Map", "map")])
+
+        # Another writer (a separate lock file handle, as in another process)
+        other = self._store()
+        with other._write_lock():
+            worker = threading.Thread(target=store.compact)
+            worker.start()
+            worker.join(timeout=0.2)
+            self.assertTrue(worker.is_alive())
+            self.assertEqual(len(store._list_deltas()), 1)
+        worker.join(timeout=5)
+
+        self.assertEqual(store._list_deltas(), [])
+        self.assertEqual(len(store._load_index().items), 2)
+
+
+class TestBatchingEmbeddings(unittest.TestCase):
+    def test_concurrent_queries_share_batches(self):
+        inner = FakeEmbeddings()
+        calls: List[int] = []
+        original = inner.embed_documents
+
+        def counting_embed_documents(texts):
+            calls.append(len(texts))
+            return original(texts)
+
+        inner.embed_documents = counting_embed_documents  # type: ignore
+        batcher = BatchingEmbeddings(inner, max_batch=16, max_wait_ms=50)
+
+        queries = [f"{word} query" for word in FakeEmbeddings.KEYWORDS] * 2
+        results = [None] * len(queries)
+
+        def run(i):
+            results[i] = batcher.embed_query(queries[i])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(queries))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [inner.embed_query(q) for q in queries])
+        self.assertEqual(sum(calls), len(queries))
+        self.assertLess(len(calls), len(queries))
+
+    def _submit(self, batcher, texts):
+        futures = [Future() for _ in texts]
+        for text, future in zip(texts, futures):
+            batcher._queue.put((text, future))
+        return futures
+
+    def test_vector_count_mismatch_fails_the_batch(self):
+        inner = FakeEmbeddings()
+        inner.embed_documents = lambda texts: [[0.0]]  # type: ignore
+        batcher = BatchingEmbeddings(inner, max_batch=2, max_wait_ms=200)
+
+        futures = self._submit(batcher, ["water", "food"])
+        for future in futures:
+            self.assertIsInstance(future.exception(timeout=2), ValueError)
+
+    def test_worker_abort_fails_pending_futures(self):
+        class Abort(BaseException):
+            pass
+
+        def abort(texts):
+            raise Abort()
+
+        inner = FakeEmbeddings()
+        inner.embed_documents = abort  # type: ignore
+        with mock.patch.object(threading, "excepthook"):
+            batcher = BatchingEmbeddings(inner, max_batch=2, max_wait_ms=200)
+            futures = self._submit(batcher, ["water", "food"])
+            for future in futures:
+                self.assertIsInstance(future.exception(timeout=2), RuntimeError)
+            batcher._worker.join(timeout=2)
+
+
+class TestCachedEmbeddings(unittest.TestCase):
+    def test_repeated_texts_hit_cache(self):
+        inner = FakeEmbeddings()
+        calls: List[List[str]] = []
+        original = inner.embed_documents
+
+        def counting_embed_documents(texts):
+            calls.append(list(texts))
+            return original(texts)
+
+        inner.embed_documents = counting_embed_documents  # type: ignore
+        cached = CachedEmbeddings(inner, "local", "fake", max_size=2, use_redis=False)
+
+        first = cached.embed_documents(["water", "food", "water"])
+        self.assertEqual(calls, [["water", "food"]])
+        self.assertEqual(first, original(["water", "food", "water"]))
+
+        self.assertEqual(cached.embed_query("food"), inner.embed_query("food"))
+        cached.embed_documents(["map", "food"])
+        self.assertEqual(calls[-1], ["map"])
+
+        # max_size=2: "water" was evicted as least recently used
+        cached.embed_documents(["water"])
+        self.assertEqual(calls[-1], ["water"])
+
+        stats = cached.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 5)
+
+    def test_redis_prefix_includes_local_backend(self):
+        prefixes = {
+            CachedEmbeddings(
+                FakeEmbeddings(), provider, "m", backend, use_redis=False
+            )._redis_prefix
+            for provider, backend in [
+                ("local", "torch"),
+                ("local", "onnx"),
+                ("local", "torch-int8"),
+                ("openai", "onnx"),
+            ]
+        }
+        self.assertEqual(
+            prefixes,
+            {
+                "embedding:local:m:torch",
+                "embedding:local:m:onnx",
+                "embedding:local:m:torch-int8",
+                "embedding:openai:m",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
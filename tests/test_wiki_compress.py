@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.tools.wiki import compress
+
+PAGE = """<div id="main-content">
+本站仅供阅览使用。若需进行编辑等操作，请前往<a href="https://example">源站点</a>。
+语言語言：​<br/>
+<h1>概要</h1>
+折叠
+目录
+<a href="#toc0">概要</a>
+<p>这里有<strong>杏仁水</strong>，见<a href="/level-0">Level 0</a>。</p>
+<ul>
+<li>撬棍</li>
+<li>手电筒<a href="#footnote-1">1</a></li>
+</ul>
+<h2>实体</h2>
+<table><tr><th>名称</th><th>危险</th></tr><tr><td>猎犬</td><td>高</td></tr></table>
+<p>« <a href="/level-0">Level 0</a> | Level 1 | <a href="/level-2">Level 2</a> »</p>
+</div>"""
+
+
+class TestHtmlToText(unittest.TestCase):
+    def test_markdown_structure_without_boilerplate(self):
+        self.assertEqual(
+            compress.html_to_text(PAGE),
+            "# 概要\n\n"
+            "这里有杏仁水，见Level 0。\n\n"
+            "- 撬棍\n"
+            "- 手电筒\n\n"
+            "## 实体\n\n"
+            "| 名称 | 危险 |\n"
+            "| 猎犬 | 高 |",
+        )
+
+
+@mock.patch.object(compress, "_get_encoding", return_value=None)
+class TestChunking(unittest.TestCase):
+    def test_fits_in_one_chunk(self, _):
+        text = "# A\n\n" + "字" * 50
+        self.assertEqual(compress.chunk_text(text, 100), [text])
+
+    def test_splits_at_headings_without_losing_text(self, _):
+        sections = [f"# 第{i}节\n\n" + "字" * 40 for i in range(5)]
+        chunks = compress.chunk_text("\n\n".join(sections), 100)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(compress.count_tokens(c) <= 100 for c in chunks))
+        self.assertTrue(all(c.startswith("# ") for c in chunks))
+        self.assertEqual("\n\n".join(chunks), "\n\n".join(sections))
+
+    def test_oversized_section_repeats_heading(self, _):
+        section = "## 物品\n\n" + "\n\n".join("字" * 60 for _ in range(3))
+        chunks = compress.chunk_text(section, 80)
+
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(all(c.startswith("## 物品\n") for c in chunks))
+        self.assertEqual(compress.fit_to_budget(section, 80), chunks[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
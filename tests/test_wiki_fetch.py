@@ -0,0 +1,204 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.tools import wiki_tools
+from backroom_agent.tools.wiki import fetch
+from backroom_agent.tools.wiki.fetch_cache import FetchCache
+from backroom_agent.tools.wiki.mirror_health import MirrorHealth
+
+
+class TestAsyncWikiFetcher(unittest.TestCase):
+    def setUp(self):
+        # No real waiting between retries
+        patcher = mock.patch.object(fetch, "_backoff_delay", return_value=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch(self, handler, urls, **kwargs):
+        async def main():
+            fetcher = fetch.AsyncWikiFetcher(
+                rate_limiter=None, transport=httpx.MockTransport(handler), **kwargs
+            )
+            try:
+                return await asyncio.gather(*(fetcher.fetch(u) for u in urls))
+            finally:
+                await fetcher.aclose()
+
+        return asyncio.run(main())
+
+    def test_retries_transient_errors(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.url.path)
+            if len(attempts) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, text="<html>ok</html>")
+
+        result = self._fetch(handler, ["http://wiki.example/level-1"])
+        self.assertEqual(result, ["<html>ok</html>"])
+        self.assertEqual(len(attempts), 3)
+
+    def test_not_found_is_not_retried(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.url.path)
+            return httpx.Response(404)
+
+        result = self._fetch(handler, ["http://wiki.example/missing"])
+        self.assertEqual(result, [None])
+        self.assertEqual(len(attempts), 1)
+
+    def test_per_host_concurrency_limit(self):
+        active = {"a.example": 0, "b.example": 0}
+        peak = {"a.example": 0, "b.example": 0}
+
+        async def handler(request):
+            host = request.url.host
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return httpx.Response(200, text=host)
+
+        urls = [f"http://{h}/page-{i}" for h in active for i in range(5)]
+        result = self._fetch(handler, urls, per_host_concurrency=2)
+        self.assertEqual(result, [u.split("/")[2] for u in urls])
+        self.assertEqual(peak, {"a.example": 2, "b.example": 2})
+
+
+class TestHedgedFetch(unittest.TestCase):
+    PRIMARY = "http://a.example/level-3"
+    ALTERNATE = "http://b.example/level-3"
+
+    def _race(self, handler, health, rounds=1):
+        async def main():
+            fetcher = fetch.AsyncWikiFetcher(
+                rate_limiter=None,
+                transport=httpx.MockTransport(handler),
+                health=health,
+            )
+            try:
+                return [
+                    await fetcher.fetch_first(
+                        [(self.PRIMARY, None, None), (self.ALTERNATE, None, None)],
+                        hedge_delay=0.05,
+                    )
+                    for _ in range(rounds)
+                ]
+            finally:
+                await fetcher.aclose()
+
+        return asyncio.run(main())
+
+    def test_slow_primary_loses_and_is_demoted(self):
+        requested = []
+
+        async def handler(request):
+            requested.append(request.url.host)
+            if request.url.host == "a.example":
+                await asyncio.sleep(0.5)
+            return httpx.Response(200, text=request.url.host)
+
+        health = MirrorHealth()
+        results = self._race(handler, health, rounds=2)
+
+        self.assertEqual([url for url, _ in results], [self.ALTERNATE] * 2)
+        self.assertEqual(results[0][1].text, "b.example")
+        # Round 2 asks the healthier mirror first and never needs the hedge
+        self.assertEqual(requested, ["a.example", "b.example", "b.example"])
+        self.assertLess(health.score("b.example"), health.score("a.example"))
+
+    def test_failed_primary_starts_alternate_immediately(self):
+        def handler(request):
+            if request.url.host == "a.example":
+                return httpx.Response(404)
+            return httpx.Response(200, text="ok")
+
+        (url, response), = self._race(handler, MirrorHealth())
+        self.assertEqual((url, response.text), (self.ALTERNATE, "ok"))
+
+    def test_unmeasured_mirror_ranks_by_neutral_prior(self):
+        health = MirrorHealth()
+        health.record("bad.example", 1.0, ok=False)
+        health.record("fast.example", 0.1, ok=True)
+        urls = [
+            "http://bad.example/p",
+            "http://new.example/p",
+            "http://fast.example/p",
+        ]
+        self.assertEqual(
+            health.order(urls),
+            ["http://fast.example/p", "http://new.example/p", "http://bad.example/p"],
+        )
+
+
+class TestConditionalFetch(unittest.TestCase):
+    URL = "http://wiki.example/level-7"
+    PAGE = "<html><body><div id='page-content'><p>Level 7</p></div></body></html>"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.requests = []
+        self.server_etag = '"v1"'
+        self.server_page = self.PAGE
+
+        def fake_fetch(url, etag=None, last_modified=None, retries=4):
+            self.requests.append(etag)
+            if etag == self.server_etag:
+                return fetch.FetchResponse(status=304, etag=etag)
+            return fetch.FetchResponse(
+                status=200, text=self.server_page, etag=self.server_etag
+            )
+
+        cache = FetchCache(os.path.join(self.tmp.name, "data/raw", ".fetch_cache.json"))
+        for target, value in [
+            ("fetch_url_conditional", fake_fetch),
+            ("get_fetch_cache", lambda: cache),
+            ("get_project_root", lambda: self.tmp.name),
+        ]:
+            patcher = mock.patch.object(wiki_tools, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _raw_mtime(self):
+        return os.stat(
+            os.path.join(self.tmp.name, "data/raw", "level-7.html")
+        ).st_mtime_ns
+
+    def test_not_modified_reuses_raw_cache(self):
+        first = wiki_tools.fetch_wiki_page(self.URL)
+        self.assertFalse(first.unchanged)
+        mtime = self._raw_mtime()
+
+        second = wiki_tools.fetch_wiki_page(self.URL)
+        self.assertEqual(self.requests, [None, '"v1"'])
+        self.assertTrue(second.unchanged)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self._raw_mtime(), mtime)
+
+    def test_same_content_without_validators_is_unchanged(self):
+        wiki_tools.fetch_wiki_page(self.URL)
+        self.server_etag = '"v2"'  # validator changed, content did not
+        self.assertTrue(wiki_tools.fetch_wiki_page(self.URL).unchanged)
+
+        self.server_etag = '"v3"'
+        self.server_page = self.PAGE.replace("Level 7", "Level 7 (rewritten)")
+        page = wiki_tools.fetch_wiki_page(self.URL)
+        self.assertFalse(page.unchanged)
+        self.assertIn("rewritten", page.content or "")
+
+
+if __name__ == "__main__":
+    unittest.main()
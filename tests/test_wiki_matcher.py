@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.subagents.level.events import NodeLog
+from backroom_agent.subagents.level.nodes.filter import _filter_candidates
+from backroom_agent.tools.wiki.matcher import AhoCorasick, html_to_match_text
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            patterns = {
+                "".join(rng.choice("abc") for _ in range(rng.randint(1, 4)))
+                for _ in range(6)
+            }
+            text = "".join(rng.choice("abc") for _ in range(40))
+            expected = {
+                p: [(i, i + len(p)) for i in range(len(text)) if text.startswith(p, i)]
+                for p in patterns
+            }
+            expected = {p: spans for p, spans in expected.items() if spans}
+            found = {
+                p: sorted(s) for p, s in AhoCorasick(patterns).find_all(text).items()
+            }
+            self.assertEqual(found, expected)
+
+    def test_match_text_ignores_tags_and_whitespace(self):
+        self.assertEqual(
+            html_to_match_text("<p>杏<b>仁</b>水</p><li>Almond&nbsp;\n  WATER</li>"),
+            "杏仁水 almond water",
+        )
+
+
+class TestFilterCandidates(unittest.TestCase):
+    def test_names_and_aliases(self):
+        html = "<p>这里有<a href='/x'>杏仁</a>水。</p><p>Smiler</p>"
+        candidates = [
+            {"name": "杏仁水"},
+            {"name": "笑魇", "aliases": ["smiler"]},
+            {"name": "不存在的物品"},
+            {"name": None},
+        ]
+        logs = NodeLog("filter_items", "level-0")
+        kept, spans = _filter_candidates(candidates, html, logs, "items")
+
+        self.assertEqual([c["name"] for c in kept], ["杏仁水", "笑魇"])
+        text = html_to_match_text(html)
+        for candidate_spans, expected in zip(spans, ["杏仁水", "smiler"]):
+            start, end = candidate_spans[0]
+            self.assertEqual(text[start:end], expected)
+        # The candidates themselves (saved and sent to the LLM) are untouched
+        self.assertEqual(kept[0], {"name": "杏仁水"})
+        self.assertEqual(logs.counters, {"items_accepted": 2, "items_rejected": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import glob
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.tools.wiki import parse, reclean
+from backroom_agent.utils.common import get_project_root
+
+RAW_DIR = os.path.join(get_project_root(), "data/raw")
+
+SNIPPETS = {
+    "whitespace": """<html><body><div id="main-content">
+        <div id="page-title">
+            Level 7
+        </div>
+        <p>a <span>b</span>   c&nbsp;&nbsp;d</p>
+        <pre>  keep   this
+   </pre><code> x  y </code>
+    </div></body></html>""",
+    "comments": """<div id="main-content"><!--  note   here --><p>x<!-- y --></p>
+        <p><!-- only a comment --></p></div>""",
+    "garbage": """<body><div class="page-header">junk</div>
+        <div id="page-content" class="wiki-content">
+        <div class="rate-box">+5</div><div style="display: none">hidden</div>
+        <p id="creditBox">ok <script>x()</script> text</p>
+        <p class="Sidebar-like">case sensitive class</p></div></body>""",
+    "links": """<div id="main-content">
+        <a href="/level-1"> Level <b>1</b> <span class="share">s</span>tail</a>
+        <a href="#top">top</a><a href="javascript:void(0)">js</a>
+        <a href="/empty"><img src="x.png"></a>
+        <a href=" # ">spaced</a><a title='say "hi"' href="/q?a=1&b=2">q</a></div>""",
+    "empty_tags": """<div id="main-content"><p> </p><li><br></li>
+        <h2><em> </em>Title</h2><table><tr><td></td></tr></table>
+        <blockquote><p>\n</p></blockquote></div>""",
+    "main_by_class": """<body><div class="x mw-parser-output  y">
+        <p>by class</p></div></body>""",
+}
+
+
+class TestCleanHtmlContent(unittest.TestCase):
+    def assertSameAsReference(self, raw_html: str):
+        expected = parse._clean_html_content_bs4(raw_html)
+        self.assertEqual(parse.clean_html_content(raw_html), expected)
+
+    @unittest.skipIf(parse.etree is None, "lxml not installed")
+    def test_fast_path_matches_reference_on_snippets(self):
+        for name, raw_html in SNIPPETS.items():
+            with self.subTest(name):
+                self.assertIsNotNone(parse._clean_html_content_lxml(raw_html))
+                self.assertSameAsReference(raw_html)
+
+    @unittest.skipIf(parse.etree is None, "lxml not installed")
+    def test_golden_output_on_raw_corpus(self):
+        files = sorted(glob.glob(os.path.join(RAW_DIR, "*.html")))
+        if not files:
+            self.skipTest("data/raw corpus not available")
+        for path in files:
+            with self.subTest(os.path.basename(path)):
+                with open(path, "r", encoding="utf-8") as f:
+                    raw_html = f.read()
+                fast = parse._clean_html_content_lxml(raw_html)
+                self.assertEqual(fast, parse._clean_html_content_bs4(raw_html))
+
+    def test_falls_back_without_main_content(self):
+        raw_html = "<html><body><p>no main content</p></body></html>"
+        self.assertIsNone(parse._clean_html_content_lxml(raw_html))
+        self.assertSameAsReference(raw_html)
+        self.assertEqual(parse.clean_html_content(""), ("", []))
+
+
+class TestRecleanRawPages(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.raw_dir = os.path.join(tmp.name, "raw")
+        self.level_dir = os.path.join(tmp.name, "level")
+        os.makedirs(self.raw_dir)
+        for name, raw_html in SNIPPETS.items():
+            with open(os.path.join(self.raw_dir, f"{name}.html"), "w") as f:
+                f.write(raw_html)
+
+    def test_writes_only_changed_pages(self):
+        first = reclean.reclean_raw_pages(self.raw_dir, self.level_dir, workers=2)
+        self.assertEqual(first["counts"]["created"], len(SNIPPETS))
+        with open(os.path.join(self.level_dir, "links.html")) as f:
+            expected, _ = parse.clean_page_content(SNIPPETS["links"])
+            self.assertEqual(f.read(), expected)
+
+        stale = os.path.join(self.level_dir, "comments.html")
+        with open(stale, "w") as f:
+            f.write("old rules")
+        mtime = os.stat(os.path.join(self.level_dir, "links.html")).st_mtime_ns
+
+        second = reclean.reclean_raw_pages(self.raw_dir, self.level_dir, workers=2)
+        self.assertEqual(second["counts"]["updated"], 1)
+        self.assertEqual(second["counts"]["unchanged"], len(SNIPPETS) - 1)
+        self.assertEqual(
+            os.stat(os.path.join(self.level_dir, "links.html")).st_mtime_ns, mtime
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.level_dir)),
+            sorted(f"{name}.html" for name in SNIPPETS),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backroom_agent.subagents.level.events import NodeLog
+from backroom_agent.subagents.level.nodes import fetch
+from backroom_agent.tools.wiki import url_cache
+
+DOMAINS = ["brcn.backroomswiki.cn"]
+
+
+class TestUrlResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = url_cache.UrlResolutionCache(
+            os.path.join(self.tmp.name, ".url_cache.json")
+        )
+
+    def test_negative_entries_expire_sooner(self):
+        self.cache.store("The Hub", None, source="search")
+        self.cache.store(
+            "Level Fun", "http://brcn.backroomswiki.cn/level-fun", "search"
+        )
+        self.assertEqual(self.cache.lookup("the hub")["url"], None)
+
+        later = time.time() + url_cache.URL_CACHE_NEGATIVE_TTL + 1
+        with mock.patch.object(url_cache.time, "time", return_value=later):
+            self.assertIsNone(self.cache.lookup("The Hub"))
+            self.assertIsNotNone(self.cache.lookup("level-fun"))
+
+        # Persisted across instances
+        reloaded = url_cache.UrlResolutionCache(self.cache.path)
+        self.assertEqual(reloaded.lookup("Level Fun")["source"], "search")
+
+    def test_learn_links(self):
+        self.cache.store("黄色厅房", "http://brcn.backroomswiki.cn/level-0", "search")
+        learned = self.cache.learn_links(
+            [
+                {"text": "The Hub", "url": "/the-hub"},
+                {"text": "黄色厅房", "url": "/level-0-alt"},
+                {"text": "标签", "url": "/system:page-tags"},
+                {"text": "外站", "url": "https://example.com/the-hub"},
+            ],
+            "http://brcn.backroomswiki.cn/level-1",
+            DOMAINS,
+        )
+        self.assertEqual(learned, 2)  # the-hub, level-0-alt
+        hub = "http://brcn.backroomswiki.cn/the-hub"
+        self.assertEqual(self.cache.lookup("the-hub")["url"], hub)
+        self.assertEqual(self.cache.lookup("The Hub")["url"], hub)
+        # Link text does not replace a known URL
+        self.assertTrue(self.cache.lookup("黄色厅房")["url"].endswith("/level-0"))
+        self.assertIsNone(self.cache.lookup("system:page-tags"))
+
+    def test_resolver_searches_once(self):
+        with mock.patch.object(
+            fetch, "get_url_cache", return_value=self.cache
+        ), mock.patch.object(
+            fetch, "search_backrooms_wiki", return_value=None
+        ) as search:
+            for _ in range(2):
+                url = fetch._resolve_missing_url("The Hub", NodeLog("fetch_content"))
+        self.assertEqual(search.call_count, 1)
+        self.assertTrue(url.endswith("/the-hub"))
+
+    def test_failed_search_is_not_cached(self):
+        with mock.patch.object(
+            fetch, "get_url_cache", return_value=self.cache
+        ), mock.patch.object(
+            fetch, "search_backrooms_wiki", side_effect=fetch.SearchError("ratelimit")
+        ) as search:
+            for _ in range(2):
+                url = fetch._resolve_missing_url("The Hub", NodeLog("fetch_content"))
+        self.assertEqual(search.call_count, 2)
+        self.assertIsNone(self.cache.lookup("the-hub"))
+        self.assertTrue(url.endswith("/the-hub"))
+
+
+if __name__ == "__main__":
+    unittest.main()